@@ -0,0 +1,58 @@
+"""
+Benchmark: full-chain validation of a durable ledger, sequential against a process pool.
+
+Run from this directory:
+    python bench_validate.py [ENTRIES] [--dir DIR]
+
+ENTRIES defaults to 200,000. Building the ledger is the slow part (a 10M-entry ledger takes ~10 minutes
+and a few GB of disk), so pass --dir to build it once and reuse it across runs; an existing ledger there
+is topped up to ENTRIES, never shrunk.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from chain import AuditLedger
+
+def build(directory: str, entries: int) -> AuditLedger:
+    ledger = AuditLedger.open(directory)
+    missing = entries - len(ledger.chain)
+    if missing > 0:
+        print(f"appending {missing:,} entries to {directory} ...")
+        started = time.perf_counter()
+        for i in range(missing):
+            ledger.log_event(f"user-{i % 1000}", "EMAIL_SENT", f"msg-{i}", {"size": i % 4096})
+        print(f"  {missing / (time.perf_counter() - started):,.0f} appends/s")
+    return ledger
+
+def timed(ledger: AuditLedger, workers: int) -> float:
+    started = time.perf_counter()
+    assert ledger.validate_chain(workers=workers)
+    return time.perf_counter() - started
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("entries", nargs="?", type=int, default=200_000)
+    parser.add_argument("--dir", help="ledger directory to build once and reuse (default: a temporary one)")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="bench-audit-")
+    try:
+        ledger = build(directory, args.entries)
+        entries = len(ledger.chain)
+        baseline = timed(ledger, 1)
+        print(f"{entries:,} entries, {os.cpu_count()} CPUs")
+        print(f"  sequential   {baseline:8.2f}s  {entries / baseline:12,.0f} entries/s")
+        workers = 2
+        while workers <= os.cpu_count():
+            elapsed = timed(ledger, workers)
+            print(f"  {workers:3d} workers  {elapsed:8.2f}s  {entries / elapsed:12,.0f} entries/s  {baseline / elapsed:5.2f}x")
+            workers *= 2
+        ledger.close()
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
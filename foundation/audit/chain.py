@@ -1,8 +1,19 @@
+import argparse
+import bisect
 import hashlib
+import hmac
 import json
+import mmap
+import os
+import struct
+import sys
 import time
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field, asdict
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 @dataclass
 class AuditEntry:
@@ -31,10 +42,810 @@ class AuditEntry:
         block_string = json.dumps(payload, sort_keys=True)
         return hashlib.sha256(block_string.encode()).hexdigest()
 
+# --- Durable storage --------------------------------------------------------
+
+_RECORD_HEADER = struct.Struct(">I") # payload length, before each JSON record in a .log file
+_OFFSET = struct.Struct("<Q") # one .idx entry: little-endian on disk, whatever the host's byte order
+_META_FILE = "ledger.json"
+
+def _pack_offsets(offsets: array) -> bytes:
+    if sys.byteorder == "little":
+        return offsets.tobytes()
+    swapped = array("Q", offsets)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+def _unpack_offsets(raw: bytes) -> array:
+    offsets = array("Q")
+    offsets.frombytes(raw[: len(raw) - len(raw) % _OFFSET.size])
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets
+
+def _encode_entry(entry: AuditEntry) -> bytes:
+    return json.dumps(vars(entry), sort_keys=True).encode()
+
+def _decode_entry(payload: bytes) -> AuditEntry:
+    return AuditEntry(**json.loads(payload))
+
+class _Segment:
+    """
+    Up to segment_size consecutive entries, starting at base_index.
+    `<base>.log` holds length-prefixed JSON records; `<base>.idx` holds one little-endian uint64 record offset
+    per entry.
+    The .log is the source of truth: the .idx is written after it and repaired from it on open.
+    """
+    def __init__(self, directory: str, base_index: int, writable: bool, fsync: bool = False):
+        self.base_index = base_index
+        self.log_path = os.path.join(directory, f"{base_index:020d}.log")
+        self.idx_path = os.path.join(directory, f"{base_index:020d}.idx")
+        self.fsync = fsync
+        self.offsets = array("Q")
+        self._map: Optional[mmap.mmap] = None
+        self._log = self._idx = None
+
+        if os.path.exists(self.idx_path):
+            with open(self.idx_path, "rb") as f:
+                raw = f.read()
+            self.offsets = _unpack_offsets(raw)
+        self.size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if writable:
+            self._recover()
+            self._log = open(self.log_path, "ab")
+            self._idx = open(self.idx_path, "ab")
+
+    def _recover(self) -> None:
+        """Drops a torn tail record and re-indexes records the .idx missed (crash between the two writes)."""
+        with open(self.log_path, "a+b") as log:
+            log.seek(0)
+            data = log.read()
+        valid = array("Q")
+        position = 0
+        for offset in self.offsets:
+            if offset != position:
+                break
+            end = self._record_end(data, offset)
+            if end is None:
+                break
+            valid.append(offset)
+            position = end
+        while (end := self._record_end(data, position)) is not None:
+            valid.append(position)
+            position = end
+
+        if position != len(data):
+            with open(self.log_path, "r+b") as log:
+                log.truncate(position)
+        idx_size = os.path.getsize(self.idx_path) if os.path.exists(self.idx_path) else -1
+        if valid != self.offsets or idx_size != len(valid) * _OFFSET.size:
+            with open(self.idx_path, "wb") as idx:
+                idx.write(_pack_offsets(valid))
+        self.offsets = valid
+        self.size = position
+
+    @staticmethod
+    def _record_end(data: bytes, offset: int) -> Optional[int]:
+        if offset + _RECORD_HEADER.size > len(data):
+            return None
+        (length,) = _RECORD_HEADER.unpack_from(data, offset)
+        end = offset + _RECORD_HEADER.size + length
+        return end if end <= len(data) else None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _mapped(self, end: int) -> mmap.mmap:
+        # Appends grow the file past the mapping; remap only when a read needs the new bytes
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            with open(self.log_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def read_payload(self, position: int) -> bytes:
+        # The record's own length header bounds it: a reader beside the writer can see .log bytes (a record
+        # appended, its .idx entry not yet) past the last offset it knows about
+        start = self.offsets[position] + _RECORD_HEADER.size
+        (length,) = _RECORD_HEADER.unpack_from(self._mapped(start), start - _RECORD_HEADER.size)
+        return self._mapped(start + length)[start:start + length]
+
+    def read(self, position: int) -> AuditEntry:
+        return _decode_entry(self.read_payload(position))
+
+    def append(self, payload: bytes) -> None:
+        offset = self.size
+        self._log.write(_RECORD_HEADER.pack(len(payload)) + payload)
+        self._log.flush()
+        self._idx.write(_OFFSET.pack(offset))
+        self._idx.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+            os.fsync(self._idx.fileno())
+        self.offsets.append(offset)
+        self.size = offset + _RECORD_HEADER.size + len(payload)
+
+    def seal(self) -> None:
+        """Closes the write handles once the segment is full; reads keep working through the mapping."""
+        for handle in (self._log, self._idx):
+            if handle is not None:
+                handle.close()
+        self._log = self._idx = None
+
+    def close(self) -> None:
+        self.seal()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+class SegmentedFileStore:
+    """
+    Append-only on-disk storage for the chain, in fixed-capacity segments of `segment_size` entries.
+    Behaves like the in-memory list AuditLedger uses by default (len, [i], iteration, append), so the ledger's
+    logic is unchanged. Entries read back are fresh copies: editing one never touches the stored record.
+
+    Opening reads only the tail segment (to recover the length and the last entry); other segments are
+    opened and memory-mapped on first read.
+
+    With read_only, nothing is created, repaired or written: the store sees the entries the .idx files cover,
+    so it can be opened beside a live writer (whose half-written tail it leaves alone).
+    """
+    def __init__(self, directory: str, segment_size: int = 65536, fsync: bool = False, read_only: bool = False):
+        self.directory = directory
+        self.fsync = fsync
+        self.read_only = read_only
+        meta_path = os.path.join(directory, _META_FILE)
+        if read_only and not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No audit ledger in {directory}")
+        os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                segment_size = json.load(f)["segment_size"] # fixed for the life of the ledger
+        else:
+            with open(meta_path, "w") as f:
+                json.dump({"segment_size": segment_size}, f)
+        self.segment_size = segment_size
+
+        bases = sorted(int(name[:-4]) for name in os.listdir(directory) if name.endswith(".log"))
+        self._segments: Dict[int, _Segment] = {}
+        self._tail = _Segment(directory, bases[-1] if bases else 0, writable=not read_only, fsync=fsync)
+        self._segments[self._tail.base_index] = self._tail
+        self._length = self._tail.base_index + len(self._tail)
+        self._last: Optional[bytes] = self._tail.read_payload(len(self._tail) - 1) if len(self._tail) else None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _segment(self, base_index: int) -> _Segment:
+        segment = self._segments.get(base_index)
+        if segment is None:
+            segment = self._segments[base_index] = _Segment(self.directory, base_index, writable=False)
+        return segment
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ledger index out of range")
+        if index == self._length - 1:
+            return _decode_entry(self._last)
+        base = index - index % self.segment_size
+        return self._segment(base).read(index - base)
+
+    def __iter__(self) -> Iterator[AuditEntry]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[AuditEntry]:
+        """Entries from index `start` on, without touching earlier segments."""
+        first = start - start % self.segment_size
+        for base in range(first, self._length, self.segment_size):
+            segment = self._segment(base)
+            for position in range(max(0, start - base), len(segment)):
+                yield segment.read(position)
+
+    def append(self, entry: AuditEntry) -> None:
+        if self.read_only:
+            raise ValueError(f"Audit ledger {self.directory} is open read-only")
+        if len(self._tail) >= self.segment_size:
+            self._tail.seal()
+            self._tail = _Segment(self.directory, self._length, writable=True, fsync=self.fsync)
+            self._segments[self._tail.base_index] = self._tail
+        payload = _encode_entry(entry)
+        self._tail.append(payload)
+        self._length += 1
+        self._last = payload
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+def _iter_from(chain, start: int) -> Iterator[AuditEntry]:
+    if hasattr(chain, "iter_from"):
+        return chain.iter_from(start)
+    return (chain[i] for i in range(start, len(chain)))
+
+# --- Parallel validation ----------------------------------------------------
+# Recomputing an entry's hash needs only that entry, so ranges are scanned in worker processes. Each range
+# reports its first fault and its boundary hashes, and the links between ranges are checked in index
+# order, so the reported fault is exactly the one the sequential walk would find first.
+
+def _first_fault(previous: Optional[AuditEntry], entries: Iterator[AuditEntry], start: int) -> Optional[str]:
+    """The first failed check from `start` on, as validate_chain reports it. previous=None skips the first link."""
+    for i, current in enumerate(entries, start=start):
+        # 1. Check Link
+        if previous is not None and current.prev_hash != previous.hash:
+            return f"Broken Link at index {i}: {current.prev_hash} != {previous.hash}"
+
+        # 2. Check Content Integrity
+        recalc = current.calculate_hash()
+        if current.hash != recalc:
+            return f"Data Tampered at index {i}: {current.hash} != {recalc}"
+
+        previous = current
+    return None
+
+_RangeResult = Tuple[Optional[str], str, str] # (first fault, first entry's prev_hash, last entry's hash)
+
+def _scan_entries(start: int, entries: List[AuditEntry]) -> _RangeResult:
+    return _first_fault(None, iter(entries), start), entries[0].prev_hash, entries[-1].hash
+
+def _scan_segments(directory: str, segment_size: int, start: int, end: int) -> _RangeResult:
+    """Reads [start, end) straight from the segment files, read-only, so it can run beside the writer."""
+    segments: Dict[int, _Segment] = {}
+
+    def read(index: int) -> AuditEntry:
+        base = index - index % segment_size
+        if base not in segments:
+            segments[base] = _Segment(directory, base, writable=False)
+        return segments[base].read(index - base)
+
+    try:
+        fault = _first_fault(None, (read(i) for i in range(start, end)), start)
+        return fault, read(start).prev_hash, read(end - 1).hash
+    finally:
+        for segment in segments.values():
+            segment.close()
+
+def _ranges(start: int, end: int, workers: int, segment_size: Optional[int]) -> List[Tuple[int, int]]:
+    """
+    [lo, hi) ranges covering start..end, a few per worker to balance uneven segments. On disk, every range
+    after the first starts on a segment boundary, so each segment file is read by one worker only.
+    """
+    size = -(-(end - start) // (workers * 4))
+    first = start
+    if segment_size:
+        size = -(-size // segment_size) * segment_size
+        first = min(-(-start // segment_size) * segment_size, end)
+    bounds = [(start, first)] if first > start else []
+    return bounds + [(lo, min(lo + size, end)) for lo in range(first, end, size)]
+
+def _validate_parallel(chain, previous: AuditEntry, start: int, workers: int) -> Optional[str]:
+    end = len(chain)
+    if start >= end:
+        return None
+    segment_size = getattr(chain, "segment_size", None)
+    bounds = _ranges(start, end, workers, segment_size)
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        if segment_size:
+            futures = [pool.submit(_scan_segments, chain.directory, segment_size, lo, hi) for lo, hi in bounds]
+        else:
+            futures = [pool.submit(_scan_entries, lo, chain[lo:hi]) for lo, hi in bounds]
+        previous_hash = previous.hash
+        for (lo, _), future in zip(bounds, futures):
+            fault, first_prev_hash, last_hash = future.result()
+            # Stitch: the link into this range is checked before anything inside it
+            if first_prev_hash != previous_hash:
+                return f"Broken Link at index {lo}: {first_prev_hash} != {previous_hash}"
+            if fault is not None:
+                return fault
+            previous_hash = last_hash
+    finally:
+        # On an early fault, ranges not yet started are dropped instead of scanned
+        pool.shutdown(cancel_futures=True)
+    return None
+
+# --- Checkpoints ------------------------------------------------------------
+
+_CHECKPOINT_FILE = "checkpoints.jsonl"
+
+@dataclass
+class Checkpoint:
+    """
+    Attests the chain head at `index`. Sealed with HMAC-SHA256 when the ledger has a checkpoint key
+    (only key holders can mint one), else with plain SHA-256 (detects corruption, not forgery).
+    """
+    index: int
+    entry_hash: str
+    created_at: float
+    seal: str = ""
+
+    def calculate_seal(self, key: Optional[bytes] = None) -> str:
+        message = f"{self.index}:{self.entry_hash}:{self.created_at!r}".encode()
+        if key is None:
+            return hashlib.sha256(message).hexdigest()
+        return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+    def is_sealed_with(self, key: Optional[bytes] = None) -> bool:
+        return hmac.compare_digest(self.seal, self.calculate_seal(key))
+
+# --- Merkle accumulator -----------------------------------------------------
+# RFC 6962 / RFC 9162 tree shape, so proofs can be checked with standard transparency-log verifiers.
+
+def _leaf_hash(entry_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(entry_hash)).digest()
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+class _HashLevel:
+    """
+    Append-only array of 32-byte node hashes: in memory, or a file read through mmap. File writes are
+    buffered; the tree is derived from the ledger, so nodes lost in a crash are rebuilt on open.
+    """
+    SIZE = 32
+    FLUSH_BYTES = 64 * 1024
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._pending = bytearray()
+        self._map: Optional[mmap.mmap] = None
+        self._file = None
+        self._flushed = 0
+        if path:
+            with open(path, "a+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % self.SIZE:
+                    f.truncate(size - size % self.SIZE) # torn write
+            self._flushed = os.path.getsize(path) // self.SIZE
+            self._file = open(path, "ab")
+
+    def __len__(self) -> int:
+        return self._flushed + len(self._pending) // self.SIZE
+
+    def __getitem__(self, i: int) -> bytes:
+        if i >= self._flushed:
+            start = (i - self._flushed) * self.SIZE
+            return bytes(self._pending[start:start + self.SIZE])
+        start = i * self.SIZE
+        if self._map is None or len(self._map) < start + self.SIZE:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[start:start + self.SIZE]
+
+    def append(self, digest: bytes) -> None:
+        self._pending += digest
+        if self._file is not None and len(self._pending) >= self.FLUSH_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is None or not self._pending:
+            return
+        self._file.write(self._pending)
+        self._file.flush()
+        self._flushed += len(self._pending) // self.SIZE
+        self._pending.clear()
+
+    def truncate(self, count: int) -> None:
+        if count >= len(self):
+            return
+        if count >= self._flushed:
+            del self._pending[(count - self._flushed) * self.SIZE:]
+            return
+        self._pending.clear()
+        self.close()
+        with open(self.path, "r+b") as f:
+            f.truncate(count * self.SIZE)
+        self._file = open(self.path, "ab")
+        self._flushed = count
+
+    def close(self) -> None:
+        self.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+
+class MerkleAccumulator:
+    """
+    Merkle tree over the entry hashes, grown one leaf per appended entry.
+    levels[h][i] is the root of the complete subtree over leaves [i * 2^h, (i + 1) * 2^h); nodes are only
+    ever appended, so each level is an append-only file beside a durable ledger. Any root, inclusion proof
+    or consistency proof is assembled from O(log n) of these.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.levels: List[_HashLevel] = []
+        if directory:
+            height = 0
+            while os.path.exists(self._level_path(height)):
+                self.levels.append(_HashLevel(self._level_path(height)))
+                height += 1
+        # Each level flushes on its own, so after a crash a level can be short or long of its children:
+        # drop parents whose children are gone, then recompute the ones that were never written
+        height = 1
+        while height < len(self.levels) or (self.levels and len(self.levels[height - 1]) >= 2):
+            below, level = self.levels[height - 1], self._level(height)
+            level.truncate(len(below) // 2)
+            for i in range(len(level), len(below) // 2):
+                level.append(_node_hash(below[2 * i], below[2 * i + 1]))
+            height += 1
+
+    def _level_path(self, height: int) -> str:
+        return os.path.join(self.directory, f"merkle-{height:02d}.bin")
+
+    def _level(self, height: int) -> _HashLevel:
+        if height == len(self.levels):
+            self.levels.append(_HashLevel(self._level_path(height) if self.directory else None))
+        return self.levels[height]
+
+    @property
+    def size(self) -> int:
+        return len(self.levels[0]) if self.levels else 0
+
+    def append(self, entry_hash: str) -> None:
+        node = _leaf_hash(entry_hash)
+        self._level(0).append(node)
+        index, height = self.size - 1, 0
+        # Every right child completes its parent
+        while index & 1:
+            node = _node_hash(self.levels[height][index - 1], node)
+            index, height = index >> 1, height + 1
+            self._level(height).append(node)
+
+    def truncate(self, size: int) -> None:
+        for height, level in enumerate(self.levels):
+            level.truncate(size >> height)
+
+    def _subtree(self, lo: int, hi: int) -> bytes:
+        """MTH(D[lo:hi]) where lo is aligned to the largest power of two <= hi - lo, as in every RFC 6962 split."""
+        n = hi - lo
+        if n & (n - 1) == 0:
+            height = n.bit_length() - 1
+            return self.levels[height][lo >> height]
+        k = _split(n)
+        return _node_hash(self._subtree(lo, lo + k), self._subtree(lo + k, hi))
+
+    def root(self, size: Optional[int] = None) -> str:
+        size = self.size if size is None else size
+        if not 0 < size <= self.size:
+            raise ValueError(f"tree size {size} out of range 1..{self.size}")
+        return self._subtree(0, size).hex()
+
+    def _path(self, m: int, lo: int, hi: int) -> List[bytes]:
+        n = hi - lo
+        if n == 1:
+            return []
+        k = _split(n)
+        if m < k:
+            return self._path(m, lo, lo + k) + [self._subtree(lo + k, hi)]
+        return self._path(m - k, lo + k, hi) + [self._subtree(lo, lo + k)]
+
+    def _subproof(self, m: int, lo: int, hi: int, complete: bool) -> List[bytes]:
+        n = hi - lo
+        if m == n:
+            return [] if complete else [self._subtree(lo, hi)]
+        k = _split(n)
+        if m <= k:
+            return self._subproof(m, lo, lo + k, complete) + [self._subtree(lo + k, hi)]
+        return self._subproof(m - k, lo + k, hi, False) + [self._subtree(lo, lo + k)]
+
+    def prove_inclusion(self, index: int, size: Optional[int] = None) -> "InclusionProof":
+        size = self.size if size is None else size
+        if not 0 <= index < size <= self.size:
+            raise ValueError(f"no entry {index} in a tree of size {size}")
+        return InclusionProof(index, size, [node.hex() for node in self._path(index, 0, size)])
+
+    def prove_consistency(self, old_size: int, new_size: Optional[int] = None) -> "ConsistencyProof":
+        new_size = self.size if new_size is None else new_size
+        if not 0 < old_size <= new_size <= self.size:
+            raise ValueError(f"cannot prove {old_size} -> {new_size} in a tree of size {self.size}")
+        path = [] if old_size == new_size else self._subproof(old_size, 0, new_size, True)
+        return ConsistencyProof(old_size, new_size, [node.hex() for node in path])
+
+    def close(self) -> None:
+        for level in self.levels:
+            level.close()
+
+@dataclass
+class InclusionProof:
+    index: int
+    tree_size: int
+    path: List[str]
+
+@dataclass
+class ConsistencyProof:
+    old_size: int
+    new_size: int
+    path: List[str]
+
+def verify_inclusion(entry: AuditEntry, proof: InclusionProof, root: str) -> bool:
+    """
+    True if `entry`, exactly as given, is leaf proof.index of the tree with this root (RFC 9162 2.1.3.2).
+    Needs only the entry, the proof and a trusted root: never the ledger.
+    """
+    if entry.index != proof.index or not 0 <= proof.index < proof.tree_size:
+        return False
+    fn, sn = proof.index, proof.tree_size - 1
+    r = _leaf_hash(entry.calculate_hash())
+    for p in map(bytes.fromhex, proof.path):
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = _node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn, sn = fn >> 1, sn >> 1
+        else:
+            r = _node_hash(r, p)
+        fn, sn = fn >> 1, sn >> 1
+    return sn == 0 and hmac.compare_digest(r.hex(), root)
+
+def verify_consistency(proof: ConsistencyProof, old_root: str, new_root: str) -> bool:
+    """True if the tree with new_root is an append-only extension of the one with old_root (RFC 9162 2.1.4.2)."""
+    if not 0 < proof.old_size <= proof.new_size:
+        return False
+    if proof.old_size == proof.new_size:
+        return not proof.path and old_root == new_root
+    path = list(map(bytes.fromhex, proof.path))
+    if proof.old_size & (proof.old_size - 1) == 0:
+        path.insert(0, bytes.fromhex(old_root))
+    if not path:
+        return False
+    fn, sn = proof.old_size - 1, proof.new_size - 1
+    while fn & 1:
+        fn, sn = fn >> 1, sn >> 1
+    fr = sr = path[0]
+    for c in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr, sr = _node_hash(c, fr), _node_hash(c, sr)
+            while not fn & 1 and fn != 0:
+                fn, sn = fn >> 1, sn >> 1
+        else:
+            sr = _node_hash(sr, c)
+        fn, sn = fn >> 1, sn >> 1
+    return sn == 0 and fr.hex() == old_root and sr.hex() == new_root
+
+# --- Secondary indexes ------------------------------------------------------
+
+_Postings = Dict[str, Dict[str, array]] # field -> value -> ascending entry indexes
+
+class LedgerIndex:
+    """
+    Maps each actor, target and action to the ascending indexes of its entries, one posting set per segment.
+    Time needs no index: timestamps never decrease along the chain, so a time range is a binary search over
+    the chain itself, and a query only touches the segments that overlap it.
+
+    A durable ledger's sealed segments each get a `<base>.post` file, written once when the segment fills and
+    loaded on demand into a small LRU, so neither opening the ledger nor querying a time window reads the whole
+    index. The open segment's postings live in memory and are rebuilt from its entries on first use after a
+    reopen. Everything is derived from the chain: a missing or unreadable .post file is rebuilt from its segment.
+    An in-memory ledger keeps a single posting set.
+    """
+    FIELDS = ("actor_id", "target_id", "action")
+    CACHED_SEGMENTS = 16
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.directory: Optional[str] = getattr(chain, "directory", None)
+        self.segment_size: Optional[int] = getattr(chain, "segment_size", None)
+        self._loaded: "OrderedDict[int, _Postings]" = OrderedDict()
+        self._open_base = self._base(len(chain))
+        self._open: _Postings = self._empty()
+        self._covered = self._open_base # the open postings cover [_open_base, _covered)
+        if self.directory and os.path.exists(self._post_path(self._open_base)):
+            os.remove(self._post_path(self._open_base)) # the chain lost its tail since that segment was sealed
+
+    def _base(self, index: int) -> int:
+        return index - index % self.segment_size if self.segment_size else 0
+
+    def _post_path(self, base: int) -> str:
+        return os.path.join(self.directory, f"{base:020d}.post")
+
+    def _empty(self) -> _Postings:
+        return {field: {} for field in self.FIELDS}
+
+    @staticmethod
+    def _add(postings: _Postings, entry: AuditEntry) -> None:
+        for field, values in postings.items():
+            value = getattr(entry, field)
+            offsets = values.get(value)
+            if offsets is None:
+                offsets = values[value] = array("Q")
+            offsets.append(entry.index)
+
+    def add(self, entry: AuditEntry) -> None:
+        base = self._base(entry.index)
+        if base != self._open_base:
+            self._seal()
+            self._open_base, self._open, self._covered = base, self._empty(), base
+        if self._covered == entry.index:
+            self._add(self._open, entry)
+            self._covered += 1
+        # else: the open postings are rebuilt lazily and will pick this entry up from the chain
+
+    def _catch_up(self) -> _Postings:
+        end = len(self.chain)
+        if self.segment_size:
+            end = min(end, self._open_base + self.segment_size)
+        for entry in islice(_iter_from(self.chain, self._covered), end - self._covered):
+            self._add(self._open, entry)
+        self._covered = end
+        return self._open
+
+    def _seal(self) -> None:
+        postings = self._catch_up()
+        base = self._open_base
+        if self.directory:
+            self._write(base, postings)
+        self._remember(base, postings)
+
+    def _write(self, base: int, postings: _Postings) -> None:
+        path = self._post_path(base)
+        encoded = {field: {value: offsets.tolist() for value, offsets in values.items()} for field, values in postings.items()}
+        with open(path + ".tmp", "w") as f:
+            json.dump(encoded, f)
+        os.replace(path + ".tmp", path) # a reader sees the whole file or none of it
+
+    def _read(self, base: int) -> Optional[_Postings]:
+        try:
+            with open(self._post_path(base)) as f:
+                encoded = json.load(f)
+            return {field: {value: array("Q", offsets) for value, offsets in encoded[field].items()} for field in self.FIELDS}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _remember(self, base: int, postings: _Postings) -> None:
+        self._loaded[base] = postings
+        self._loaded.move_to_end(base)
+        while len(self._loaded) > self.CACHED_SEGMENTS:
+            self._loaded.popitem(last=False)
+
+    def postings(self, base: int) -> _Postings:
+        """The posting set of the segment starting at `base`."""
+        if base == self._open_base:
+            return self._catch_up()
+        postings = self._loaded.get(base)
+        if postings is not None:
+            self._loaded.move_to_end(base)
+            return postings
+        postings = self._read(base) if self.directory else None
+        if postings is None:
+            postings = self._empty()
+            for entry in islice(_iter_from(self.chain, base), self.segment_size):
+                self._add(postings, entry)
+            if self.directory:
+                self._write(base, postings)
+        self._remember(base, postings)
+        return postings
+
+    def search(self, criteria: List[Tuple[str, str]], lo: int, hi: int) -> Iterator[int]:
+        """Ascending indexes in [lo, hi) whose fields match every (field, value) criterion."""
+        if lo >= hi:
+            return
+        last = self._base(hi - 1)
+        base = self._base(lo)
+        while True:
+            postings = self.postings(base)
+            lists = []
+            for field, value in criteria:
+                offsets = postings[field].get(value)
+                if offsets is None:
+                    break
+                lists.append(offsets[bisect.bisect_left(offsets, lo):bisect.bisect_left(offsets, hi)])
+            else:
+                # Scan the rarest list, check the others by binary search
+                lists.sort(key=len)
+                for i in lists[0]:
+                    if all(_contains(offsets, i) for offsets in lists[1:]):
+                        yield i
+            if base >= last:
+                return
+            base += self.segment_size
+
+    def rebuild(self) -> None:
+        """Discards every posting file and cached set and rebuilds them from the chain (one full scan)."""
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".post"):
+                    os.remove(os.path.join(self.directory, name))
+        self._loaded.clear()
+        self._open, self._covered = self._empty(), self._open_base
+        if self.segment_size:
+            for base in range(0, self._open_base, self.segment_size):
+                self.postings(base)
+        self._catch_up()
+
+def _contains(offsets: array, value: int) -> bool:
+    position = bisect.bisect_left(offsets, value)
+    return position < len(offsets) and offsets[position] == value
+
+# --- Ledger -----------------------------------------------------------------
+
 class AuditLedger:
-    def __init__(self):
-        self.chain: List[AuditEntry] = []
-        self._create_genesis_block()
+    def __init__(self, storage=None, checkpoint_every: Optional[int] = None, checkpoint_key: Optional[bytes] = None):
+        """
+        `storage` is any append-only sequence of AuditEntry. Defaults to an in-memory list;
+        use AuditLedger.open(directory) for a durable ledger.
+        With `checkpoint_every`, a sealed Checkpoint is taken every N entries (persisted beside a durable ledger),
+        so validate_since() only has to re-hash the entries after the latest one.
+        """
+        self.chain = [] if storage is None else storage
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_key = checkpoint_key
+        self.checkpoints: List[Checkpoint] = self._load_checkpoints()
+        if getattr(self.chain, "read_only", False):
+            # Validation only: the Merkle files and postings belong to the writer
+            self.merkle = self.index = None
+            return
+        self.merkle = MerkleAccumulator(getattr(self.chain, "directory", None))
+        self._sync_merkle()
+        self.index = LedgerIndex(self.chain)
+        if len(self.chain) == 0:
+            self._create_genesis_block()
+
+    def _sync_merkle(self) -> None:
+        """The tree is appended after the chain: after a crash it can lag (catch up) or, if the chain dropped a torn record, lead."""
+        if self.merkle.size > len(self.chain):
+            self.merkle.truncate(len(self.chain))
+        for entry in _iter_from(self.chain, self.merkle.size):
+            self.merkle.append(entry.hash)
+
+    def rebuild_indexes(self) -> None:
+        """Discards the secondary indexes and rebuilds them from the entries."""
+        self.index.rebuild()
+
+    def _append(self, entry: AuditEntry) -> None:
+        self.chain.append(entry)
+        self.merkle.append(entry.hash)
+        self.index.add(entry)
+
+    def _sidecar_path(self, name: str) -> Optional[str]:
+        """Path for a file kept beside a durable ledger; None for an in-memory one."""
+        directory = getattr(self.chain, "directory", None)
+        return os.path.join(directory, name) if directory else None
+
+    def _load_checkpoints(self) -> List[Checkpoint]:
+        path = self._sidecar_path(_CHECKPOINT_FILE)
+        if not path or not os.path.exists(path):
+            return []
+        with open(path) as f:
+            # A torn last line (crash mid-write) is ignored; that checkpoint is simply retaken
+            return [Checkpoint(**json.loads(line)) for line in f if line.endswith("\n")]
+
+    @classmethod
+    def open(
+        cls, directory: str, checkpoint_every: Optional[int] = None, checkpoint_key: Optional[bytes] = None, **storage_options
+    ) -> "AuditLedger":
+        return cls(SegmentedFileStore(directory, **storage_options), checkpoint_every, checkpoint_key)
+
+    @classmethod
+    def open_read_only(cls, directory: str, checkpoint_key: Optional[bytes] = None) -> "AuditLedger":
+        """
+        For offline checks, safe beside a live writer: touches no file. validate_chain(), validate_since() and
+        entry reads work; appends, queries and Merkle proofs need AuditLedger.open().
+        """
+        return cls(SegmentedFileStore(directory, read_only=True), checkpoint_key=checkpoint_key)
 
     def _create_genesis_block(self):
         genesis_entry = AuditEntry(
@@ -47,7 +858,7 @@ class AuditLedger:
             prev_hash="0" * 64
         )
         genesis_entry.hash = genesis_entry.calculate_hash()
-        self.chain.append(genesis_entry)
+        self._append(genesis_entry)
 
     def log_event(self, actor_id: str, action: str, target_id: str, metadata: dict = None) -> AuditEntry:
         if metadata is None:
@@ -56,7 +867,7 @@ class AuditLedger:
         prev_entry = self.chain[-1]
         new_entry = AuditEntry(
             index=prev_entry.index + 1,
-            timestamp=time.time(),
+            timestamp=max(time.time(), prev_entry.timestamp), # monotonic even if the wall clock steps back
             actor_id=actor_id,
             action=action,
             target_id=target_id,
@@ -64,30 +875,150 @@ class AuditLedger:
             prev_hash=prev_entry.hash
         )
         new_entry.hash = new_entry.calculate_hash()
-        self.chain.append(new_entry)
+        self._append(new_entry)
+        if self.checkpoint_every and new_entry.index % self.checkpoint_every == 0:
+            self.checkpoint()
         return new_entry
 
-    def validate_chain(self) -> bool:
+    def checkpoint(self) -> Checkpoint:
+        """Seals the current head. Taken automatically every `checkpoint_every` entries."""
+        head = self.chain[-1]
+        checkpoint = Checkpoint(index=head.index, entry_hash=head.hash, created_at=time.time())
+        checkpoint.seal = checkpoint.calculate_seal(self.checkpoint_key)
+        path = self._sidecar_path(_CHECKPOINT_FILE)
+        if path:
+            with open(path, "a") as f:
+                f.write(json.dumps(asdict(checkpoint)) + "\n")
+        self.checkpoints.append(checkpoint)
+        return checkpoint
+
+    def validate_chain(self, workers: int = 1) -> bool:
         """
         Walks the chain and verifies integrity.
         Returns True if valid, False if tampered.
+        Cost grows with the ledger: run it as an offline job (python chain.py validate DIR) and use
+        validate_since() for routine checks. workers > 1 spreads the hashing over a process pool
+        (0: one per CPU); the result and the reported index are the same as the sequential walk.
+        """
+        if workers != 1 and len(self.chain) > 1:
+            return self._report(_validate_parallel(self.chain, self.chain[0], 1, workers or os.cpu_count()))
+        # Sequential walk: on disk each entry is read once, segment by segment
+        entries = iter(self.chain)
+        return self._validate_entries(next(entries, None), entries, start=1)
+
+    def validate_since(self, checkpoint: Optional[Checkpoint] = None, workers: int = 1) -> bool:
+        """
+        Verifies only the entries after a trusted checkpoint (default: the latest one), so the cost is
+        bounded by checkpoint_every rather than by the ledger size. The checkpoint itself must carry a valid
+        seal and still match the stored entry at its index. Entries before it are covered by validate_chain().
         """
-        for i in range(1, len(self.chain)):
-            current = self.chain[i]
-            previous = self.chain[i - 1]
+        if checkpoint is None:
+            if not self.checkpoints:
+                return self.validate_chain(workers)
+            checkpoint = self.checkpoints[-1]
+
+        if not checkpoint.is_sealed_with(self.checkpoint_key):
+            print(f"Untrusted Checkpoint at index {checkpoint.index}: bad seal")
+            return False
+        if checkpoint.index >= len(self.chain):
+            print(f"Truncated Chain: checkpoint at index {checkpoint.index}, chain length {len(self.chain)}")
+            return False
+        anchor = self.chain[checkpoint.index]
+        if anchor.hash != checkpoint.entry_hash or anchor.calculate_hash() != anchor.hash:
+            print(f"Data Tampered at index {checkpoint.index}: does not match checkpoint")
+            return False
+
+        if workers != 1:
+            return self._report(_validate_parallel(self.chain, anchor, checkpoint.index + 1, workers or os.cpu_count()))
+        return self._validate_entries(anchor, _iter_from(self.chain, checkpoint.index + 1), start=checkpoint.index + 1)
+
+    def _validate_entries(self, previous: Optional[AuditEntry], entries: Iterator[AuditEntry], start: int) -> bool:
+        if previous is None:
+            return True
+        return self._report(_first_fault(previous, entries, start))
+
+    @staticmethod
+    def _report(fault: Optional[str]) -> bool:
+        if fault is not None:
+            print(fault)
+        return fault is None
 
-            # 1. Check Link
-            if current.prev_hash != previous.hash:
-                print(f"Broken Link at index {i}: {current.prev_hash} != {previous.hash}")
-                return False
+    def merkle_root(self, size: Optional[int] = None) -> str:
+        """Root over the first `size` entries (default: all). Publish it; proofs verify against it alone."""
+        return self.merkle.root(size)
 
-            # 2. Check Content Integrity
-            recalc = current.calculate_hash()
-            if current.hash != recalc:
-                print(f"Data Tampered at index {i}: {current.hash} != {recalc}")
-                return False
+    def prove_inclusion(self, index: int, tree_size: Optional[int] = None) -> InclusionProof:
+        """O(log n) proof that entry `index` is in the tree of `tree_size` entries; check with verify_inclusion()."""
+        return self.merkle.prove_inclusion(index, tree_size)
 
-        return True
+    def prove_consistency(self, old_size: int, new_size: Optional[int] = None) -> ConsistencyProof:
+        """O(log n) proof that the first old_size entries are unchanged in the new_size tree; check with verify_consistency()."""
+        return self.merkle.prove_consistency(old_size, new_size)
+
+    def close(self) -> None:
+        if hasattr(self.chain, "close"):
+            self.chain.close()
+        if self.merkle is not None:
+            self.merkle.close()
+
+    def _time_bounds(self, since: Optional[float], until: Optional[float]) -> Tuple[int, int]:
+        """Index range [lo, hi) of entries with since <= timestamp < until, by binary search (O(log n) reads)."""
+        timestamp = lambda entry: entry.timestamp
+        lo = 0 if since is None else bisect.bisect_left(self.chain, since, key=timestamp)
+        hi = len(self.chain) if until is None else bisect.bisect_left(self.chain, until, lo=lo, key=timestamp)
+        return lo, hi
+
+    def query(
+        self,
+        actor_id: Optional[str] = None,
+        target_id: Optional[str] = None,
+        action: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[AuditEntry]:
+        """
+        Entries matching every given criterion, in chain order; since/until bound the timestamp as
+        since <= t < until. E.g. actions by X on Y in the last hour: query(actor_id=X, target_id=Y, since=time.time() - 3600).
+        Reads only the matching entries, and the postings of the segments overlapping the time range.
+        """
+        lo, hi = self._time_bounds(since, until)
+        criteria = [(field, value) for field, value in zip(LedgerIndex.FIELDS, (actor_id, target_id, action)) if value is not None]
+        if not criteria:
+            return self.chain[lo:hi]
+        return [self.chain[i] for i in self.index.search(criteria, lo, hi)]
 
     def get_entries_by_actor(self, actor_id: str) -> List[AuditEntry]:
-        return [e for e in self.chain if e.actor_id == actor_id]
+        return self.query(actor_id=actor_id)
+
+def main() -> None:
+    """
+    Offline jobs for a durable ledger. The checkpoint key, if any, comes from AUDIT_CHECKPOINT_KEY.
+    validate only reads, so it can run beside the writer; reindex rewrites the postings and needs the writer stopped.
+    """
+    parser = argparse.ArgumentParser(description="Validate or reindex an on-disk audit ledger.")
+    parser.add_argument("command", choices=["validate", "reindex"])
+    parser.add_argument("directory")
+    parser.add_argument("--since-checkpoint", action="store_true", help="only entries after the latest checkpoint")
+    parser.add_argument("--workers", type=int, default=1, help="processes to hash with (0: one per CPU)")
+    args = parser.parse_args()
+
+    key = os.environ.get("AUDIT_CHECKPOINT_KEY")
+    if args.command == "reindex":
+        ledger = AuditLedger.open(args.directory, checkpoint_key=key.encode() if key else None)
+        ledger.rebuild_indexes()
+        ledger.close()
+        print(f"{len(ledger.chain)} entries reindexed")
+        return
+    ledger = AuditLedger.open_read_only(args.directory, checkpoint_key=key.encode() if key else None)
+    try:
+        if args.since_checkpoint:
+            valid = ledger.validate_since(workers=args.workers)
+        else:
+            valid = ledger.validate_chain(workers=args.workers)
+    finally:
+        ledger.close()
+    print(f"{len(ledger.chain)} entries: {'VALID' if valid else 'TAMPERED'}")
+    raise SystemExit(0 if valid else 1)
+
+if __name__ == "__main__":
+    main()
@@ -78,5 +78,389 @@ class TestAuditLedger(unittest.TestCase):
         h2 = entry.calculate_hash()
         self.assertEqual(h1, h2)
 
+    def test_11_durable_reopen_from_tail(self):
+        """A file-backed ledger survives reopen, reading only the tail segment."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            ledger = AuditLedger.open(directory, segment_size=4)
+            for i in range(10):
+                ledger.log_event(f"u{i % 3}", "A", f"t{i}")
+            last_hash = ledger.chain[-1].hash
+            ledger.close()
+
+            reopened = AuditLedger.open(directory)
+            self.assertEqual(list(reopened.chain._segments), [8]) # tail only
+            self.assertEqual(len(reopened.chain), 11)
+            entry = reopened.log_event("u9", "B", "t11")
+            self.assertEqual((entry.index, entry.prev_hash), (11, last_hash))
+            self.assertTrue(reopened.validate_chain())
+            self.assertEqual(len(reopened.get_entries_by_actor("u0")), 4)
+            self.assertEqual(reopened.chain[5].target_id, "t4")
+            reopened.chain.close()
+
+    def test_12_torn_write_recovery(self):
+        """A record torn by a crash is dropped; one the index missed is re-indexed."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            ledger = AuditLedger.open(directory, segment_size=100)
+            for i in range(3):
+                ledger.log_event("u1", "A", f"t{i}")
+            ledger.chain.close()
+            log_path = os.path.join(directory, f"{0:020d}.log")
+            idx_path = os.path.join(directory, f"{0:020d}.idx")
+            with open(idx_path, "r+b") as idx: # index lost its last offset
+                idx.truncate(os.path.getsize(idx_path) - 8)
+            with open(log_path, "ab") as log: # half-written record
+                log.write(b"\x00\x00\x01\x00{\"index\"")
+
+            reopened = AuditLedger.open(directory)
+            self.assertEqual(len(reopened.chain), 4)
+            self.assertTrue(reopened.validate_chain())
+            self.assertEqual(reopened.log_event("u1", "B", "t3").index, 4)
+            reopened.chain.close()
+
+    def test_13_tamper_on_disk_detect(self):
+        """Editing a stored record on disk breaks validation."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            ledger = AuditLedger.open(directory)
+            ledger.log_event("u1", "APPROVE", "t1")
+            ledger.log_event("u2", "B", "t2")
+            ledger.chain.close()
+            log_path = os.path.join(directory, f"{0:020d}.log")
+            with open(log_path, "rb") as f:
+                data = f.read()
+            with open(log_path, "wb") as f:
+                f.write(data.replace(b"APPROVE", b"REJECTS"))
+
+            reopened = AuditLedger.open(directory)
+            self.assertFalse(reopened.validate_chain())
+            reopened.chain.close()
+
+    def test_14_checkpoints_every_n(self):
+        """Checkpoints are taken every N entries and persisted beside a durable ledger."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            ledger = AuditLedger.open(directory, checkpoint_every=5, checkpoint_key=b"k")
+            for i in range(12):
+                ledger.log_event("u1", "A", f"t{i}")
+            self.assertEqual([c.index for c in ledger.checkpoints], [5, 10])
+            self.assertTrue(ledger.validate_since())
+            ledger.chain.close()
+
+            reopened = AuditLedger.open(directory, checkpoint_key=b"k")
+            self.assertEqual([c.index for c in reopened.checkpoints], [5, 10])
+            self.assertTrue(reopened.validate_since())
+            reopened.chain.close()
+
+    def test_15_validate_since_cost_is_bounded(self):
+        """validate_since re-hashes only the entries after the checkpoint."""
+        ledger = AuditLedger(checkpoint_every=100)
+        for i in range(1000):
+            ledger.log_event("u1", "A", f"t{i}")
+        ledger.log_event("u1", "A", "tail")
+
+        calls = []
+        original = AuditEntry.calculate_hash
+        AuditEntry.calculate_hash = lambda entry: calls.append(entry.index) or original(entry)
+        try:
+            self.assertTrue(ledger.validate_since())
+        finally:
+            AuditEntry.calculate_hash = original
+        self.assertEqual(calls, [1000, 1001]) # the anchor and the one entry after it
+
+        # Tampering after the checkpoint is caught; before it, only the full (offline) walk catches it
+        ledger.chain[1001].action = "EVIL_ACTION"
+        self.assertFalse(ledger.validate_since())
+        ledger.chain[1001].action = "A"
+        ledger.chain[10].action = "EVIL_ACTION"
+        self.assertTrue(ledger.validate_since())
+        self.assertFalse(ledger.validate_chain())
+
+    def test_16_forged_checkpoint_rejected(self):
+        """A checkpoint not sealed with the ledger's key is not trusted."""
+        from chain import Checkpoint
+        ledger = AuditLedger(checkpoint_key=b"secret")
+        ledger.log_event("u1", "A", "t1")
+        forged = Checkpoint(index=1, entry_hash=ledger.chain[1].hash, created_at=0.0)
+        forged.seal = forged.calculate_seal(b"guess")
+        self.assertFalse(ledger.validate_since(forged))
+        self.assertTrue(ledger.validate_since(ledger.checkpoint()))
+
+    def test_17_merkle_inclusion_proofs(self):
+        """Every entry proves against the root alone; a modified entry or wrong root does not."""
+        from chain import verify_inclusion
+        for _ in range(12):
+            self.ledger.log_event("u1", "A", "t1")
+        root = self.ledger.merkle_root()
+        for index in range(len(self.ledger.chain)):
+            proof = self.ledger.prove_inclusion(index)
+            self.assertTrue(verify_inclusion(self.ledger.chain[index], proof, root))
+            self.assertLessEqual(len(proof.path), 4)
+        entry = self.ledger.chain[5]
+        proof = self.ledger.prove_inclusion(5)
+        entry.action = "FORGED"
+        self.assertFalse(verify_inclusion(entry, proof, root))
+        self.assertFalse(verify_inclusion(self.ledger.chain[6], proof, root))
+        self.assertFalse(verify_inclusion(self.ledger.chain[4], self.ledger.prove_inclusion(4), self.ledger.merkle_root(6)))
+
+    def test_18_merkle_consistency_proofs(self):
+        """Every older root is proven a prefix of every newer one; a rewritten prefix is not."""
+        from chain import verify_consistency
+        roots = [None, self.ledger.merkle_root()]
+        for _ in range(10):
+            self.ledger.log_event("u1", "A", "t1")
+            roots.append(self.ledger.merkle_root())
+        size = len(self.ledger.chain)
+        for old in range(1, size + 1):
+            for new in range(old, size + 1):
+                proof = self.ledger.prove_consistency(old, new)
+                self.assertTrue(verify_consistency(proof, roots[old], roots[new]))
+        forked = AuditLedger()
+        forked.log_event("u2", "B", "t2")
+        proof = self.ledger.prove_consistency(2, size)
+        self.assertFalse(verify_consistency(proof, forked.merkle_root(), roots[size]))
+
+    def test_19_merkle_tree_persisted_and_repaired(self):
+        """The tree is reopened from its sidecar files and caught up if it lagged the ledger."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as d:
+            ledger = AuditLedger.open(d, segment_size=4)
+            for i in range(9):
+                ledger.log_event(f"u{i}", "A", "t")
+            root = ledger.merkle_root()
+            ledger.close()
+            reopened = AuditLedger.open(d)
+            self.assertEqual(reopened.merkle_root(), root)
+            reopened.merkle.truncate(3) # as if the process died before the tree was appended
+            reopened.close()
+            repaired = AuditLedger.open(d)
+            self.assertEqual(repaired.merkle.size, 10)
+            self.assertEqual(repaired.merkle_root(), root)
+            repaired.close()
+
+    def test_20_parallel_validation_matches_sequential(self):
+        """A process-pool validation reports the same first fault as the sequential walk."""
+        import contextlib
+        import io
+
+        def report(ledger, workers):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                valid = ledger.validate_chain(workers=workers)
+            return valid, out.getvalue()
+
+        for _ in range(40):
+            self.ledger.log_event("u1", "A", "t1")
+        self.assertEqual(report(self.ledger, 3), (True, ""))
+        self.ledger.chain[30].action = "FORGED"
+        self.ledger.chain[13].prev_hash = "0" * 64 # 3 workers scan ranges of 4 from index 1: a range boundary
+        sequential = report(self.ledger, 1)
+        self.assertIn("Broken Link at index 13", sequential[1])
+        self.assertEqual(report(self.ledger, 3), sequential)
+
+    def test_21_parallel_validation_on_disk(self):
+        """Workers read the segment files themselves; a record edited on disk is reported at its index."""
+        import contextlib
+        import io
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            ledger = AuditLedger.open(directory, segment_size=8)
+            for i in range(50):
+                ledger.log_event("u1", f"A{i}", "t1")
+            self.assertTrue(ledger.validate_chain(workers=2))
+            ledger.close()
+            log_path = os.path.join(directory, f"{16:020d}.log")
+            with open(log_path, "rb") as f:
+                data = f.read()
+            with open(log_path, "wb") as f:
+                f.write(data.replace(b'"A20"', b'"X20"'))
+
+            reopened = AuditLedger.open(directory)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertFalse(reopened.validate_chain(workers=2))
+            self.assertTrue(out.getvalue().startswith("Data Tampered at index 21"))
+            reopened.close()
+
+    def test_22_indexed_compound_queries(self):
+        """Queries by actor, target, action and time range combine, and match a full scan."""
+        from unittest import mock
+        clock = iter(range(1000, 2000, 60)) # one event a minute
+        with mock.patch("time.time", lambda: float(next(clock))):
+            for i in range(16):
+                self.ledger.log_event(f"u{i % 2}", ["READ", "SEND"][i % 3 == 0], f"t{i % 4}")
+        now = 1000 + 15 * 60
+
+        last_hour = self.ledger.query(actor_id="u0", target_id="t2", since=now - 3600)
+        self.assertEqual([e.index for e in last_hour], [3, 7, 11, 15])
+        recent = self.ledger.query(actor_id="u0", action="SEND", since=now - 10 * 60, until=now)
+        self.assertEqual([e.index for e in recent], [7, 13])
+        self.assertEqual([e.index for e in self.ledger.query(since=now - 60)], [15, 16])
+        self.assertEqual(self.ledger.query(actor_id="nobody"), [])
+        for entry in self.ledger.query(target_id="t1", action="READ"):
+            self.assertEqual((entry.target_id, entry.action), ("t1", "READ"))
+        scan = [e for e in self.ledger.chain if e.actor_id == "u1"]
+        self.assertEqual(self.ledger.get_entries_by_actor("u1"), scan)
+
+    def test_23_indexes_persisted_and_rebuildable(self):
+        """Sealed segments get posting files, read lazily; missing or unreadable ones are rebuilt from the chain."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as d:
+            ledger = AuditLedger.open(d, segment_size=4)
+            for i in range(9):
+                ledger.log_event(f"u{i % 2}", "A", f"t{i}")
+            self.assertEqual(sorted(n for n in os.listdir(d) if n.endswith(".post")), [f"{0:020d}.post", f"{4:020d}.post"])
+            ledger.close()
+
+            reopened = AuditLedger.open(d)
+            self.assertEqual(len(reopened.index._loaded), 0) # nothing read until a query needs it
+            self.assertEqual([e.index for e in reopened.query(actor_id="u0")], [1, 3, 5, 7, 9])
+            since = reopened.chain[6].timestamp
+            expected = [e.index for e in reopened.chain if e.actor_id == "u1" and e.timestamp >= since]
+            self.assertEqual([e.index for e in reopened.query(actor_id="u1", since=since)], expected)
+            reopened.log_event("u0", "B", "t2")
+            reopened.chain.close() # crash: nothing else is written
+
+            os.remove(os.path.join(d, f"{0:020d}.post"))
+            with open(os.path.join(d, f"{4:020d}.post"), "w") as f:
+                f.write("{ torn")
+            recovered = AuditLedger.open(d)
+            self.assertEqual([e.index for e in recovered.query(target_id="t2")], [3, 10])
+            self.assertEqual([e.index for e in recovered.query(actor_id="u0", action="B")], [10])
+            recovered.rebuild_indexes()
+            self.assertEqual([e.index for e in recovered.query(actor_id="u1")], [2, 4, 6, 8])
+            recovered.close()
+
+    def test_24_parallel_ranges_follow_segments(self):
+        """Only the first range may start off a segment boundary; together the ranges cover start..end once."""
+        from chain import _ranges
+        for start, end, workers in [(0, 100, 2), (11, 100, 2), (11, 13, 4), (16, 17, 3), (5, 1000, 8)]:
+            bounds = _ranges(start, end, workers, 8)
+            self.assertEqual(bounds[0][0], start)
+            self.assertEqual(bounds[-1][1], end)
+            for (_, hi), (lo, _) in zip(bounds, bounds[1:]):
+                self.assertEqual(hi, lo)
+                self.assertEqual(lo % 8, 0)
+            self.assertTrue(all(lo < hi for lo, hi in bounds))
+
+    def test_25_index_offsets_little_endian(self):
+        """.idx files hold little-endian offsets, whether written by append or rebuilt on recovery."""
+        import os
+        import struct
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            ledger = AuditLedger.open(directory, segment_size=100)
+            for i in range(3):
+                ledger.log_event("u1", "A", f"t{i}")
+            ledger.close()
+            log_path = os.path.join(directory, f"{0:020d}.log")
+            idx_path = os.path.join(directory, f"{0:020d}.idx")
+
+            def record_offsets():
+                with open(log_path, "rb") as f:
+                    data = f.read()
+                offsets, position = [], 0
+                while position < len(data):
+                    offsets.append(position)
+                    position += 4 + struct.unpack_from(">I", data, position)[0]
+                return offsets
+
+            def stored_offsets():
+                with open(idx_path, "rb") as f:
+                    raw = f.read()
+                return list(struct.unpack(f"<{len(raw) // 8}Q", raw))
+
+            self.assertEqual(stored_offsets(), record_offsets())
+            with open(idx_path, "r+b") as idx: # recovery rewrites the whole index
+                idx.truncate(8)
+            reopened = AuditLedger.open(directory)
+            self.assertEqual(stored_offsets(), record_offsets())
+            self.assertTrue(reopened.validate_chain())
+            reopened.close()
+
+    def test_26_merkle_upper_levels_lost(self):
+        """Leaves on disk but parents lost (levels flush separately): the parents are recomputed on open."""
+        import os
+        import tempfile
+        from chain import MerkleAccumulator, verify_inclusion
+        with tempfile.TemporaryDirectory() as d:
+            ledger = AuditLedger.open(d, segment_size=512)
+            for i in range(3000):
+                ledger.log_event(f"u{i % 7}", "A", "t")
+            ledger.close()
+            for name in os.listdir(d): # only level 0 reached the disk
+                if name.startswith("merkle-") and name != "merkle-00.bin":
+                    with open(os.path.join(d, name), "r+b") as f:
+                        f.truncate(0)
+
+            reopened = AuditLedger.open(d)
+            for i in range(10):
+                reopened.log_event("u1", "B", "t")
+            fresh = MerkleAccumulator()
+            for entry in reopened.chain:
+                fresh.append(entry.hash)
+            self.assertEqual(reopened.merkle_root(), fresh.root())
+            root = reopened.merkle_root()
+            for index in (0, 1500, 2047, 2048, 3009):
+                self.assertTrue(verify_inclusion(reopened.chain[index], reopened.prove_inclusion(index), root))
+            reopened.close()
+
+    def test_27_scan_beside_an_unindexed_record(self):
+        """A record already in the .log but not yet in the .idx does not disturb a reader of the indexed ones."""
+        import os
+        import tempfile
+        from chain import _RECORD_HEADER, _scan_segments
+        with tempfile.TemporaryDirectory() as d:
+            ledger = AuditLedger.open(d, segment_size=8)
+            for i in range(5):
+                ledger.log_event("u1", f"A{i}", "t")
+            length, last_hash = len(ledger.chain), ledger.chain[-1].hash
+            ledger.close()
+            with open(os.path.join(d, f"{0:020d}.log"), "ab") as log: # the writer is between its two writes
+                payload = b'{"index": 5}'
+                log.write(_RECORD_HEADER.pack(len(payload)) + payload)
+            self.assertEqual(_scan_segments(d, 8, 0, length)[::2], (None, last_hash))
+
+    def test_28_read_only_validation_touches_nothing(self):
+        """validate opens the ledger read-only: a live writer's half-written tail and sidecar files stay as they are."""
+        import os
+        import tempfile
+        from unittest import mock
+        from chain import _RECORD_HEADER, main
+        with tempfile.TemporaryDirectory() as d:
+            ledger = AuditLedger.open(d, segment_size=8)
+            for i in range(20):
+                ledger.log_event("u1", f"A{i}", "t")
+            ledger.close()
+            with open(os.path.join(d, f"{16:020d}.log"), "ab") as log: # the writer is mid-record
+                log.write(_RECORD_HEADER.pack(200) + b'{"index": 21')
+            os.remove(os.path.join(d, "merkle-01.bin")) # and its tree lags
+
+            def snapshot():
+                files = {}
+                for name in sorted(os.listdir(d)):
+                    with open(os.path.join(d, name), "rb") as f:
+                        files[name] = f.read()
+                return files
+
+            before = snapshot()
+            reader = AuditLedger.open_read_only(d)
+            self.assertEqual(len(reader.chain), 21)
+            self.assertTrue(reader.validate_chain())
+            self.assertTrue(reader.validate_chain(workers=2))
+            with self.assertRaises(ValueError):
+                reader.log_event("u1", "B", "t")
+            reader.close()
+            with mock.patch("sys.argv", ["chain.py", "validate", d]), mock.patch("sys.stdout"):
+                with self.assertRaises(SystemExit) as exit:
+                    main()
+            self.assertEqual(exit.exception.code, 0)
+            self.assertEqual(snapshot(), before)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,21 +1,53 @@
+import asyncio
+import bisect
 import functools
 import inspect
+import logging
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import date, time as time_of_day, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
 class VerificationFault(Exception):
     pass
 
 class Guarantee:
-    """Base class for all runtime guarantees."""
+    """
+    Base class for all runtime guarantees.
+    Instances are created once per decorated function and shared across calls, so check() must not keep per-call state.
+    """
+    # True when check() only reads keyword arguments the caller passed explicitly.
+    # If every guarantee on a function says so, @verify skips argument binding entirely.
+    kwargs_only = False
+    # A guarantee that passed is not re-evaluated for the same arguments within one call chain / verification_scope().
+    # None (the default) memoizes only guarantees that are not security critical; set True to opt a critical one in,
+    # or False for checks whose answer can change mid-request (quotas, clocks).
+    memoize = None
+    # Only guarantees marked non-critical may be sampled or shadowed (see configure()).
+    security_critical = True
+    sample_rate = 1.0 # fraction of calls on which check() runs
+    shadow = False # log violations instead of raising
+
     def check(self, *args, **kwargs) -> bool:
         raise NotImplementedError
 
 class G_Allow(Guarantee):
     """Always passes (for testing)."""
+    kwargs_only = True
+
     def check(self, *args, **kwargs):
         return True
 
 class G_Deny(Guarantee):
     """Always fails (to prove veto power)."""
+    kwargs_only = True
+
     def check(self, *args, **kwargs):
         raise VerificationFault("Explicit G_Deny triggered.")
 
@@ -27,26 +59,361 @@ class G_Auth_Token_Present(Guarantee):
             raise VerificationFault("G_AUTH Violation: No auth_token provided.")
         return True
 
+def _argument_binder(func):
+    """
+    Resolves func's signature once. Returns bind(args, kwargs) -> {param: value} with defaults applied,
+    equivalent to sig.bind_partial(...).apply_defaults() but without per-call inspect overhead
+    for plain signatures (no *args, **kwargs or positional-only parameters).
+    """
+    sig = inspect.signature(func)
+    params = list(sig.parameters.values())
+
+    if not all(p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) for p in params):
+        def bind(args, kwargs):
+            bound = sig.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+        return bind
+
+    positional = [p.name for p in params if p.kind is p.POSITIONAL_OR_KEYWORD]
+    defaults = {p.name: p.default for p in params if p.default is not p.empty}
+    # Keyword-only parameters sort after every positional slot
+    slots = {p.name: (i if p.kind is p.POSITIONAL_OR_KEYWORD else len(params)) for i, p in enumerate(params)}
+    name = func.__qualname__
+
+    def bind(args, kwargs):
+        # Same TypeErrors as bind_partial, so guarantees never see arguments no real call could have
+        if len(args) > len(positional):
+            raise TypeError(f"{name}() takes {len(positional)} positional arguments but {len(args)} were given")
+        for key in kwargs:
+            slot = slots.get(key)
+            if slot is None:
+                raise TypeError(f"{name}() got an unexpected keyword argument '{key}'")
+            if slot < len(args):
+                raise TypeError(f"{name}() got multiple values for argument '{key}'")
+        arguments = dict(defaults)
+        arguments.update(zip(positional, args))
+        arguments.update(kwargs)
+        return arguments
+    return bind
+
+# Guarantees that already passed in the current call chain: {(guarantee, fingerprint), ...}
+_passed: ContextVar[Optional[Set[Tuple[Any, Tuple]]]] = ContextVar("verification_passed", default=None)
+
+class verification_scope:
+    """
+    Shares the pass memo across several guarded calls, e.g. everything one request does.
+    Without it, each outermost guarded call with a memoizing guarantee opens a memo of its own.
+    """
+    def __enter__(self):
+        self._token = _passed.set(set()) if _passed.get() is None else None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._token is not None:
+            _passed.reset(self._token)
+        return False
+
+# Upper bounds in seconds; the last bucket catches everything slower
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, float("inf"))
+OUTCOMES = ("passed", "failed", "shadow_violation", "sampled_out", "memoized")
+
+class GuaranteeStats:
+    """Outcome counters and a latency histogram for one guarantee, across every function it guards."""
+    __slots__ = ("name", "counts", "buckets", "total_seconds")
+
+    def __init__(self, name: str):
+        self.name = name # display name; not unique
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = dict.fromkeys(OUTCOMES, 0)
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.total_seconds = 0.0
+
+    def observe(self, outcome: str, seconds: float) -> None:
+        """An evaluation: counted, and its latency recorded."""
+        self.counts[outcome] += 1
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total_seconds += seconds
+
+    def skipped(self, outcome: str) -> None:
+        """A call on which check() did not run: counted only, so the histogram reflects real evaluations."""
+        self.counts[outcome] += 1
+
+class VerificationMetrics:
+    """
+    The metrics surface: per-guarantee stats keyed by guarantee_key(), the same identity configure() uses,
+    so two guarantees that share a class name are never merged.
+    snapshot() is plain data for an exporter; latency buckets are cumulative, Prometheus-style.
+    """
+    def __init__(self):
+        self.enabled = True
+        self._stats: Dict[str, GuaranteeStats] = {}
+
+    def stats_for(self, guarantee) -> GuaranteeStats:
+        key = guarantee_key(guarantee)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = GuaranteeStats(_guarantee_name(guarantee))
+        return stats
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for key, stats in self._stats.items():
+            cumulative, running = {}, 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                running += count
+                cumulative[bound] = running
+            result[key] = {
+                "name": stats.name, **stats.counts, "latency_buckets": cumulative, "latency_sum": stats.total_seconds,
+            }
+        return result
+
+    def reset(self) -> None:
+        # In place: decorated functions hold on to their GuaranteeStats
+        for stats in self._stats.values():
+            stats.reset()
+
+metrics = VerificationMetrics()
+
+class GuaranteePolicy:
+    """How a guarantee is evaluated at runtime. Shared by every function it guards; change it with configure()."""
+    __slots__ = ("sample_rate", "shadow")
+
+    def __init__(self, sample_rate: float = 1.0, shadow: bool = False):
+        self.sample_rate = sample_rate
+        self.shadow = shadow
+
+_policies: Dict[Any, GuaranteePolicy] = {}
+
+def _check_policy(guarantee, sample_rate: float, shadow: bool) -> None:
+    if not 0.0 <= sample_rate <= 1.0:
+        raise ValueError(f"sample_rate must be within [0, 1], got {sample_rate}")
+    if getattr(guarantee, "security_critical", True) and (sample_rate < 1.0 or shadow):
+        raise ValueError(f"{_guarantee_name(guarantee)} is security critical: it cannot be sampled or shadowed")
+
+def _policy_for(ident, instance) -> GuaranteePolicy:
+    policy = _policies.get(ident)
+    if policy is None:
+        sample_rate, shadow = getattr(instance, "sample_rate", 1.0), getattr(instance, "shadow", False)
+        _check_policy(instance, sample_rate, shadow)
+        policy = _policies[ident] = GuaranteePolicy(sample_rate, shadow)
+    return policy
+
+def configure(guarantee, sample_rate: Optional[float] = None, shadow: Optional[bool] = None) -> GuaranteePolicy:
+    """
+    Changes how `guarantee` (the class, or the instance passed to @verify) is evaluated, for every function it
+    guards, including ones already decorated. Only guarantees with security_critical = False may be
+    sampled or shadowed.
+    """
+    policy = _policies.setdefault(guarantee, GuaranteePolicy(
+        getattr(guarantee, "sample_rate", 1.0), getattr(guarantee, "shadow", False)
+    ))
+    sample_rate = policy.sample_rate if sample_rate is None else sample_rate
+    shadow = policy.shadow if shadow is None else shadow
+    _check_policy(guarantee, sample_rate, shadow)
+    policy.sample_rate, policy.shadow = sample_rate, shadow
+    return policy
+
+def _guarantee_name(guarantee) -> str:
+    return guarantee.__name__ if isinstance(guarantee, type) else type(guarantee).__name__
+
+def guarantee_key(guarantee) -> str:
+    """
+    The metrics key for `guarantee` (a class, or the instance passed to @verify): "module.QualName",
+    plus "@<id>" for an instance, which is configured separately from its class.
+    """
+    cls = guarantee if isinstance(guarantee, type) else type(guarantee)
+    key = f"{cls.__module__}.{cls.__qualname__}"
+    return key if guarantee is cls else f"{key}@{id(guarantee):x}"
+
+# Immutable, compared by value: safe to memoize on. Anything else (dicts, lists, most objects) can change in place
+# between two calls while keeping its identity, so a call that passes one is never memoized.
+_VALUE_TYPES = (type(None), bool, int, float, complex, str, bytes, Decimal, date, time_of_day, timedelta, uuid.UUID, Enum)
+
+def _by_value(value) -> bool:
+    if isinstance(value, _VALUE_TYPES):
+        return True
+    if type(value) in (tuple, frozenset):
+        return all(_by_value(item) for item in value)
+    return False
+
+def _fingerprint(arguments: Dict[str, Any]) -> Optional[Tuple]:
+    """A hashable key for one call's arguments, or None if any of them is not a plain value."""
+    if all(_by_value(value) for value in arguments.values()):
+        return tuple(arguments.items())
+    return None
+
+class _Step(NamedTuple):
+    ident: Any # the guarantee class, or the instance if one was passed
+    name: str
+    check: Any
+    is_async: bool
+    memoize: bool
+    policy: GuaranteePolicy
+    stats: GuaranteeStats
+
+def _record_pass(passed, key, step: _Step) -> None:
+    if key is not None and step.memoize:
+        passed.add((step.ident, key))
+
+def _skip(passed, key, step: _Step) -> bool:
+    """Memoized or sampled out: the check does not run on this call."""
+    if key is not None and step.memoize and (step.ident, key) in passed:
+        if metrics.enabled:
+            step.stats.skipped("memoized")
+        return True
+    if step.policy.sample_rate < 1.0 and random.random() >= step.policy.sample_rate:
+        if metrics.enabled:
+            step.stats.skipped("sampled_out")
+        return True
+    return False
+
+def _violation(step: _Step, error: Exception, seconds: float) -> None:
+    """Records a failed check; re-raises unless the guarantee is in shadow mode."""
+    if not step.policy.shadow:
+        if metrics.enabled:
+            step.stats.observe("failed", seconds)
+        raise error
+    if metrics.enabled:
+        step.stats.observe("shadow_violation", seconds)
+    logger.warning("Shadow guarantee %s violated: %s", step.name, error)
+
+def _evaluate(step: _Step, arguments: Dict[str, Any]) -> bool:
+    """Runs one sync check. Returns True if it passed (a shadowed violation returns False)."""
+    start = time.perf_counter()
+    try:
+        # Pass the context (arguments) to the guarantee
+        step.check(**arguments)
+    except Exception as e:
+        _violation(step, e, time.perf_counter() - start)
+        return False
+    if metrics.enabled:
+        step.stats.observe("passed", time.perf_counter() - start)
+    return True
+
+async def _evaluate_async(step: _Step, arguments: Dict[str, Any]) -> bool:
+    start = time.perf_counter()
+    try:
+        await step.check(**arguments)
+    except Exception as e:
+        _violation(step, e, time.perf_counter() - start)
+        return False
+    if metrics.enabled:
+        step.stats.observe("passed", time.perf_counter() - start)
+    return True
+
+def _run_sync(steps: List[_Step], arguments: Dict[str, Any]) -> None:
+    passed = _passed.get()
+    key = None if passed is None else _fingerprint(arguments)
+    for step in steps:
+        if not _skip(passed, key, step) and _evaluate(step, arguments):
+            _record_pass(passed, key, step)
+
+async def _run_async(steps: List[_Step], arguments: Dict[str, Any]) -> None:
+    """Sync guarantees first, in order; then async ones concurrently, cancelling the rest on the first fault."""
+    _run_sync([step for step in steps if not step.is_async], arguments)
+
+    passed = _passed.get()
+    key = None if passed is None else _fingerprint(arguments)
+    pending = [step for step in steps if step.is_async and not _skip(passed, key, step)]
+    if not pending:
+        return
+
+    # asyncio.gather would let the remaining checks run on after a fault; wait() lets us cancel them
+    tasks = [asyncio.ensure_future(_evaluate_async(step, arguments)) for step in pending]
+    try:
+        done, not_done = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    for task in not_done:
+        task.cancel()
+    if not_done:
+        await asyncio.wait(not_done)
+    for task in tasks: # guarantee order decides which fault is reported
+        if task in done and task.exception() is not None:
+            raise task.exception()
+
+    for step, task in zip(pending, tasks):
+        if task.result():
+            _record_pass(passed, key, step)
+
+def _memoizes(instance) -> bool:
+    memoize = getattr(instance, "memoize", None)
+    if memoize is None:
+        return not getattr(instance, "security_critical", True)
+    return memoize
+
 def verify(guarantees):
     """
     The Phase 15.H Decorator.
     Executes ALL guarantees BEFORE the target function.
+    Signature and guarantee instances are resolved here, at decoration time, not per call.
+
+    `async def` functions are wrapped natively and may use guarantees whose check() is async.
     """
     def decorator_verify(func):
+        # We instantiate if it's a class, or use if instance
+        steps = []
+        kwargs_only = True
+        for g in guarantees:
+            instance = g() if isinstance(g, type) else g
+            kwargs_only = kwargs_only and getattr(instance, "kwargs_only", False)
+            steps.append(_Step(
+                ident=g,
+                name=_guarantee_name(g),
+                check=instance.check,
+                is_async=inspect.iscoroutinefunction(instance.check),
+                memoize=_memoizes(instance),
+                policy=_policy_for(g, instance),
+                stats=metrics.stats_for(g),
+            ))
+        # Bind arguments to parameter names for easier inspection
+        bind = (lambda args, kwargs: kwargs) if kwargs_only else _argument_binder(func)
+        # Opening a memo costs a ContextVar set/reset per call, so functions guarded only by non-memoizing
+        # guarantees skip it (they still join an enclosing memo, if any)
+        opens_memo = any(step.memoize for step in steps)
+
+        if inspect.iscoroutinefunction(func):
+            if not opens_memo:
+                @functools.wraps(func)
+                async def async_wrapper_verify(*args, **kwargs):
+                    await _run_async(steps, bind(args, kwargs))
+                    return await func(*args, **kwargs)
+                return async_wrapper_verify
+
+            @functools.wraps(func)
+            async def async_wrapper_verify(*args, **kwargs):
+                token = _passed.set(set()) if _passed.get() is None else None
+                try:
+                    await _run_async(steps, bind(args, kwargs))
+                    return await func(*args, **kwargs)
+                finally:
+                    if token is not None:
+                        _passed.reset(token)
+            return async_wrapper_verify
+
+        if any(step.is_async for step in steps):
+            raise TypeError(f"{func.__qualname__} is sync but has async guarantees; make it `async def`")
+
+        if not opens_memo:
+            @functools.wraps(func)
+            def wrapper_verify(*args, **kwargs):
+                _run_sync(steps, bind(args, kwargs))
+                return func(*args, **kwargs)
+            return wrapper_verify
+
         @functools.wraps(func)
         def wrapper_verify(*args, **kwargs):
-            # Bind arguments to parameter names for easier inspection
-            sig = inspect.signature(func)
-            bound = sig.bind_partial(*args, **kwargs)
-            bound.apply_defaults()
-            all_args = bound.arguments
-
-            for g in guarantees:
-                # Pass the context (arguments) to the guarantee
-                # We instantiate if it's a class, or use if instance
-                check_obj = g() if isinstance(g, type) else g
-                check_obj.check(**all_args)
-            
-            return func(*args, **kwargs)
+            token = _passed.set(set()) if _passed.get() is None else None
+            try:
+                _run_sync(steps, bind(args, kwargs))
+                return func(*args, **kwargs)
+            finally:
+                if token is not None:
+                    _passed.reset(token)
         return wrapper_verify
     return decorator_verify
@@ -95,5 +95,296 @@ class TestPhase15H(unittest.TestCase):
         run()
         self.assertEqual(side_effects, ["CHECK", "RUN"])
 
+    def test_11_guarantees_instantiated_once(self):
+        """Guarantee classes are instantiated at decoration time, not per call."""
+        created = []
+        class G_Count:
+            def __init__(self):
+                created.append(self)
+            def check(self, **kwargs):
+                return True
+
+        @verify([G_Count])
+        def op(): return "OK"
+
+        for _ in range(3):
+            op()
+        self.assertEqual(len(created), 1)
+
+    def test_12_binding_matches_inspect(self):
+        """Precomputed binding sees the same arguments as bind_partial + apply_defaults."""
+        import inspect
+        seen = []
+        class G_Record:
+            def check(self, **kwargs):
+                seen.append(kwargs)
+
+        def plain(a, b=2, *, c=3): pass
+        def variadic(a, *rest, d=4, **extra): pass
+
+        for func, args, kwargs in [(plain, (1,), {}), (plain, (1, 5), {"c": 6}), (variadic, (1, 2, 3), {"e": 5})]:
+            bound = inspect.signature(func).bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            verify([G_Record])(func)(*args, **kwargs)
+            self.assertEqual(seen.pop(), dict(bound.arguments))
+
+        # Calls bind_partial rejects are rejected before any guarantee runs
+        guarded = verify([G_Record])(plain)
+        for args, kwargs in [((1, 2, 3), {}), ((1,), {"z": 0}), ((1,), {"a": 2})]:
+            with self.assertRaises(TypeError):
+                inspect.signature(plain).bind_partial(*args, **kwargs)
+            with self.assertRaises(TypeError):
+                guarded(*args, **kwargs)
+        self.assertEqual(seen, [])
+
+    def test_13_async_function_async_guarantees(self):
+        """async def functions are awaited only after async guarantees pass."""
+        import asyncio
+        side_effects = []
+        class G_AsyncToken:
+            async def check(self, auth_token=None, **kwargs):
+                await asyncio.sleep(0)
+                side_effects.append("CHECK")
+                if not auth_token: raise VerificationFault("no token")
+
+        @verify([G_AsyncToken, G_Allow])
+        async def send(auth_token=None):
+            side_effects.append("RUN")
+            return "SENT"
+
+        self.assertEqual(asyncio.run(send(auth_token="t")), "SENT")
+        self.assertEqual(side_effects, ["CHECK", "RUN"])
+        with self.assertRaises(VerificationFault):
+            asyncio.run(send())
+        self.assertEqual(side_effects, ["CHECK", "RUN", "CHECK"])
+
+    def test_14_async_fault_cancels_siblings(self):
+        """The first async fault cancels the guarantees still running."""
+        import asyncio
+        cancelled = []
+        class G_Slow:
+            async def check(self, **kwargs):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+        class G_FastDeny:
+            async def check(self, **kwargs):
+                raise VerificationFault("denied")
+
+        @verify([G_Slow, G_FastDeny])
+        async def op(): return "NO"
+
+        with self.assertRaises(VerificationFault):
+            asyncio.run(asyncio.wait_for(op(), timeout=2))
+        self.assertEqual(cancelled, [True])
+
+    def test_15_memo_within_call_chain(self):
+        """A guarantee that passed is not re-evaluated for the same arguments further down the chain."""
+        import asyncio
+        from engine import verification_scope
+        evaluations = []
+        class G_Count:
+            memoize = True
+            async def check(self, tenant_id=None, **kwargs):
+                evaluations.append(tenant_id)
+
+        @verify([G_Count])
+        async def inner(tenant_id): return tenant_id
+
+        # The outermost call opens a memo for the chain
+        @verify([G_Count])
+        async def outer(tenant_id):
+            return [await inner(tenant_id), await inner("other")]
+
+        self.assertEqual(asyncio.run(outer("t1")), ["t1", "other"])
+        self.assertEqual(evaluations, ["t1", "other"])
+
+        # Separate top-level calls are separate chains, unless joined by a scope
+        asyncio.run(inner("t1"))
+        self.assertEqual(evaluations, ["t1", "other", "t1"])
+        async def request():
+            with verification_scope():
+                await inner("t2")
+                await inner("t2")
+        asyncio.run(request())
+        self.assertEqual(evaluations, ["t1", "other", "t1", "t2"])
+
+        # A nested call with the same arguments is not evaluated again
+        @verify([G_Count])
+        async def forward(tenant_id):
+            return await inner(tenant_id)
+        del evaluations[:]
+        self.assertEqual(asyncio.run(forward("t3")), "t3")
+        self.assertEqual(evaluations, ["t3"])
+
+        # Calls passing a mutable argument are never memoized; the nested call is, on its plain values
+        @verify([G_Count])
+        async def lone(tenant_id, tags):
+            return await inner(tenant_id)
+        tags = ["a"]
+        async def tagged():
+            with verification_scope():
+                await lone("t4", tags)
+                await lone("t4", tags)
+        asyncio.run(tagged())
+        self.assertEqual(evaluations, ["t3", "t4", "t4", "t4"])
+
+    def test_16_async_guarantee_on_sync_function_rejected(self):
+        """A sync function cannot await async guarantees: rejected at decoration time."""
+        class G_Async:
+            async def check(self, **kwargs): return True
+        with self.assertRaises(TypeError):
+            @verify([G_Async])
+            def op(): return "NO"
+
+    def test_17_metrics_per_guarantee(self):
+        """Each evaluation is counted by outcome with its latency."""
+        from engine import guarantee_key, metrics
+        class G_Metered:
+            memoize = True
+            def check(self, x=None, **kwargs):
+                if x is None: raise VerificationFault("x required")
+
+        @verify([G_Metered])
+        def op(x=None): return x
+
+        op(1)
+        op(2)
+        with self.assertRaises(VerificationFault):
+            op()
+        stats = metrics.snapshot()[guarantee_key(G_Metered)]
+        self.assertEqual(stats["name"], "G_Metered")
+        self.assertEqual((stats["passed"], stats["failed"]), (2, 1))
+        self.assertEqual(stats["latency_buckets"][float("inf")], 3)
+        self.assertGreater(stats["latency_sum"], 0.0)
+
+        # Memoized calls are counted, but only evaluations are in the histogram
+        from engine import verification_scope
+        with verification_scope():
+            op(3)
+            op(3)
+        stats = metrics.snapshot()[guarantee_key(G_Metered)]
+        self.assertEqual(stats["memoized"], 1)
+        self.assertEqual(stats["latency_buckets"][float("inf")], stats["passed"] + stats["failed"] + stats["shadow_violation"])
+
+    def test_18_sampling_only_for_non_critical(self):
+        """Non-critical guarantees can be sampled; security-critical ones cannot."""
+        from engine import configure, guarantee_key, metrics
+        runs = []
+        class G_Expensive:
+            security_critical = False
+            def check(self, **kwargs):
+                runs.append(1)
+
+        @verify([G_Expensive])
+        def op(): return "OK"
+
+        configure(G_Expensive, sample_rate=0.0)
+        for _ in range(5):
+            self.assertEqual(op(), "OK")
+        self.assertEqual(runs, [])
+        stats = metrics.snapshot()[guarantee_key(G_Expensive)]
+        self.assertEqual(stats["sampled_out"], 5)
+        # Skipped calls are counted but never enter the latency histogram
+        self.assertEqual(stats["latency_buckets"][float("inf")], 0)
+
+        configure(G_Expensive, sample_rate=1.0)
+        op()
+        self.assertEqual(runs, [1])
+
+        with self.assertRaises(ValueError):
+            configure(G_Auth_Token_Present, sample_rate=0.5)
+
+    def test_19_shadow_mode_logs_instead_of_raising(self):
+        """In shadow mode a violation is logged and counted, and the function still runs."""
+        from engine import configure, guarantee_key, metrics
+        class G_Strict:
+            security_critical = False
+            shadow = True
+            def check(self, **kwargs):
+                raise VerificationFault("would block")
+
+        @verify([G_Strict])
+        def op(): return "RAN"
+
+        with self.assertLogs("engine", level="WARNING") as logs:
+            self.assertEqual(op(), "RAN")
+        self.assertIn("would block", logs.output[0])
+        self.assertEqual(metrics.snapshot()[guarantee_key(G_Strict)]["shadow_violation"], 1)
+
+        configure(G_Strict, shadow=False)
+        with self.assertRaises(VerificationFault):
+            op()
+
+    def test_20_static_check(self):
+        """check() may be a staticmethod: nothing assumes a bound method."""
+        class G_Static:
+            kwargs_only = True
+            @staticmethod
+            def check(**kwargs):
+                if not kwargs.get("ok"): raise VerificationFault("not ok")
+
+        @verify([G_Static])
+        def op(ok=False): return "OK"
+        self.assertEqual(op(ok=True), "OK")
+        with self.assertRaises(VerificationFault):
+            op()
+
+    def test_21_metrics_keyed_like_policies(self):
+        """Same-named guarantees get separate stats, as they get separate policies."""
+        from engine import guarantee_key, metrics
+        class Billing:
+            class G_Twin:
+                kwargs_only = True
+                def check(self, **kwargs): return True
+        class Mail:
+            class G_Twin(Billing.G_Twin):
+                pass
+        first, second = Billing.G_Twin, Mail.G_Twin
+        shared = second()
+
+        verify([first])(lambda: None)()
+        verify([shared])(lambda: None)()
+        verify([shared])(lambda: None)()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot[guarantee_key(first)]["passed"], 1)
+        self.assertEqual(snapshot[guarantee_key(shared)]["passed"], 2)
+        self.assertNotIn(guarantee_key(second), snapshot)
+        self.assertEqual(snapshot[guarantee_key(shared)]["name"], "G_Twin")
+
+    def test_22_memo_never_trusts_mutable_arguments(self):
+        """An argument changed in place is checked again; security-critical guarantees are not memoized by default."""
+        from engine import verification_scope
+        checked = []
+        class G_SameTenant:
+            memoize = True
+            def check(self, record=None, **kwargs):
+                checked.append(record["tenant_id"])
+                if record["tenant_id"] != "t1": raise VerificationFault("cross-tenant write")
+
+        @verify([G_SameTenant])
+        def write(record): return "WRITTEN"
+
+        record = {"tenant_id": "t1"}
+        with verification_scope():
+            self.assertEqual(write(record), "WRITTEN")
+            record["tenant_id"] = "t2"
+            with self.assertRaises(VerificationFault):
+                write(record)
+        self.assertEqual(checked, ["t1", "t2"])
+
+        class G_Critical:
+            def check(self, tenant_id=None, **kwargs):
+                checked.append(tenant_id)
+
+        @verify([G_Critical])
+        def read(tenant_id): return tenant_id
+        with verification_scope():
+            read("t1")
+            read("t1")
+        self.assertEqual(checked, ["t1", "t2", "t1", "t1"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,37 @@
+"""Scope email idempotency by tenant
+
+Revision ID: 22d6c8bd7a37
+Revises: 3561984408ba
+Create Date: 2026-10-18 08:49:12.344339
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '22d6c8bd7a37'
+down_revision: Union[str, Sequence[str], None] = '3561984408ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Batch mode so SQLite can add the foreign key (table is recreated there)
+    with op.batch_alter_table('emails') as batch_op:
+        batch_op.add_column(sa.Column('tenant_id', sa.String(), nullable=True))
+        batch_op.create_foreign_key('fk_emails_tenant_id_tenants', 'tenants', ['tenant_id'], ['id'])
+        batch_op.drop_index('ix_emails_provider_message_id')
+        batch_op.create_index('ux_emails_tenant_id_provider_message_id', ['tenant_id', 'provider_message_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('emails') as batch_op:
+        batch_op.drop_index('ux_emails_tenant_id_provider_message_id')
+        batch_op.create_index('ix_emails_provider_message_id', ['provider_message_id'], unique=False)
+        batch_op.drop_constraint('fk_emails_tenant_id_tenants', type_='foreignkey')
+        batch_op.drop_column('tenant_id')
@@ -0,0 +1,32 @@
+"""Add work queue indexes
+
+Revision ID: 3561984408ba
+Revises: f4359f70e809
+Create Date: 2026-10-18 08:47:32.521578
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3561984408ba'
+down_revision: Union[str, Sequence[str], None] = 'f4359f70e809'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_work_items_tenant_id_state_created_at', 'work_items', ['tenant_id', 'state', 'created_at'], unique=False)
+    op.create_index('ix_work_items_tenant_id_owner_id_state', 'work_items', ['tenant_id', 'owner_id', 'state'], unique=False)
+    op.create_index('ix_work_items_email_id', 'work_items', ['email_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_work_items_email_id', table_name='work_items')
+    op.drop_index('ix_work_items_tenant_id_owner_id_state', table_name='work_items')
+    op.drop_index('ix_work_items_tenant_id_state_created_at', table_name='work_items')
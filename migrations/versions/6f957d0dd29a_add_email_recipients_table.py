@@ -0,0 +1,38 @@
+"""Add email_recipients table
+
+Revision ID: 6f957d0dd29a
+Revises: 22d6c8bd7a37
+Create Date: 2026-10-18 08:52:29.760067
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f957d0dd29a'
+down_revision: Union[str, Sequence[str], None] = '22d6c8bd7a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('email_recipients',
+    sa.Column('email_id', sa.String(), nullable=False),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('kind', sa.Enum('FROM', 'TO', 'CC', name='recipientkind'), nullable=False),
+    sa.Column('tenant_id', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['email_id'], ['emails.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('email_id', 'address', 'kind')
+    )
+    op.create_index('ix_email_recipients_tenant_id_address_email_id', 'email_recipients', ['tenant_id', 'address', 'email_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_recipients_tenant_id_address_email_id', table_name='email_recipients')
+    op.drop_table('email_recipients')
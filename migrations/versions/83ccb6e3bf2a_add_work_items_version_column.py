@@ -0,0 +1,28 @@
+"""Add work_items version column
+
+Revision ID: 83ccb6e3bf2a
+Revises: b4520bca8049
+Create Date: 2026-10-18 08:57:58.222095
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '83ccb6e3bf2a'
+down_revision: Union[str, Sequence[str], None] = 'b4520bca8049'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('work_items', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('work_items', 'version')
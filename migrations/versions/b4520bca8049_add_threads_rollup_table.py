@@ -0,0 +1,45 @@
+"""Add threads rollup table
+
+Revision ID: b4520bca8049
+Revises: 6f957d0dd29a
+Create Date: 2026-10-18 08:53:49.215691
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4520bca8049'
+down_revision: Union[str, Sequence[str], None] = '6f957d0dd29a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The 'direction' enum type already exists on Postgres (created with emails)
+    direction = sa.Enum('INBOUND', 'OUTBOUND', name='direction').with_variant(
+        postgresql.ENUM('INBOUND', 'OUTBOUND', name='direction', create_type=False), 'postgresql'
+    )
+    op.create_table('threads',
+    sa.Column('tenant_id', sa.String(), nullable=False),
+    sa.Column('thread_id', sa.String(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=True),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('last_received_at', sa.DateTime(), nullable=False),
+    sa.Column('latest_direction', direction, nullable=False),
+    sa.Column('participants', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('tenant_id', 'thread_id')
+    )
+    op.create_index('ix_threads_tenant_id_last_received_at', 'threads', ['tenant_id', 'last_received_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_threads_tenant_id_last_received_at', table_name='threads')
+    op.drop_table('threads')
@@ -0,0 +1,35 @@
+"""Add work_items lease columns
+
+Revision ID: c2a75943393b
+Revises: 83ccb6e3bf2a
+Create Date: 2026-10-18 08:58:39.472452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a75943393b'
+down_revision: Union[str, Sequence[str], None] = '83ccb6e3bf2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('work_items', sa.Column('lease_owner', sa.String(), nullable=True))
+    op.add_column('work_items', sa.Column('leased_until', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_work_items_leased_until', 'work_items', ['leased_until'], unique=False,
+        sqlite_where=sa.text('leased_until IS NOT NULL'), postgresql_where=sa.text('leased_until IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_work_items_leased_until', table_name='work_items')
+    op.drop_column('work_items', 'leased_until')
+    op.drop_column('work_items', 'lease_owner')
@@ -0,0 +1,28 @@
+"""Add users created_at keyset index
+
+Revision ID: f4359f70e809
+Revises: 621eb0ffdbd1
+Create Date: 2026-10-18 08:46:34.624352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4359f70e809'
+down_revision: Union[str, Sequence[str], None] = '621eb0ffdbd1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
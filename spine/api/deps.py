@@ -0,0 +1,35 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from spine.db.database import get_db
+from spine.db.repository_cache import repository_cache, tenant_cache
+from spine.db.models import Tenant
+from spine.contracts.auth_dto import CurrentUser
+from spine.repositories.user_repo import UserRepository
+from spine.repositories.tenant_repo import TenantRepository
+from spine.services.current_user_service import CurrentUserService, InvalidTokenError
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def get_current_user_service(db: AsyncSession = Depends(get_db)) -> CurrentUserService:
+    # The session only opens a connection if a cache miss actually queries
+    return CurrentUserService(UserRepository(db, repository_cache), TenantRepository(Tenant, db, tenant_cache))
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    service: CurrentUserService = Depends(get_current_user_service),
+) -> CurrentUser:
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return await service.resolve(credentials.credentials)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -1,26 +1,44 @@
+import math
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from spine.db.database import get_db
-from spine.contracts.auth_dto import Token, LoginRequest
-from spine.services.auth_service import AuthService
+from spine.db.repository_cache import repository_cache
+from spine.contracts.auth_dto import Token, LoginRequest, CurrentUser
+from spine.api.deps import get_current_user
+from spine.services.auth_service import AuthService, LoginThrottledError
 from spine.repositories.user_repo import UserRepository
-from spine.core import config
+from spine.core import config, security
 
 router = APIRouter()
 
 def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
-    return AuthService(UserRepository(db))
+    return AuthService(UserRepository(db, repository_cache))
 
 @router.post("/login", response_model=Token)
 async def login_access_token(
     form_data: LoginRequest, # Using JSON body instead of Form for easier API testing/consistency with modern SPAs
+    request: Request,
     service: AuthService = Depends(get_auth_service)
 ) -> Any:
-    user = await service.authenticate_user(form_data.email, form_data.password)
+    client_ip = request.client.host if request.client else None
+    try:
+        user = await service.authenticate_user(form_data.email, form_data.password, client_ip)
+    except LoginThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+    except security.PasswordHashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login temporarily unavailable, retry shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -34,3 +52,7 @@ async def login_access_token(
         "access_token": access_token,
         "token_type": "bearer",
     }
+
+@router.get("/me", response_model=CurrentUser)
+async def read_current_user(current_user: CurrentUser = Depends(get_current_user)) -> Any:
+    return current_user
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from spine.db.database import get_db
+from spine.db.repository_cache import repository_cache
 from spine.repositories.user_repo import UserRepository
 from spine.services.user_service import UserService
-from spine.contracts.user_dto import UserCreate, UserResponse, UserUpdate
+from spine.contracts.user_dto import UserCreate, UserResponse, UserUpdate, UserPage
 
 router = APIRouter()
 
 def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
-    repo = UserRepository(db)
+    repo = UserRepository(db, repository_cache)
     return UserService(repo)
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -21,6 +23,18 @@ async def create_user(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/", response_model=UserPage)
+async def list_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    service: UserService = Depends(get_user_service)
+):
+    try:
+        page = await service.list_users(cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": page.items, "next_cursor": page.next_cursor}
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
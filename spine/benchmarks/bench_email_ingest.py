@@ -0,0 +1,71 @@
+"""
+Benchmark: per-message ingest_email loop vs set-based ingest_emails.
+
+Run from the repo root:
+    python -m spine.benchmarks.bench_email_ingest [N]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from spine.db.base import Base
+from spine.db.models import Email, Direction
+from spine.repositories.email_repo import EmailRepository
+from spine.services.email_service import EmailService
+from spine.contracts.email_dto import EmailIngest
+
+TENANT_ID = "t_bench"
+
+def make_batch(n: int) -> list[EmailIngest]:
+    now = datetime.utcnow()
+    return [
+        EmailIngest(
+            provider_message_id=f"gmail_{uuid.uuid4()}",
+            thread_id=f"th_{i % 500}",
+            from_email="sender@example.com",
+            to_emails="me@example.com",
+            subject=f"Message {i}",
+            received_at=now,
+            direction=Direction.INBOUND
+        )
+        for i in range(n)
+    ]
+
+async def run(n: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with Session() as session:
+        service = EmailService(EmailRepository(Email, session))
+        batch = make_batch(n)
+        start = time.perf_counter()
+        for msg in batch:
+            await service.ingest_email(TENANT_ID, **msg.model_dump())
+        await session.commit()
+        loop_s = time.perf_counter() - start
+
+    async with Session() as session:
+        service = EmailService(EmailRepository(Email, session))
+        batch = make_batch(n)
+        start = time.perf_counter()
+        await service.ingest_emails(TENANT_ID, batch)
+        await session.commit()
+        bulk_s = time.perf_counter() - start
+
+        # Re-sync of the same history: everything is a duplicate
+        start = time.perf_counter()
+        await service.ingest_emails(TENANT_ID, batch)
+        resync_s = time.perf_counter() - start
+
+    await engine.dispose()
+    print(f"messages:            {n}")
+    print(f"ingest_email loop:   {loop_s:8.3f}s")
+    print(f"ingest_emails batch: {bulk_s:8.3f}s  ({loop_s / bulk_s:.1f}x)")
+    print(f"ingest_emails resync:{resync_s:8.3f}s")
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,60 @@
+"""
+Benchmark: OFFSET (get_all) vs keyset (page_after) latency by page depth.
+
+Run from the repo root:
+    python -m spine.benchmarks.bench_keyset_pagination [ROWS] [PAGE_SIZE]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from spine.db.base import Base
+from spine.db.models import User
+from spine.db.repository import encode_cursor
+from spine.repositories.user_repo import UserRepository
+
+async def timed(coro_factory, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+async def run(rows: int, page_size: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    base = datetime(2024, 1, 1)
+    async with Session() as session:
+        await session.execute(insert(User), [
+            {"id": f"u_{i:08d}", "email": f"user{i}@example.com", "created_at": base + timedelta(seconds=i)}
+            for i in range(rows)
+        ])
+        await session.commit()
+
+    async with Session() as session:
+        repo = UserRepository(session)
+        print(f"rows: {rows}, page size: {page_size}")
+        print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for page in (1, 100, 1000, rows // page_size):
+            skip = (page - 1) * page_size
+            # Cursor for the row just before this page, as a client would hold it (ids sort like created_at here)
+            cursor = None
+            if skip:
+                prev = await repo.get_all(skip=skip - 1, limit=1)
+                cursor = encode_cursor([prev[0].created_at, prev[0].id])
+            offset_ms = await timed(lambda: repo.get_all(skip=skip, limit=page_size))
+            keyset_ms = await timed(lambda: repo.page_after(cursor, limit=page_size))
+            session.expunge_all()
+            print(f"{page:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(int(args[0]) if args else 200_000, int(args[1]) if len(args) > 1 else 20))
@@ -0,0 +1,86 @@
+"""
+Benchmark: /health latency during a login storm, bcrypt on the event loop vs in the bounded pool.
+
+Run from the repo root:
+    python -m spine.benchmarks.bench_login_storm [CONCURRENT_LOGINS] [SECONDS]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Optional, Tuple
+
+# Isolated database; must be set before spine modules build the engine
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+# One client hammering one account: measure hashing, not the attempt limiter
+for _limit in ("LOGIN_RATE_EMAIL_BURST", "LOGIN_RATE_IP_BURST"):
+    os.environ[_limit] = str(10**9)
+
+from httpx import AsyncClient, ASGITransport
+from spine.core import security
+from spine.core.config import settings
+from spine.db.base import Base
+from spine.db.database import engine, AsyncSessionLocal
+from spine.db.models import User
+from spine.main import app
+
+EMAIL = "storm@example.com"
+PASSWORD = "correct horse battery staple"
+
+async def _verify_on_loop(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    # The pre-pool behaviour: bcrypt blocks the event loop
+    return security.verify_and_update_password(plain_password, hashed_password)
+
+async def storm(logins: int, seconds: float) -> list[float]:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as ac:
+        deadline = time.perf_counter() + seconds
+        latencies: list[float] = []
+
+        async def login_loop():
+            while time.perf_counter() < deadline:
+                await ac.post(f"{settings.API_V1_STR}/auth/login", json={"email": EMAIL, "password": PASSWORD})
+
+        async def health_probe():
+            # Latency is measured from when the probe was due, so event-loop stalls count
+            due = time.perf_counter()
+            while due < deadline:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await ac.get("/health")
+                latencies.append((time.perf_counter() - due) * 1000)
+                due += 0.01
+                due = max(due, time.perf_counter())
+
+        await asyncio.gather(health_probe(), *(login_loop() for _ in range(logins)))
+    return latencies
+
+def report(label: str, latencies: list[float]) -> None:
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<22} probes={len(latencies):5d}  p50={p50:8.2f} ms  p99={p99:8.2f} ms")
+
+async def run(logins: int, seconds: float) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        session.add(User(id="u_storm", email=EMAIL, hashed_password=security.get_password_hash(PASSWORD)))
+        await session.commit()
+
+    report("idle", await storm(0, seconds))
+
+    # The function AuthService.authenticate_user awaits
+    pooled = security.verify_and_update_password_async
+    security.verify_and_update_password_async = _verify_on_loop
+    report("bcrypt on event loop", await storm(logins, seconds))
+    security.verify_and_update_password_async = pooled
+
+    report("bounded hashing pool", await storm(logins, seconds))
+    await engine.dispose()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(int(args[0]) if args else 16, float(args[1]) if len(args) > 1 else 5.0))
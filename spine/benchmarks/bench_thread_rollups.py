@@ -0,0 +1,82 @@
+"""
+Benchmark: inbox built by grouping raw emails vs reading the materialized threads table.
+
+Run from the repo root:
+    python -m spine.benchmarks.bench_thread_rollups [EMAILS] [THREADS]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, func, literal
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from spine.db.base import Base
+from spine.db.models import Email, EmailThread, Direction
+from spine.repositories.thread_repo import ThreadRepository
+
+TENANT_ID = "t_bench"
+
+async def timed(coro_factory, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+async def run(emails: int, threads: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    base = datetime(2024, 1, 1)
+    async with Session() as session:
+        for start in range(0, emails, 50_000):
+            await session.execute(insert(Email), [
+                {
+                    "id": f"msg_{i:09d}",
+                    "tenant_id": TENANT_ID,
+                    "provider_message_id": f"p_{i}",
+                    "thread_id": f"th_{i % threads}",
+                    "from_email": "sender@example.com",
+                    "received_at": base + timedelta(seconds=i),
+                    "direction": Direction.INBOUND,
+                }
+                for i in range(start, min(start + 50_000, emails))
+            ])
+        # Set-based backfill of the rollups (ingestion maintains them incrementally)
+        await session.execute(insert(EmailThread).from_select(
+            ["tenant_id", "thread_id", "message_count", "last_received_at", "latest_direction", "participants"],
+            select(Email.tenant_id, Email.thread_id, func.count(), func.max(Email.received_at), func.min(Email.direction), literal("[]"))
+            .group_by(Email.tenant_id, Email.thread_id)
+        ))
+        await session.commit()
+
+    async with Session() as session:
+        repo = ThreadRepository(session)
+
+        async def grouped_inbox():
+            await session.execute(
+                select(Email.thread_id, func.count(), func.max(Email.received_at).label("last"))
+                .where(Email.tenant_id == TENANT_ID)
+                .group_by(Email.thread_id)
+                .order_by(func.max(Email.received_at).desc())
+                .limit(50)
+            )
+
+        async def materialized_inbox():
+            await repo.get_inbox(TENANT_ID, limit=50)
+            session.expunge_all()
+
+        grouped_ms = await timed(grouped_inbox, repeat=3)
+        materialized_ms = await timed(materialized_inbox)
+
+    await engine.dispose()
+    print(f"emails: {emails}, threads: {threads}")
+    print(f"GROUP BY emails:   {grouped_ms:10.2f} ms")
+    print(f"threads table:     {materialized_ms:10.2f} ms")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(int(args[0]) if args else 1_000_000, int(args[1]) if len(args) > 1 else 50_000))
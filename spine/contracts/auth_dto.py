@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Dict, Optional
+from pydantic import BaseModel, ConfigDict
+from spine.db.models import Role
 
 class Token(BaseModel):
     access_token: str
@@ -10,3 +12,12 @@ class TokenData(BaseModel):
 class LoginRequest(BaseModel):
     email: str
     password: str # For Phase 1 we might just use Email-Only login via Magic Link, but for now Standard PW or Mock
+
+class CurrentUser(BaseModel):
+    """Request principal: a detached snapshot of the user and their tenant roles, safe to cache across requests."""
+    id: str
+    email: str
+    name: Optional[str] = None
+    memberships: Dict[str, Role] = {} # tenant_id -> role
+
+    model_config = ConfigDict(frozen=True)
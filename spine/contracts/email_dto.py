@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from spine.db.models import Direction
+
+class EmailIngest(BaseModel):
+    provider_message_id: str
+    thread_id: str
+    from_email: str
+    to_emails: Optional[str] = None
+    cc_emails: Optional[str] = None
+    subject: Optional[str] = None
+    received_at: datetime
+    direction: Direction
+
+class EmailIngestResult(BaseModel):
+    id: str
+    provider_message_id: str
+    created: bool # False when the message was already stored (or repeated in the batch)
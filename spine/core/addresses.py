@@ -0,0 +1,22 @@
+import json
+from email.utils import getaddresses
+from typing import List, Optional
+
+def normalize_address(address: str) -> str:
+    return address.strip().lower()
+
+def parse_addresses(raw: Optional[str]) -> List[str]:
+    """
+    Parses a stored address field ("Comma sep or JSON") into normalized bare addresses.
+    Accepts "a@x.com, Name <b@y.com>" or a JSON list of such entries. Order kept, duplicates dropped.
+    """
+    if not raw:
+        return []
+    entries: List[str] = [raw]
+    if raw.lstrip().startswith("["):
+        try:
+            entries = [str(e) for e in json.loads(raw)]
+        except ValueError:
+            pass
+    addresses = [normalize_address(addr) for _name, addr in getaddresses(entries) if addr.strip()]
+    return list(dict.fromkeys(addresses))
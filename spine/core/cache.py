@@ -0,0 +1,192 @@
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Protocol, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU with per-entry expiry. Bounded by maxsize; the least recently used entry is evicted first.
+    Not thread-safe: meant for use from the event loop.
+    """
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """ttl overrides the default, e.g. to never outlive a token's own expiry."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class CacheBackend(Protocol):
+    """Shared string cache (Redis in production, InMemoryCacheBackend in tests and single-process dev)."""
+    async def get(self, key: str) -> Optional[str]: ...
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+    async def add(self, key: str, value: str, ttl: int) -> bool: ... # set only if absent (SET NX); True if set
+    async def delete(self, *keys: str) -> None: ...
+
+class InMemoryCacheBackend:
+    """In-process fake with Redis semantics (per-key expiry), so tests and local runs need no Redis."""
+    def __init__(self, maxsize: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self._cache: TTLCache[str, str] = TTLCache(maxsize, ttl=float("inf"), clock=clock)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        if self._cache.get(key) is not None:
+            return False
+        self._cache.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+class RedisCacheBackend:
+    """`client` is a redis.asyncio.Redis (or compatible), e.g. pointed at the ElastiCache replication group."""
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        return bool(await self.client.set(key, value, ex=ttl, nx=True))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+class CacheMetrics:
+    """Counters per (namespace, outcome): hit, negative_hit, miss, error."""
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def record(self, namespace: str, outcome: str) -> None:
+        self.counts[(namespace, outcome)] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        result: Dict[str, Dict[str, int]] = {}
+        for (namespace, outcome), count in self.counts.items():
+            result.setdefault(namespace, {})[outcome] = count
+        return result
+
+    def hit_ratio(self, namespace: str) -> float:
+        hits = self.counts[(namespace, "hit")] + self.counts[(namespace, "negative_hit")]
+        total = hits + self.counts[(namespace, "miss")]
+        return hits / total if total else 0.0
+
+class TieredCacheBackend:
+    """
+    Per-process LRU/TTL tier in front of a shared backend. The local TTL bounds how long another
+    process's invalidation can go unseen here, so keep it short.
+    """
+    def __init__(self, shared: CacheBackend, local_maxsize: int, local_ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.shared = shared
+        self.local: TTLCache[str, str] = TTLCache(local_maxsize, local_ttl, clock=clock)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is None:
+            value = await self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self.local.set(key, value, ttl=ttl)
+        await self.shared.set(key, value, ttl)
+
+    async def add(self, key: str, value: str, ttl: int) -> bool:
+        # The shared tier decides: a tombstone there refuses the fill for every process
+        if not await self.shared.add(key, value, ttl):
+            return False
+        self.local.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.local.pop(key)
+        await self.shared.delete(*keys)
+
+_RETRY = object() # published when the leader is cancelled, so its followers elect a new one
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution (per process).
+    do() returns (result, shared); shared is True for callers that joined another caller's flight.
+    """
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> Tuple[V, bool]:
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            result = await asyncio.shield(flight)
+            if result is not _RETRY:
+                return result, True
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.set_result(_RETRY)
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception() # mark retrieved so a flight nobody joined doesn't log a warning
+            raise
+        else:
+            flight.set_result(result)
+            return result, False
+        finally:
+            del self._flights[key]
@@ -0,0 +1,74 @@
+"""
+Picks the password hashing cost that fits a target login latency on this machine.
+
+Run from the repo root, on hardware representative of production:
+    python -m spine.core.hash_calibration --target-ms 250 [--scheme bcrypt|argon2]
+
+Prints the Settings overrides to apply (as environment variables).
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List, Tuple
+from passlib.context import CryptContext
+from spine.core.config import settings
+
+BCRYPT_ROUNDS = range(10, 18) # each step doubles the cost
+ARGON2_TIME_COSTS = range(1, 11)
+
+def time_verify(context: CryptContext, samples: int) -> float:
+    """Median milliseconds for one verify, which is what a login pays."""
+    hashed = context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def candidates(scheme: str) -> List[Tuple[Dict[str, int], CryptContext]]:
+    if scheme == "bcrypt":
+        return [
+            ({"PASSWORD_BCRYPT_ROUNDS": rounds}, CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds))
+            for rounds in BCRYPT_ROUNDS
+        ]
+    # Memory cost stays as configured (it bounds RAM per concurrent login); time cost scales latency
+    return [
+        (
+            {"PASSWORD_ARGON2_TIME_COST": time_cost},
+            CryptContext(
+                schemes=["argon2"],
+                argon2__rounds=time_cost,
+                argon2__memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+                argon2__parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+            ),
+        )
+        for time_cost in ARGON2_TIME_COSTS
+    ]
+
+def calibrate(scheme: str, target_ms: float, samples: int = 5) -> Dict[str, int]:
+    """Highest cost whose median verify stays within target_ms (the cheapest cost if none does)."""
+    chosen = None
+    for overrides, context in candidates(scheme):
+        elapsed = time_verify(context, samples)
+        print(f"{overrides}  {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            chosen = chosen or overrides # even the cheapest cost is over target
+            break
+        chosen = overrides
+    return {"PASSWORD_HASH_SCHEME": scheme, **chosen}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    chosen = calibrate(args.scheme, args.target_ms, args.samples)
+    print()
+    for key, value in chosen.items():
+        print(f"{key}={value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Protocol, Tuple
+
+class RateLimiter(Protocol):
+    async def acquire(self, key: str) -> float:
+        """Takes one token for key. Returns 0.0 if allowed, else seconds until a token is available."""
+        ...
+
+class TokenBucketLimiter:
+    """
+    In-process token bucket per key: `capacity` burst, refilled at `refill_per_second`.
+    Buckets are held in a bounded LRU; an evicted key simply starts again with a full bucket.
+    """
+    def __init__(
+        self,
+        capacity: int,
+        refill_per_second: float,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict() # key -> (tokens, updated_at)
+
+    async def acquire(self, key: str) -> float:
+        now = self._clock()
+        tokens, updated_at = self._buckets.get(key, (float(self.capacity), now))
+        tokens = min(float(self.capacity), tokens + (now - updated_at) * self.refill_per_second)
+
+        wait = 0.0
+        if tokens >= 1.0:
+            tokens -= 1.0
+        else:
+            wait = (1.0 - tokens) / self.refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+# Same algorithm as TokenBucketLimiter, evaluated atomically server-side so every app instance shares the bucket.
+# Returned as a string: Redis truncates Lua numbers to integers.
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return tostring(wait)
+"""
+
+class RedisTokenBucketLimiter:
+    """Shared token bucket for multi-instance deployments. `client` is a redis.asyncio.Redis (or compatible)."""
+    def __init__(self, client: Any, capacity: int, refill_per_second: float, prefix: str = "ratelimit"):
+        self.client = client
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.prefix = prefix
+
+    async def acquire(self, key: str) -> float:
+        wait = await self.client.eval(
+            _REDIS_TOKEN_BUCKET, 1, f"{self.prefix}:{key}", self.capacity, self.refill_per_second
+        )
+        return float(wait)
+
+def build_limiter(
+    capacity: int, refill_per_second: float, redis_url: Optional[str] = None, prefix: str = "ratelimit"
+) -> RateLimiter:
+    if not redis_url:
+        return TokenBucketLimiter(capacity, refill_per_second)
+    import redis.asyncio as redis # optional dependency, only needed when a shared limiter is configured
+    return RedisTokenBucketLimiter(redis.from_url(redis_url), capacity, refill_per_second, prefix)
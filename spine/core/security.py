@@ -1,11 +1,36 @@
+import asyncio
+import functools
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
 from jose import jwt
 from passlib.context import CryptContext
-from spine.core.config import settings
+from spine.core.config import Settings, settings
+
+HASH_SCHEMES = ("bcrypt", "argon2")
+
+def build_crypt_context(config: Settings) -> CryptContext:
+    """
+    The configured scheme hashes; every known scheme still verifies. Costs are also the minimums,
+    so needs_update() flags hashes from the other scheme or from a cheaper profile.
+    """
+    if config.PASSWORD_HASH_SCHEME not in HASH_SCHEMES:
+        raise ValueError(f"Unknown PASSWORD_HASH_SCHEME {config.PASSWORD_HASH_SCHEME!r}")
+    return CryptContext(
+        schemes=[config.PASSWORD_HASH_SCHEME] + [s for s in HASH_SCHEMES if s != config.PASSWORD_HASH_SCHEME],
+        deprecated="auto",
+        bcrypt__rounds=config.PASSWORD_BCRYPT_ROUNDS,
+        bcrypt__min_rounds=config.PASSWORD_BCRYPT_ROUNDS,
+        argon2__rounds=config.PASSWORD_ARGON2_TIME_COST,
+        argon2__min_rounds=config.PASSWORD_ARGON2_TIME_COST,
+        argon2__memory_cost=config.PASSWORD_ARGON2_MEMORY_COST,
+        argon2__parallelism=config.PASSWORD_ARGON2_PARALLELISM,
+    )
 
 # Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_crypt_context(settings)
 
 ALGORITHM = "HS256"
 
@@ -19,8 +44,68 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def decode_access_token(token: str) -> dict:
+    """Verifies signature and exp. Raises jose.JWTError on any invalid token."""
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Returns (verified, new_hash); new_hash is set only when verified and the stored hash is below the current profile."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+@functools.lru_cache(maxsize=1)
+def dummy_password_hash() -> str:
+    """A real hash of a random secret, verified when there is no user so a miss costs the same as a hit."""
+    return get_password_hash(secrets.token_urlsafe(32))
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+# Async wrappers: bcrypt costs ~100-300 ms of CPU, which must never run on the event loop.
+# bcrypt releases the GIL, so a small thread pool hashes in parallel.
+
+T = TypeVar("T")
+
+class PasswordHashingBusyError(RuntimeError):
+    """The hashing pool is saturated; callers should answer 503 rather than queue unboundedly."""
+    pass
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_pending: int, thread_name_prefix: str):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.max_pending = max_pending
+        self.pending = 0 # running + queued
+        self._lock = threading.Lock() # pending is released from worker threads
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise PasswordHashingBusyError(f"{self.pending} password hashing tasks pending")
+            self.pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # Released when the work is done, not when the caller stops waiting: a cancelled request
+        # leaves its hash running, and it keeps counting against max_pending until it finishes
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self.pending -= 1
+
+hashing_pool = BoundedExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    thread_name_prefix="password-hash",
+)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await hashing_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
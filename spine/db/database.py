@@ -1,13 +1,64 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from spine.core.config import settings
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.pool import QueuePool
+from spine.core.config import Settings, settings
 
-# For now, ease of use: If Config has DB url use it, else default to local sqlite
-# In prod this comes from env vars
-DATABASE_URL = "sqlite+aiosqlite:///./spine.db"
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+def build_engine(config: Settings) -> AsyncEngine:
+    """
+    Builds the async engine from Settings.
+    Pool sizing applies to server databases and file-backed SQLite; in-memory SQLite keeps the dialect's static pool.
+    """
+    url = make_url(config.DATABASE_URL)
+    backend = url.get_backend_name()
+    kwargs: Dict[str, Any] = {"echo": config.DB_ECHO}
+
+    if not _is_memory_sqlite(url):
+        kwargs.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+        )
+
+    if backend == "postgresql":
+        # asyncpg: per-connection setup is done through server_settings at connect time
+        url = url.update_query_dict({"prepared_statement_cache_size": str(config.DB_STATEMENT_CACHE_SIZE)})
+        kwargs["connect_args"] = {"server_settings": {"application_name": config.DB_APPLICATION_NAME}}
+
+    async_engine = create_async_engine(url, **kwargs)
+
+    if backend == "sqlite" and not _is_memory_sqlite(url):
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _configure_sqlite_connection(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+            cursor.close()
+
+    return async_engine
+
+engine = build_engine(settings)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+def pool_status(async_engine: AsyncEngine = engine) -> Dict[str, Any]:
+    """Snapshot of connection pool usage, used by the /health/db probe to size pools under load."""
+    pool = async_engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, DateTime, ForeignKey, Boolean, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Boolean, Integer, JSON, Index, Enum as SAEnum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from spine.db.base import Base
@@ -26,6 +26,11 @@ class Direction(str, enum.Enum):
     INBOUND = "INBOUND"
     OUTBOUND = "OUTBOUND"
 
+class RecipientKind(str, enum.Enum):
+    FROM = "FROM"
+    TO = "TO"
+    CC = "CC"
+
 class WorkItemState(str, enum.Enum):
     NEEDS_REPLY = "NEEDS_REPLY"
     WAITING = "WAITING"
@@ -41,13 +46,20 @@ class ConfidenceBand(str, enum.Enum):
 # PHASE 1.1 — CORE IDENTITY & TENANCY
 class User(Base):
     __tablename__ = "users"
-    
+    # Never written to the shared repository cache; credential checks read the DB (UserRepository.get_for_login)
+    __cache_exclude__ = ("hashed_password",)
+
     id: Mapped[str] = mapped_column(String, primary_key=True)
     email: Mapped[str] = mapped_column(String, unique=True, index=True)
     name: Mapped[Optional[str]] = mapped_column(String)
     hashed_password: Mapped[Optional[str]] = mapped_column(String)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Keyset pagination for the user list
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
 class Tenant(Base):
     __tablename__ = "tenants"
     
@@ -80,7 +92,9 @@ class Email(Base):
     __tablename__ = "emails"
     
     id: Mapped[str] = mapped_column(String, primary_key=True)
-    provider_message_id: Mapped[str] = mapped_column(String, index=True)
+    # NULL only for rows ingested before emails were tenant-scoped
+    tenant_id: Mapped[Optional[str]] = mapped_column(ForeignKey("tenants.id"), nullable=True)
+    provider_message_id: Mapped[str] = mapped_column(String)
     thread_id: Mapped[str] = mapped_column(String, index=True)
     from_email: Mapped[str] = mapped_column(String)
     # Using JSON for arrays in SQLite/Generic compatibility, or specific PG Arrays
@@ -91,6 +105,42 @@ class Email(Base):
     received_at: Mapped[datetime] = mapped_column(DateTime)
     direction: Mapped[Direction] = mapped_column(SAEnum(Direction))
 
+    __table_args__ = (
+        # Ingestion idempotency: the conflict target for EmailRepository.upsert
+        Index("ux_emails_tenant_id_provider_message_id", "tenant_id", "provider_message_id", unique=True),
+    )
+
+class EmailThread(Base):
+    """Per-thread rollup maintained at ingest time, so the inbox reads one row per thread."""
+    __tablename__ = "threads"
+
+    tenant_id: Mapped[str] = mapped_column(ForeignKey("tenants.id"), primary_key=True)
+    thread_id: Mapped[str] = mapped_column(String, primary_key=True) # Provider thread id (Email.thread_id)
+    subject: Mapped[Optional[str]] = mapped_column(String) # Of the latest message
+    message_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_received_at: Mapped[datetime] = mapped_column(DateTime)
+    latest_direction: Mapped[Direction] = mapped_column(SAEnum(Direction))
+    participants: Mapped[List[str]] = mapped_column(JSON, default=list) # Normalized addresses, sorted
+
+    __table_args__ = (
+        # Inbox ordering
+        Index("ix_threads_tenant_id_last_received_at", "tenant_id", "last_received_at"),
+    )
+
+class EmailRecipient(Base):
+    """One row per (email, address, kind), so participant lookups hit an index instead of LIKE scans."""
+    __tablename__ = "email_recipients"
+
+    email_id: Mapped[str] = mapped_column(ForeignKey("emails.id"), primary_key=True)
+    address: Mapped[str] = mapped_column(String, primary_key=True) # Normalized: lowercased bare address
+    kind: Mapped[RecipientKind] = mapped_column(SAEnum(RecipientKind), primary_key=True)
+    tenant_id: Mapped[Optional[str]] = mapped_column(ForeignKey("tenants.id"), nullable=True) # Denormalized from emails
+
+    __table_args__ = (
+        # Covering index for EmailRepository.find_by_participant
+        Index("ix_email_recipients_tenant_id_address_email_id", "tenant_id", "address", "email_id"),
+    )
+
 class WorkItem(Base):
     __tablename__ = "work_items"
     
@@ -104,3 +154,20 @@ class WorkItem(Base):
     resolution_lock: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Optimistic concurrency: bumped by every transition, compared in the UPDATE's WHERE clause
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    # Work queue lease (see WorkItemRepository.claim); independent of the owner_* assignment
+    lease_owner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    leased_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Work queue hot paths (see WorkItemRepository)
+        Index("ix_work_items_tenant_id_state_created_at", "tenant_id", "state", "created_at"),
+        Index("ix_work_items_tenant_id_owner_id_state", "tenant_id", "owner_id", "state"),
+        Index("ix_work_items_email_id", "email_id", unique=True), # One work item per email
+        # Lease sweep; partial, since most items hold no lease
+        Index(
+            "ix_work_items_leased_until", "leased_until",
+            sqlite_where=text("leased_until IS NOT NULL"), postgresql_where=text("leased_until IS NOT NULL"),
+        ),
+    )
@@ -0,0 +1,31 @@
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from spine.core.cache import TTLCache
+from spine.core.config import settings
+
+# user_id -> CurrentUser snapshot (user row + memberships), filled by CurrentUserService.resolve.
+# Kept beside the repositories so the writes that change a principal can drop it without importing services.
+principal_cache: TTLCache[str, Any] = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_user(user_id: str) -> None:
+    """Call after any change to a user or their memberships so the next request reloads it."""
+    principal_cache.pop(user_id)
+
+def invalidate_user_on_commit(session: AsyncSession, user_id: str) -> None:
+    """For writes the caller commits: drops the principal once the session commits, not before."""
+    pending = session.info.get(invalidate_user_on_commit)
+    if pending is None:
+        pending = session.info[invalidate_user_on_commit] = set()
+        event.listen(session.sync_session, "after_commit", _after_commit)
+        event.listen(session.sync_session, "after_rollback", _after_rollback)
+    pending.add(user_id)
+
+def _after_commit(sync_session) -> None:
+    pending = sync_session.info[invalidate_user_on_commit]
+    for user_id in pending:
+        invalidate_user(user_id)
+    pending.clear()
+
+def _after_rollback(sync_session) -> None:
+    sync_session.info[invalidate_user_on_commit].clear()
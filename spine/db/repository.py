@@ -1,38 +1,148 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any
-from sqlalchemy import select, update, delete
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar, Type, Optional, List, Any, Sequence
+from sqlalchemy import select, update, delete, tuple_, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from spine.db.base import Base
+from spine.db.repository_cache import RepositoryCache
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+@dataclass
+class Page(Generic[ModelType]):
+    items: List[ModelType]
+    next_cursor: Optional[str] # None on the last page
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+def _cursor_value(column, value: Any) -> Any:
+    """A decoded cursor value as the column's type; anything encode_cursor could not have produced is rejected."""
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError as e:
+            raise ValueError("Invalid cursor") from e
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        return value
+    if expected is float and isinstance(value, int):
+        expected = int # JSON drops the fraction of whole floats
+    if isinstance(value, bool) is not (expected is bool) or not isinstance(value, expected):
+        raise ValueError("Invalid cursor")
+    return value
+
+def upsert_insert(session: AsyncSession, model: Type[Base]):
+    """INSERT construct supporting ON CONFLICT for the session's dialect (Postgres / SQLite)."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"ON CONFLICT is not supported for dialect {dialect}")
+
 class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType], session: AsyncSession):
+    # Keyset for page_after. Must be unique (end with the PK) and backed by an index.
+    # Defaults to (created_at, id) when the model has created_at, else (id,).
+    page_order_by: Optional[Sequence[str]] = None
+
+    def __init__(self, model: Type[ModelType], session: AsyncSession, cache: Optional[RepositoryCache] = None):
         self.model = model
         self.session = session
+        # Read-through cache for get/get_by_id; None (the default) always reads the DB
+        self.cache = cache
 
     async def create(self, **kwargs) -> ModelType:
         # Assuming ID is passed in kwargs or auto-generated by DB (if omitted)
         # For our UUID strings, we usually pass them.
         instance = self.model(**kwargs)
         self.session.add(instance)
+        if self.cache and "id" in kwargs:
+            # Drop a cached "not found"; the caller commits, so invalidate again once it does
+            await self.cache.invalidate_on_commit(self.session, self.model, "id", kwargs["id"])
         return instance
 
+    def _upsert_insert(self, model: Optional[Type[Base]] = None):
+        return upsert_insert(self.session, model or self.model)
+
     async def get_by_id(self, id: str) -> ModelType | None:
-        result = await self.session.execute(select(self.model).where(self.model.id == id))
-        return result.scalar_one_or_none()
+        return await self.get(id)
 
     async def get(self, id: Any) -> Optional[ModelType]:
+        if self.cache:
+            return await self.cache.get_row(self.session, self.model, id, lambda: self._get_from_db(id))
+        return await self._get_from_db(id)
+
+    async def _get_from_db(self, id: Any) -> Optional[ModelType]:
         result = await self.session.execute(
             select(self.model).where(self.model.id == id)
         )
         return result.scalar_one_or_none()
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        # OFFSET scans grow with skip; prefer page_after for anything user-facing
         result = await self.session.execute(
-            select(self.model).offset(skip).limit(limit)
+            select(self.model).order_by(self.model.id).offset(skip).limit(limit)
         )
         return list(result.scalars().all())
 
+    def _default_order_by(self) -> Sequence[str]:
+        if self.page_order_by:
+            return self.page_order_by
+        if hasattr(self.model, "created_at"):
+            return ("created_at", "id")
+        return ("id",)
+
+    async def page_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: Optional[Sequence[str]] = None,
+    ) -> Page[ModelType]:
+        """
+        Keyset pagination: WHERE (k1, k2) > (:k1, :k2) ORDER BY k1, k2 LIMIT n.
+        Cost is independent of page depth, unlike OFFSET. The cursor is opaque to callers
+        and only valid for the same order_by it was issued with.
+        """
+        keys = list(order_by or self._default_order_by())
+        columns = [getattr(self.model, k) for k in keys]
+
+        stmt = select(self.model).order_by(*columns).limit(limit + 1)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(columns):
+                raise ValueError("Invalid cursor")
+            values = [_cursor_value(col, v) for col, v in zip(columns, values)]
+            stmt = stmt.where(tuple_(*columns) > tuple_(*values))
+
+        result = await self.session.execute(stmt)
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], k) for k in keys])
+        return Page(items=items, next_cursor=next_cursor)
+
     async def update(self, id: Any, **kwargs) -> Optional[ModelType]:
         # updates the record and returns it
         stmt = (
@@ -43,10 +153,14 @@ class BaseRepository(Generic[ModelType]):
         )
         await self.session.execute(stmt)
         await self.session.commit()
+        if self.cache:
+            await self.cache.invalidate(self.model, "id", id)
         return await self.get(id)
 
     async def delete(self, id: Any) -> bool:
         stmt = delete(self.model).where(self.model.id == id)
         result = await self.session.execute(stmt)
         await self.session.commit()
+        if self.cache:
+            await self.cache.invalidate(self.model, "id", id)
         return result.rowcount > 0
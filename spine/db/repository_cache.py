@@ -0,0 +1,298 @@
+import asyncio
+import enum
+import json
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type
+from sqlalchemy import DateTime, Enum as SAEnum, event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from spine.core.cache import (
+    CacheBackend, CacheMetrics, InMemoryCacheBackend, RedisCacheBackend, SingleFlight, TieredCacheBackend
+)
+from spine.core.config import Settings, settings
+from spine.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Optional[Base]]]
+ListLoader = Callable[[], Awaitable[List[Base]]]
+
+_TOMBSTONE = "!invalidated" # written by invalidate(); reads treat it as a miss and fills may not replace it
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot cache {type(value).__name__}")
+
+class RepositoryCache:
+    """
+    Read-through cache for repository lookups by primary key and by unique column.
+
+    Keys are `{prefix}:{key_version}:{table}:...`; bump CACHE_KEY_VERSION when a cached model's columns change
+    so old entries are simply never read again. Rows are cached as JSON column values and re-attached to the
+    caller's session without a query. Misses are cached too (negative_ttl) so lookups of absent ids/emails
+    don't reach the DB every time. Unique-column entries only point at the id and are re-checked on read,
+    so an update only has to invalidate the row itself.
+
+    Misses are single-flighted per key: concurrent callers wait for one DB load and materialize its
+    result into their own sessions.
+
+    Invalidation writes a tombstone for tombstone_ttl instead of deleting, and fills only set absent keys
+    (SET NX). A load that read the row before a write commits therefore cannot put the old row back after
+    the write's invalidation; fills resume once the tombstone expires.
+
+    Columns listed in a model's `__cache_exclude__` (e.g. User.hashed_password) are never written to the
+    cache; they are left unloaded on rows materialized from it, so code that needs them must read the DB.
+
+    Backend errors are logged and counted, and the lookup falls through to the DB.
+    """
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: int,
+        negative_ttl: int,
+        key_version: str = "1",
+        prefix: str = "spine",
+        metrics: Optional[CacheMetrics] = None,
+        tombstone_ttl: int = 5,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.tombstone_ttl = tombstone_ttl
+        self.key_version = key_version
+        self.prefix = prefix
+        self.metrics = metrics or CacheMetrics()
+        self._flights = SingleFlight()
+        self._background: Set["asyncio.Task[None]"] = set()
+
+    def key(self, model: Type[Base], field: str, value: Any) -> str:
+        return f"{self.prefix}:{self.key_version}:{model.__tablename__}:{field}:{value}"
+
+    def _values(self, instance: Base) -> Dict[str, Any]:
+        model = type(instance)
+        excluded = getattr(model, "__cache_exclude__", ())
+        return {attr.key: getattr(instance, attr.key) for attr in inspect(model).column_attrs if attr.key not in excluded}
+
+    def dump(self, instance: Base) -> str:
+        return json.dumps(self._values(instance), default=_encode)
+
+    def dump_list(self, instances: List[Base]) -> str:
+        return json.dumps([self._values(instance) for instance in instances], default=_encode)
+
+    async def load(self, session: AsyncSession, model: Type[Base], raw: str) -> Base:
+        return await self._attach(session, model, json.loads(raw))
+
+    async def load_list(self, session: AsyncSession, model: Type[Base], raw: str) -> List[Base]:
+        return [await self._attach(session, model, values) for values in json.loads(raw)]
+
+    async def _attach(self, session: AsyncSession, model: Type[Base], values: Dict[str, Any]) -> Base:
+        for attr in inspect(model).column_attrs:
+            column_type = attr.columns[0].type
+            if attr.key not in values:
+                continue
+            value = values[attr.key]
+            if value is None:
+                continue
+            if isinstance(column_type, DateTime):
+                values[attr.key] = datetime.fromisoformat(value)
+            elif isinstance(column_type, SAEnum) and column_type.enum_class:
+                values[attr.key] = column_type.enum_class(value)
+        instance = model(**values)
+        make_transient_to_detached(instance)
+        # Returns the session's own copy if the row is already in its identity map
+        return await session.merge(instance, load=False)
+
+    async def _get(self, key: str, namespace: str) -> Optional[str]:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            logger.warning("cache get failed for %s", key, exc_info=True)
+            self.metrics.record(namespace, "error")
+            return None
+        return None if raw == _TOMBSTONE else raw
+
+    async def _fill(self, key: str, value: str, ttl: int, namespace: str) -> None:
+        try:
+            await self.backend.add(key, value, ttl)
+        except Exception:
+            logger.warning("cache set failed for %s", key, exc_info=True)
+            self.metrics.record(namespace, "error")
+
+    async def _read_through(self, key: str, namespace: str, ttl: int, negative_ttl: int, fetch: Callable[[], Awaitable[Tuple[Any, str]]]):
+        """
+        Runs fetch() at most once per key across concurrent callers. fetch returns (value, raw) where raw is
+        what gets cached. Returns (value, raw, from_raw): when from_raw is set, value belongs to another
+        caller (or was never loaded) and the caller must materialize raw into its own session.
+        """
+        async def flight() -> Tuple[Any, str]:
+            # Re-check: a flight that finished just before this one started has already filled the cache
+            raw = await self._get(key, namespace)
+            if raw is not None:
+                return None, raw
+            value, raw = await fetch()
+            await self._fill(key, raw, negative_ttl if raw == "null" else ttl, namespace)
+            return value, raw
+
+        self.metrics.record(namespace, "miss")
+        (value, raw), shared = await self._flights.do(key, flight)
+        if shared:
+            self.metrics.record(namespace, "coalesced")
+        return value, raw, shared or value is None
+
+    async def get_row(self, session: AsyncSession, model: Type[Base], id: Any, loader: Loader) -> Optional[Base]:
+        namespace = model.__tablename__
+        key = self.key(model, "id", id)
+        raw = await self._get(key, namespace)
+        if raw is not None:
+            if raw == "null":
+                self.metrics.record(namespace, "negative_hit")
+                return None
+            self.metrics.record(namespace, "hit")
+            return await self.load(session, model, raw)
+
+        async def fetch():
+            instance = await loader()
+            return instance, "null" if instance is None else self.dump(instance)
+
+        instance, raw, from_raw = await self._read_through(key, namespace, self.ttl, self.negative_ttl, fetch)
+        if from_raw:
+            return None if raw == "null" else await self.load(session, model, raw)
+        return instance
+
+    async def get_by_unique(
+        self, session: AsyncSession, model: Type[Base], field: str, value: Any, loader: Loader
+    ) -> Optional[Base]:
+        namespace = f"{model.__tablename__}.{field}"
+        key = self.key(model, field, value)
+        raw = await self._get(key, namespace)
+        if raw is not None:
+            target_id = json.loads(raw)
+            if target_id is None:
+                self.metrics.record(namespace, "negative_hit")
+                return None
+            row = await self._get(self.key(model, "id", target_id), namespace)
+            if row is not None and row != "null":
+                instance = await self.load(session, model, row)
+                # The row may have moved to another value since the pointer was written
+                if getattr(instance, field) == value:
+                    self.metrics.record(namespace, "hit")
+                    return instance
+            await self.invalidate(model, field, value)
+
+        async def fetch():
+            instance = await loader()
+            if instance is None:
+                return None, "null"
+            await self._fill(self.key(model, "id", instance.id), self.dump(instance), self.ttl, model.__tablename__)
+            return instance, json.dumps(instance.id)
+
+        instance, raw, from_raw = await self._read_through(key, namespace, self.ttl, self.negative_ttl, fetch)
+        if from_raw:
+            target_id = json.loads(raw)
+            if target_id is None:
+                return None
+            # The flight cached the row under its id as well
+            row = await self._get(self.key(model, "id", target_id), namespace)
+            return await self.load(session, model, row) if row is not None and row != "null" else await loader()
+        return instance
+
+    async def get_list(
+        self, session: AsyncSession, model: Type[Base], field: str, value: Any, loader: ListLoader
+    ) -> List[Base]:
+        """All rows of `model` with field == value (e.g. a user's memberships), cached as one entry."""
+        namespace = f"{model.__tablename__}.{field}"
+        key = self.key(model, field, value)
+        raw = await self._get(key, namespace)
+        if raw is not None:
+            self.metrics.record(namespace, "hit")
+            return await self.load_list(session, model, raw)
+
+        async def fetch():
+            instances = await loader()
+            return instances, self.dump_list(instances)
+
+        instances, raw, from_raw = await self._read_through(key, namespace, self.ttl, self.ttl, fetch)
+        if from_raw:
+            return await self.load_list(session, model, raw)
+        return instances
+
+    async def invalidate(self, model: Type[Base], field: str, *values: Any) -> None:
+        """Call after the write commits (see invalidate_on_commit for writes the caller commits)."""
+        await self._tombstone([self.key(model, field, value) for value in values], model.__tablename__)
+
+    async def _tombstone(self, keys: List[str], namespace: str) -> None:
+        try:
+            for key in keys:
+                await self.backend.set(key, _TOMBSTONE, self.tombstone_ttl)
+        except Exception:
+            logger.warning("cache invalidation failed for %s", namespace, exc_info=True)
+            self.metrics.record(namespace, "error")
+
+    async def invalidate_on_commit(self, session: AsyncSession, model: Type[Base], field: str, *values: Any) -> None:
+        """
+        For writes the caller commits (e.g. create). Tombstones now, so no fill can race the open
+        transaction (a concurrent miss would otherwise re-cache "not found"), and again once the session
+        commits, in case the transaction outlived the first tombstone.
+        """
+        keys = [self.key(model, field, value) for value in values]
+        await self._tombstone(keys, model.__tablename__)
+        pending = session.info.get(self)
+        if pending is None:
+            pending = session.info[self] = []
+            event.listen(session.sync_session, "after_commit", self._after_commit)
+            event.listen(session.sync_session, "after_rollback", lambda sync_session: sync_session.info[self].clear())
+        pending.extend((key, model.__tablename__) for key in keys)
+
+    def _after_commit(self, sync_session) -> None:
+        pending = sync_session.info.get(self)
+        if not pending:
+            return
+        by_namespace: Dict[str, List[str]] = {}
+        for key, namespace in pending:
+            by_namespace.setdefault(namespace, []).append(key)
+        pending.clear()
+        # Commit hooks are synchronous; the tombstones are written from the loop right after
+        loop = asyncio.get_running_loop()
+        for namespace, keys in by_namespace.items():
+            task = loop.create_task(self._tombstone(keys, namespace))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+def build_cache_backend(config: Settings) -> Optional[CacheBackend]:
+    if config.REPOSITORY_CACHE == "off":
+        return None
+    if config.REPOSITORY_CACHE == "memory":
+        return InMemoryCacheBackend()
+    if config.REPOSITORY_CACHE == "redis":
+        if not config.CACHE_REDIS_URL:
+            raise ValueError("REPOSITORY_CACHE=redis requires CACHE_REDIS_URL")
+        import redis.asyncio as redis # optional dependency, only needed when the Redis cache is configured
+        return RedisCacheBackend(redis.from_url(config.CACHE_REDIS_URL))
+    raise ValueError(f"Unknown REPOSITORY_CACHE {config.REPOSITORY_CACHE!r}")
+
+def build_repository_cache(config: Settings, backend: Optional[CacheBackend] = None) -> Optional[RepositoryCache]:
+    backend = backend or build_cache_backend(config)
+    if backend is None:
+        return None
+    return RepositoryCache(
+        backend,
+        ttl=config.CACHE_TTL_SECONDS,
+        negative_ttl=config.CACHE_NEGATIVE_TTL_SECONDS,
+        key_version=config.CACHE_KEY_VERSION,
+        tombstone_ttl=config.CACHE_TOMBSTONE_TTL_SECONDS,
+    )
+
+def build_tenant_cache(config: Settings, shared: Optional[CacheBackend]) -> Optional[RepositoryCache]:
+    """Tenant and membership rows are read on every authorization decision: add a per-process tier."""
+    if shared is None:
+        return None
+    local = TieredCacheBackend(shared, config.TENANT_CACHE_LOCAL_SIZE, config.TENANT_CACHE_LOCAL_TTL_SECONDS)
+    return build_repository_cache(config, local)
+
+_shared_backend = build_cache_backend(settings)
+repository_cache = build_repository_cache(settings, _shared_backend)
+tenant_cache = build_tenant_cache(settings, _shared_backend)
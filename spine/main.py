@@ -1,6 +1,11 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 from spine.core.config import settings
+from spine.core import security
+from spine.db.database import engine, pool_status
+from spine.services.transitions import WorkItemConflictError
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,6 +26,15 @@ if settings.BACKEND_CORS_ORIGINS:
 from spine.api.v1.api import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def warm_password_hashing():
+    # Precompute the dummy hash so the first unknown-email login costs the same as any other
+    await security.hashing_pool.run(security.dummy_password_hash)
+
+@app.exception_handler(WorkItemConflictError)
+async def work_item_conflict_handler(request, exc: WorkItemConflictError):
+    return JSONResponse(status_code=409, content={"detail": str(exc), "item_id": exc.item_id})
+
 @app.get("/health", status_code=200)
 def health_check():
     """
@@ -32,6 +46,22 @@ def health_check():
         "project": settings.PROJECT_NAME
     }
 
+@app.get("/health/db")
+async def health_check_db():
+    """
+    Database Health Probe.
+    Round-trips a SELECT 1 and reports pool checked-in/checked-out counts.
+    """
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": type(e).__name__, "pool": pool_status()}
+        )
+    return {"status": "ok", "pool": pool_status()}
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Assistants Co Spine API"}
@@ -2,3 +2,4 @@ from .user_repo import UserRepository
 from .tenant_repo import TenantRepository
 from .email_repo import EmailRepository
 from .work_item_repo import WorkItemRepository
+from .thread_repo import ThreadRepository
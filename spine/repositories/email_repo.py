@@ -1,13 +1,90 @@
-from typing import List
+from typing import Dict, Iterable, List, Set, Tuple
 from sqlalchemy import select
-from spine.db.models import Email
+from spine.core.addresses import normalize_address
+from spine.db.models import Email, EmailRecipient
 from spine.db.repository import BaseRepository
 
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
 class EmailRepository(BaseRepository[Email]):
-    async def get_by_provider_message_id(self, provider_message_id: str) -> Email | None:
-        result = await self.session.execute(select(Email).where(Email.provider_message_id == provider_message_id))
+    # Conflict target, backed by ux_emails_tenant_id_provider_message_id
+    upsert_key = (Email.tenant_id, Email.provider_message_id)
+
+    async def get_by_provider_message_id(self, tenant_id: str, provider_message_id: str) -> Email | None:
+        result = await self.session.execute(
+            select(Email).where(Email.tenant_id == tenant_id, Email.provider_message_id == provider_message_id)
+        )
         return result.scalar_one_or_none()
 
+    async def get_ids_by_provider_message_ids(self, tenant_id: str, provider_message_ids: Iterable[str]) -> Dict[str, str]:
+        """Maps provider_message_id -> email id for the ids already stored (one IN lookup per chunk)."""
+        wanted = list(dict.fromkeys(provider_message_ids))
+        found: Dict[str, str] = {}
+        for start in range(0, len(wanted), LOOKUP_CHUNK_SIZE):
+            chunk = wanted[start:start + LOOKUP_CHUNK_SIZE]
+            result = await self.session.execute(
+                select(Email.provider_message_id, Email.id)
+                .where(Email.tenant_id == tenant_id, Email.provider_message_id.in_(chunk))
+            )
+            found.update({row.provider_message_id: row.id for row in result})
+        return found
+
+    async def upsert(self, **values) -> Tuple[Email, bool]:
+        """
+        Idempotent insert in a single statement, safe across concurrent sync workers.
+        On conflict the DO UPDATE rewrites the key to itself, so RETURNING yields the stored row unchanged.
+        Returns (email, created); created is True when the row carrying values["id"] was inserted.
+        """
+        stmt = self._upsert_insert().values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(self.upsert_key),
+            set_={"provider_message_id": stmt.excluded.provider_message_id},
+        ).returning(Email)
+        result = await self.session.execute(stmt, execution_options={"populate_existing": True})
+        email = result.scalar_one()
+        return email, email.id == values["id"]
+
+    async def bulk_create(self, rows: List[dict]) -> Set[str]:
+        """
+        Multi-row INSERT ... ON CONFLICT DO NOTHING.
+        Returns the provider_message_ids actually inserted; the rest lost a race to another writer.
+        Rows bypass the identity map; callers get ids from the row dicts.
+        """
+        if not rows:
+            return set()
+        stmt = (
+            self._upsert_insert()
+            .on_conflict_do_nothing(index_elements=list(self.upsert_key))
+            .returning(Email.provider_message_id)
+        )
+        result = await self.session.execute(stmt, rows)
+        return set(result.scalars().all())
+
+    async def add_recipients(self, rows: List[dict]) -> None:
+        """Multi-row insert into email_recipients. Re-adding an existing (email, address, kind) is a no-op."""
+        if not rows:
+            return
+        await self.session.execute(self._upsert_insert(EmailRecipient).on_conflict_do_nothing(), rows)
+
+    async def find_by_participant(self, address: str, tenant_id: str, limit: int = 100) -> List[Email]:
+        """
+        Emails the address sent, received or was cc'd on, newest first.
+        Resolved through ix_email_recipients_tenant_id_address_email_id, so cost follows the
+        participant's message count rather than the mailbox size.
+        """
+        participant_email_ids = select(EmailRecipient.email_id).where(
+            EmailRecipient.tenant_id == tenant_id,
+            EmailRecipient.address == normalize_address(address),
+        )
+        result = await self.session.execute(
+            select(Email)
+            .where(Email.id.in_(participant_email_ids))
+            .order_by(Email.received_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def get_by_thread_id(self, thread_id: str) -> List[Email]:
         result = await self.session.execute(select(Email).where(Email.thread_id == thread_id))
         return list(result.scalars().all())
@@ -1,8 +1,29 @@
+from typing import List
 from sqlalchemy import select
-from spine.db.models import Tenant
+from spine.db.models import Role, Tenant, TenantMembership
+from spine.db.principal_cache import invalidate_user_on_commit
 from spine.db.repository import BaseRepository
 
 class TenantRepository(BaseRepository[Tenant]):
     async def get_by_name(self, name: str) -> Tenant | None:
         result = await self.session.execute(select(Tenant).where(Tenant.name == name))
         return result.scalar_one_or_none()
+
+    async def get_memberships(self, user_id: str) -> List[TenantMembership]:
+        if self.cache:
+            return await self.cache.get_list(
+                self.session, TenantMembership, "user_id", user_id, lambda: self._get_memberships_from_db(user_id)
+            )
+        return await self._get_memberships_from_db(user_id)
+
+    async def _get_memberships_from_db(self, user_id: str) -> List[TenantMembership]:
+        result = await self.session.execute(select(TenantMembership).where(TenantMembership.user_id == user_id))
+        return list(result.scalars().all())
+
+    async def add_membership(self, id: str, tenant_id: str, user_id: str, role: Role = Role.MEMBER) -> TenantMembership:
+        membership = TenantMembership(id=id, tenant_id=tenant_id, user_id=user_id, role=role)
+        self.session.add(membership)
+        if self.cache:
+            await self.cache.invalidate_on_commit(self.session, TenantMembership, "user_id", user_id)
+        invalidate_user_on_commit(self.session, user_id)
+        return membership
@@ -0,0 +1,98 @@
+from typing import List
+from sqlalchemy import select, case, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from spine.db.models import Email, EmailRecipient, EmailThread
+from spine.db.repository import upsert_insert
+
+# participants = sorted union of the stored list and the incoming one, computed by the database against the
+# row version the upsert locked, so concurrent ingesters on one thread add to each other's addresses
+_MERGED_PARTICIPANTS = {
+    "sqlite": (
+        "(SELECT json_group_array(value) FROM ("
+        "SELECT value FROM json_each(threads.participants) "
+        "UNION SELECT value FROM json_each(excluded.participants) ORDER BY value))"
+    ),
+    "postgresql": (
+        "(SELECT coalesce(json_agg(value ORDER BY value), '[]'::json) FROM ("
+        "SELECT json_array_elements_text(threads.participants) AS value "
+        "UNION SELECT json_array_elements_text(excluded.participants)) AS merged)"
+    ),
+}
+
+class ThreadRepository:
+    """
+    Read model over the thread rollups. Not a BaseRepository: threads are keyed by (tenant_id, thread_id),
+    not by an id column, and are only written through apply_rollups/rebuild.
+    """
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_thread_id(self, tenant_id: str, thread_id: str) -> EmailThread | None:
+        result = await self.session.execute(
+            select(EmailThread).where(EmailThread.tenant_id == tenant_id, EmailThread.thread_id == thread_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_inbox(self, tenant_id: str, limit: int = 50) -> List[EmailThread]:
+        """Most recently active threads first. Served by ix_threads_tenant_id_last_received_at."""
+        result = await self.session.execute(
+            select(EmailThread)
+            .where(EmailThread.tenant_id == tenant_id)
+            .order_by(EmailThread.last_received_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def apply_rollups(self, rows: List[dict]) -> None:
+        """
+        Folds per-thread deltas into the rollups in one multi-row upsert.
+        message_count is incremented, latest-message fields only move forward in time and participants
+        are merged into the stored list, all inside the statement, so concurrent ingesters lose nothing.
+        Each row's participants holds only the addresses of the messages it folds in.
+        """
+        if not rows:
+            return
+        stmt = upsert_insert(self.session, EmailThread)
+        merged_participants = literal_column(_MERGED_PARTICIPANTS[self.session.get_bind().dialect.name])
+        newer = stmt.excluded.last_received_at > EmailThread.last_received_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmailThread.tenant_id, EmailThread.thread_id],
+            set_={
+                "message_count": EmailThread.message_count + stmt.excluded.message_count,
+                "last_received_at": case((newer, stmt.excluded.last_received_at), else_=EmailThread.last_received_at),
+                "latest_direction": case((newer, stmt.excluded.latest_direction), else_=EmailThread.latest_direction),
+                "subject": case((newer, stmt.excluded.subject), else_=EmailThread.subject),
+                "participants": merged_participants,
+            },
+        )
+        await self.session.execute(stmt, rows)
+
+    async def rebuild(self, tenant_id: str, thread_id: str) -> EmailThread | None:
+        """Recomputes one rollup from emails/email_recipients (backfills, repairs)."""
+        message_count = (await self.session.execute(
+            select(func.count(Email.id)).where(Email.tenant_id == tenant_id, Email.thread_id == thread_id)
+        )).scalar_one()
+        if not message_count:
+            return None
+        latest = (await self.session.execute(
+            select(Email)
+            .where(Email.tenant_id == tenant_id, Email.thread_id == thread_id)
+            .order_by(Email.received_at.desc())
+            .limit(1)
+        )).scalar_one()
+        participants = (await self.session.execute(
+            select(EmailRecipient.address).distinct()
+            .join(Email, Email.id == EmailRecipient.email_id)
+            .where(Email.tenant_id == tenant_id, Email.thread_id == thread_id)
+        )).scalars().all()
+
+        thread = await self.get_by_thread_id(tenant_id, thread_id)
+        if thread is None:
+            thread = EmailThread(tenant_id=tenant_id, thread_id=thread_id)
+            self.session.add(thread)
+        thread.message_count = message_count
+        thread.last_received_at = latest.received_at
+        thread.latest_direction = latest.direction
+        thread.subject = latest.subject
+        thread.participants = sorted(participants)
+        return thread
@@ -1,15 +1,61 @@
-from typing import Optional
-from sqlalchemy import select
+from typing import Any, Optional
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from spine.db.repository import BaseRepository
+from spine.db.repository_cache import RepositoryCache
 from spine.db.models import User
 
 class UserRepository(BaseRepository[User]):
-    def __init__(self, session: AsyncSession):
-        super().__init__(User, session)
+    def __init__(self, session: AsyncSession, cache: Optional[RepositoryCache] = None):
+        super().__init__(User, session, cache)
+
+    async def create(self, **kwargs) -> User:
+        user = await super().create(**kwargs)
+        if self.cache and "email" in kwargs:
+            await self.cache.invalidate_on_commit(self.session, User, "email", kwargs["email"])
+        return user
+
+    async def update(self, id: Any, **kwargs) -> Optional[User]:
+        user = await super().update(id, **kwargs)
+        if self.cache and "email" in kwargs:
+            # The old email's pointer is re-checked on read; only a cached "not found" for the new one is stale
+            await self.cache.invalidate(User, "email", kwargs["email"])
+        return user
 
     async def get_by_email(self, email: str) -> Optional[User]:
+        if self.cache:
+            return await self.cache.get_by_unique(self.session, User, "email", email, lambda: self._get_by_email_from_db(email))
+        return await self._get_by_email_from_db(email)
+
+    async def get_for_login(self, email: str) -> Optional[User]:
+        """
+        Always the DB, never the cache: password checks must not depend on (or expose) cached credentials.
+        populate_existing also loads hashed_password onto a row this session already materialized from the cache.
+        """
+        result = await self.session.execute(
+            select(User).where(User.email == email).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def _get_by_email_from_db(self, email: str) -> Optional[User]:
         result = await self.session.execute(
             select(User).where(User.email == email)
         )
         return result.scalar_one_or_none()
+
+    async def replace_password_hash(self, user: User, new_hash: str) -> bool:
+        """
+        Compare-and-set against the hash the caller just verified, in the caller's transaction (no re-read);
+        the caller commits. A concurrent password change wins; the upgrade is simply retried on a later login.
+        """
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(hashed_password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        set_committed_value(user, "hashed_password", new_hash)
+        return True
@@ -1,13 +1,170 @@
-from typing import List
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, update, or_
 from spine.db.models import WorkItem, WorkItemState
 from spine.db.repository import BaseRepository
 
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 500
+
 class WorkItemRepository(BaseRepository[WorkItem]):
-    async def get_by_state(self, state: WorkItemState) -> List[WorkItem]:
-        result = await self.session.execute(select(WorkItem).where(WorkItem.state == state))
+    # Every queue query leads with tenant_id so it stays on the composite indexes declared on WorkItem
+    async def get_by_state(self, tenant_id: str, state: WorkItemState, limit: int = 100) -> List[WorkItem]:
+        """Oldest first. Served by ix_work_items_tenant_id_state_created_at."""
+        result = await self.session.execute(
+            select(WorkItem)
+            .where(WorkItem.tenant_id == tenant_id, WorkItem.state == state)
+            .order_by(WorkItem.created_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_owner(
+        self, tenant_id: str, owner_id: str, state: Optional[WorkItemState] = None
+    ) -> List[WorkItem]:
+        """Served by ix_work_items_tenant_id_owner_id_state."""
+        stmt = select(WorkItem).where(WorkItem.tenant_id == tenant_id, WorkItem.owner_id == owner_id)
+        if state is not None:
+            stmt = stmt.where(WorkItem.state == state)
+        result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
     async def get_by_email_id(self, email_id: str) -> WorkItem | None:
         result = await self.session.execute(select(WorkItem).where(WorkItem.email_id == email_id))
         return result.scalar_one_or_none()
+
+    async def get_states(self, item_ids: Iterable[str]) -> Dict[str, WorkItemState]:
+        """Current state per id (missing ids are absent); one IN lookup per chunk."""
+        wanted = list(dict.fromkeys(item_ids))
+        states: Dict[str, WorkItemState] = {}
+        for start in range(0, len(wanted), ID_CHUNK_SIZE):
+            result = await self.session.execute(
+                select(WorkItem.id, WorkItem.state).where(WorkItem.id.in_(wanted[start:start + ID_CHUNK_SIZE]))
+            )
+            states.update({row.id: row.state for row in result})
+        return states
+
+    async def compare_and_set(self, item_id: str, expected_version: int, **values) -> WorkItem | None:
+        """
+        UPDATE ... WHERE id = :id AND version = :expected RETURNING *, bumping version.
+        Returns the updated item, or None when the row changed (or vanished) since it was read.
+        """
+        result = await self.session.execute(
+            update(WorkItem)
+            .where(WorkItem.id == item_id, WorkItem.version == expected_version)
+            .values(version=expected_version + 1, **values)
+            .returning(WorkItem)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def bulk_update(self, item_ids: List[str], expected_states: Iterable[WorkItemState], **values) -> List[str]:
+        """
+        Set-based UPDATE ... WHERE id IN (...) AND state IN (expected_states) RETURNING id.
+        The state guard skips rows another writer moved since they were read; version is bumped so
+        single-item compare-and-set readers see the change. Returns the ids updated.
+        """
+        expected = list(expected_states)
+        updated: List[str] = []
+        for start in range(0, len(item_ids), ID_CHUNK_SIZE):
+            result = await self.session.execute(
+                update(WorkItem)
+                .where(WorkItem.id.in_(item_ids[start:start + ID_CHUNK_SIZE]), WorkItem.state.in_(expected))
+                .values(version=WorkItem.version + 1, **values)
+                .returning(WorkItem.id)
+                .execution_options(synchronize_session="fetch")
+            )
+            updated.extend(result.scalars().all())
+        return updated
+
+    async def claim(
+        self,
+        tenant_id: str,
+        state: WorkItemState,
+        n: int,
+        lease_seconds: int,
+        owner_id: str,
+        now: Optional[datetime] = None,
+    ) -> List[WorkItem]:
+        """
+        Leases up to n unleased (or lease-expired) items in one statement, oldest first.
+        Postgres: the candidate subquery takes FOR UPDATE SKIP LOCKED, so concurrent workers
+        get disjoint batches without waiting on each other.
+        SQLite: writers are serialized, so the single UPDATE ... WHERE id IN (subquery) is already atomic.
+        """
+        now = now or datetime.utcnow()
+        candidates = (
+            select(WorkItem.id)
+            .where(
+                WorkItem.tenant_id == tenant_id,
+                WorkItem.state == state,
+                or_(WorkItem.leased_until.is_(None), WorkItem.leased_until < now),
+            )
+            .order_by(WorkItem.created_at)
+            .limit(n)
+        )
+        if self.session.get_bind().dialect.name == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        result = await self.session.execute(
+            update(WorkItem)
+            .where(WorkItem.id.in_(candidates))
+            .values(
+                lease_owner=owner_id,
+                leased_until=now + timedelta(seconds=lease_seconds),
+                version=WorkItem.version + 1,
+            )
+            .returning(WorkItem)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def renew_lease(
+        self, item_ids: List[str], owner_id: str, lease_seconds: int, now: Optional[datetime] = None
+    ) -> List[str]:
+        """Extends leases still held by owner_id. Returns the ids renewed; expired or stolen leases are not."""
+        now = now or datetime.utcnow()
+        renewed: List[str] = []
+        for start in range(0, len(item_ids), ID_CHUNK_SIZE):
+            result = await self.session.execute(
+                update(WorkItem)
+                .where(
+                    WorkItem.id.in_(item_ids[start:start + ID_CHUNK_SIZE]),
+                    WorkItem.lease_owner == owner_id,
+                    WorkItem.leased_until >= now,
+                )
+                .values(leased_until=now + timedelta(seconds=lease_seconds))
+                .returning(WorkItem.id)
+                .execution_options(synchronize_session=False)
+            )
+            renewed.extend(result.scalars().all())
+        return renewed
+
+    async def release(self, item_ids: List[str], owner_id: str) -> List[str]:
+        """Gives leases back early (e.g. a worker shutting down)."""
+        released: List[str] = []
+        for start in range(0, len(item_ids), ID_CHUNK_SIZE):
+            result = await self.session.execute(
+                update(WorkItem)
+                .where(WorkItem.id.in_(item_ids[start:start + ID_CHUNK_SIZE]), WorkItem.lease_owner == owner_id)
+                .values(lease_owner=None, leased_until=None)
+                .returning(WorkItem.id)
+                .execution_options(synchronize_session=False)
+            )
+            released.extend(result.scalars().all())
+        return released
+
+    async def sweep_expired_leases(self, now: Optional[datetime] = None, tenant_id: Optional[str] = None) -> int:
+        """
+        Clears expired leases, for one tenant or all of them. claim() already ignores them, so this is
+        housekeeping (keeps lease_owner meaningful for dashboards), safe to run from any worker on a timer.
+        Served by ix_work_items_leased_until, which only holds leased items.
+        """
+        now = now or datetime.utcnow()
+        stmt = update(WorkItem).where(WorkItem.leased_until < now)
+        if tenant_id is not None:
+            stmt = stmt.where(WorkItem.tenant_id == tenant_id)
+        result = await self.session.execute(
+            stmt.values(lease_owner=None, leased_until=None).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,29 +1,80 @@
 from typing import Optional
 from spine.repositories.user_repo import UserRepository
 from spine.core import security
+from spine.core.addresses import normalize_address
+from spine.core.config import settings
+from spine.core.rate_limit import RateLimiter, build_limiter
 from spine.db.models import User
 
+class LoginThrottledError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many login attempts, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+email_limiter = build_limiter(
+    settings.LOGIN_RATE_EMAIL_BURST,
+    settings.LOGIN_RATE_EMAIL_PER_MINUTE / 60,
+    settings.LOGIN_RATE_LIMIT_REDIS_URL,
+    prefix="login:email",
+)
+ip_limiter = build_limiter(
+    settings.LOGIN_RATE_IP_BURST,
+    settings.LOGIN_RATE_IP_PER_MINUTE / 60,
+    settings.LOGIN_RATE_LIMIT_REDIS_URL,
+    prefix="login:ip",
+)
+
 class AuthService:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        email_limiter: RateLimiter = email_limiter,
+        ip_limiter: RateLimiter = ip_limiter,
+    ):
         self.user_repo = user_repo
+        self.email_limiter = email_limiter
+        self.ip_limiter = ip_limiter
 
-    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        user = await self.user_repo.get_by_email(email)
-        if not user:
-            return None
+    async def _check_limits(self, email: str, client_ip: Optional[str]) -> None:
+        # Abusive bursts are refused before any bcrypt CPU is spent on them
+        if client_ip:
+            wait = await self.ip_limiter.acquire(client_ip)
+            if wait:
+                raise LoginThrottledError(wait)
+        wait = await self.email_limiter.acquire(normalize_address(email))
+        if wait:
+            raise LoginThrottledError(wait)
+
+    async def authenticate_user(self, email: str, password: str, client_ip: Optional[str] = None) -> Optional[User]:
+        """
+        Every attempt that passes the limiter costs exactly one bcrypt verify, whether or not the
+        user exists, so response time does not reveal which emails are registered.
+        """
+        await self._check_limits(email, client_ip)
+
+        user = await self.user_repo.get_for_login(email)
         # Verify PASSWORD (assuming User model has hashed_password field, which we didn't add yet!)
         # Wait, the User model in models.py (Phase 2) ONLY has id, email, name.
         # We need to ADD hashed_password to User model or use a separate credentials table.
         # For simplicity in this UMP, let's add `hashed_password` to the User model.
-        if not hasattr(user, 'hashed_password') or not user.hashed_password:
+        hashed_password = user.hashed_password if user and getattr(user, 'hashed_password', None) else None
+
+        # Off the event loop; raises PasswordHashingBusyError when the hashing pool is saturated
+        verified, new_hash = await security.verify_and_update_password_async(
+            password, hashed_password or security.dummy_password_hash()
+        )
+
+        if not user:
+            return None
+        if not hashed_password:
              # Fallback for dev: if no password set, verify against "password" (MOCK)
-             if password == "password":
-                 return user
-             return None
-             
-        if not security.verify_password(password, user.hashed_password):
+             return user if password == "password" else None
+        if not verified:
             return None
-            
+        if new_hash:
+            # Stale profile: upgrade in the login's own transaction, keyed on the hash we just verified
+            if await self.user_repo.replace_password_hash(user, new_hash):
+                await self.user_repo.session.commit()
         return user
 
     def create_user_token(self, user_id: str) -> str:
@@ -0,0 +1,60 @@
+import hashlib
+import time
+from typing import Optional
+from jose import JWTError
+from spine.core import security
+from spine.core.cache import TTLCache
+from spine.core.config import settings
+from spine.contracts.auth_dto import CurrentUser
+from spine.db.principal_cache import principal_cache
+from spine.repositories.user_repo import UserRepository
+from spine.repositories.tenant_repo import TenantRepository
+
+class InvalidTokenError(Exception):
+    pass
+
+# Decoded claims keyed by SHA-256 of the token (raw tokens are never held as keys)
+claims_cache: TTLCache[str, dict] = TTLCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL_SECONDS)
+
+class CurrentUserService:
+    def __init__(self, user_repo: UserRepository, tenant_repo: TenantRepository):
+        self.user_repo = user_repo
+        self.tenant_repo = tenant_repo
+
+    def decode(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).hexdigest()
+        claims = claims_cache.get(key)
+        if claims is not None:
+            return claims
+        try:
+            claims = security.decode_access_token(token)
+        except JWTError as e:
+            raise InvalidTokenError("Could not validate credentials") from e
+        # Cached claims must not outlive the token itself; a token without exp is decoded every time
+        expires = claims.get("exp")
+        if expires is not None:
+            claims_cache.set(key, claims, ttl=expires - time.time())
+        return claims
+
+    async def resolve(self, token: str) -> CurrentUser:
+        """Zero DB reads when both the token and the principal are cached."""
+        user_id: Optional[str] = self.decode(token).get("sub")
+        if not user_id:
+            raise InvalidTokenError("Token has no subject")
+
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        user = await self.user_repo.get(user_id)
+        if not user:
+            raise InvalidTokenError("User not found")
+        memberships = await self.tenant_repo.get_memberships(user_id)
+        principal = CurrentUser(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            memberships={m.tenant_id: m.role for m in memberships},
+        )
+        principal_cache.set(user_id, principal)
+        return principal
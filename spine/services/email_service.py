@@ -1,15 +1,58 @@
 import uuid
 from datetime import datetime
-from typing import Optional
-from spine.db.models import Email, Direction
+from typing import Optional, List, Dict
+from spine.core.addresses import parse_addresses
+from spine.db.models import Email, Direction, RecipientKind
 from spine.repositories.email_repo import EmailRepository
+from spine.repositories.thread_repo import ThreadRepository
+from spine.contracts.email_dto import EmailIngest, EmailIngestResult
+
+def _recipient_rows(
+    email_id: str, tenant_id: str, from_email: str, to_emails: Optional[str], cc_emails: Optional[str]
+) -> List[dict]:
+    rows = []
+    for kind, raw in ((RecipientKind.FROM, from_email), (RecipientKind.TO, to_emails), (RecipientKind.CC, cc_emails)):
+        for address in parse_addresses(raw):
+            rows.append({"email_id": email_id, "address": address, "kind": kind, "tenant_id": tenant_id})
+    return rows
 
 class EmailService:
-    def __init__(self, email_repo: EmailRepository):
+    def __init__(self, email_repo: EmailRepository, thread_repo: Optional[ThreadRepository] = None):
         self.email_repo = email_repo
+        # Thread rollups are written in the same session (and transaction) as the emails
+        self.thread_repo = thread_repo or ThreadRepository(email_repo.session)
+
+    async def _roll_up_threads(self, tenant_id: str, messages: List[dict], recipients: List[dict]) -> None:
+        """Folds newly stored messages into their thread rollups in one upsert (it merges participants too)."""
+        deltas: Dict[str, dict] = {}
+        thread_of: Dict[str, str] = {}
+        for msg in messages:
+            thread_of[msg["id"]] = msg["thread_id"]
+            delta = deltas.get(msg["thread_id"])
+            if delta is None:
+                delta = deltas[msg["thread_id"]] = {
+                    "tenant_id": tenant_id,
+                    "thread_id": msg["thread_id"],
+                    "message_count": 0,
+                    "last_received_at": msg["received_at"],
+                    "latest_direction": msg["direction"],
+                    "subject": msg["subject"],
+                    "participants": set(),
+                }
+            delta["message_count"] += 1
+            if msg["received_at"] > delta["last_received_at"]:
+                delta.update(last_received_at=msg["received_at"], latest_direction=msg["direction"], subject=msg["subject"])
+
+        for recipient in recipients:
+            deltas[thread_of[recipient["email_id"]]]["participants"].add(recipient["address"])
+
+        for delta in deltas.values():
+            delta["participants"] = sorted(delta["participants"])
+        await self.thread_repo.apply_rollups(list(deltas.values()))
 
     async def ingest_email(
         self,
+        tenant_id: str,
         provider_message_id: str,
         thread_id: str,
         from_email: str,
@@ -19,14 +62,11 @@ class EmailService:
         direction: Direction,
         cc_emails: Optional[str] = None
     ) -> Email:
-        # 1. Idempotency Check
-        existing = await self.email_repo.get_by_provider_message_id(provider_message_id)
-        if existing:
-            return existing
-
-        # 2. Create
-        email = await self.email_repo.create(
+        # Idempotency is enforced by the (tenant_id, provider_message_id) unique index:
+        # a duplicate returns the stored row from the same statement, even under concurrent workers.
+        email, created = await self.email_repo.upsert(
             id=f"msg_{uuid.uuid4()}",
+            tenant_id=tenant_id,
             provider_message_id=provider_message_id,
             thread_id=thread_id,
             from_email=from_email,
@@ -36,9 +76,67 @@ class EmailService:
             received_at=received_at,
             direction=direction
         )
-        await self.email_repo.session.flush() # Ensure ID is available if needed immediately
+        if created:
+            recipients = _recipient_rows(email.id, tenant_id, from_email, to_emails, cc_emails)
+            await self.email_repo.add_recipients(recipients)
+            await self._roll_up_threads(tenant_id, [{
+                "id": email.id,
+                "thread_id": thread_id,
+                "subject": subject,
+                "received_at": received_at,
+                "direction": direction,
+            }], recipients)
         # Note: We commit at the Controller/UnitOfWork level usually, but here we might trust the repo's session management
         # For this Service, we assume the session is managed externally or we should commit if this is atomic.
         # Given BaseRepository uses the passed session, the caller (Dependency Injection) handles commit.
         
         return email
+
+    async def ingest_emails(self, tenant_id: str, batch: List[EmailIngest]) -> List[EmailIngestResult]:
+        """
+        Set-based variant of ingest_email for history syncs.
+        One IN lookup dedupes the whole batch, then only new messages are inserted in a single
+        multi-row INSERT ... ON CONFLICT DO NOTHING. Results are returned in input order.
+        """
+        # 1. Idempotency Check (whole batch at once)
+        known: Dict[str, str] = await self.email_repo.get_ids_by_provider_message_ids(
+            tenant_id, (msg.provider_message_id for msg in batch)
+        )
+
+        # 2. Create only unseen messages; repeats inside the batch resolve to the first occurrence
+        results: List[EmailIngestResult] = []
+        new_rows: List[dict] = []
+        for msg in batch:
+            existing_id = known.get(msg.provider_message_id)
+            if existing_id:
+                results.append(EmailIngestResult(id=existing_id, provider_message_id=msg.provider_message_id, created=False))
+                continue
+
+            row = msg.model_dump()
+            row["id"] = f"msg_{uuid.uuid4()}"
+            row["tenant_id"] = tenant_id
+            new_rows.append(row)
+            known[msg.provider_message_id] = row["id"]
+            results.append(EmailIngestResult(id=row["id"], provider_message_id=msg.provider_message_id, created=True))
+
+        inserted = await self.email_repo.bulk_create(new_rows)
+        stored_rows = [row for row in new_rows if row["provider_message_id"] in inserted]
+        recipients = [
+            recipient
+            for row in stored_rows
+            for recipient in _recipient_rows(row["id"], tenant_id, row["from_email"], row["to_emails"], row["cc_emails"])
+        ]
+        await self.email_repo.add_recipients(recipients)
+        await self._roll_up_threads(tenant_id, stored_rows, recipients)
+
+        # 3. Rows another worker inserted between our lookup and insert resolve to the stored id
+        lost = [row["provider_message_id"] for row in new_rows if row["provider_message_id"] not in inserted]
+        if lost:
+            stored = await self.email_repo.get_ids_by_provider_message_ids(tenant_id, lost)
+            results = [
+                EmailIngestResult(id=stored[r.provider_message_id], provider_message_id=r.provider_message_id, created=False)
+                if r.provider_message_id in stored else r
+                for r in results
+            ]
+        # As with ingest_email, commit is left to the caller
+        return results
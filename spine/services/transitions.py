@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, NamedTuple, Tuple
+from spine.db.models import WorkItemState
+
+class InvalidTransitionError(ValueError):
+    pass
+
+class WorkItemConflictError(Exception):
+    """The work item changed between read and write (optimistic concurrency). Maps to HTTP 409."""
+    def __init__(self, item_id: str, expected_version: int):
+        super().__init__(f"WorkItem {item_id} was modified concurrently (expected version {expected_version})")
+        self.item_id = item_id
+        self.expected_version = expected_version
+
+class StateEffects(NamedTuple):
+    resolution_lock: bool # Value written to WorkItem.resolution_lock on entry
+    stamps_closed_at: bool # Entry sets WorkItem.closed_at
+
+# --- Declarative table (edit here) ---
+
+# from-state -> states it may move to. Self-transitions are not listed, so re-applying a state is rejected.
+# DONE is terminal: reopening needs a verification step that does not exist yet.
+TRANSITIONS: Dict[WorkItemState, Tuple[WorkItemState, ...]] = {
+    WorkItemState.NEEDS_REPLY: (WorkItemState.WAITING, WorkItemState.FYI, WorkItemState.DONE, WorkItemState.SUBSCRIPTIONS),
+    WorkItemState.WAITING: (WorkItemState.NEEDS_REPLY, WorkItemState.FYI, WorkItemState.DONE),
+    WorkItemState.FYI: (WorkItemState.NEEDS_REPLY, WorkItemState.DONE, WorkItemState.SUBSCRIPTIONS),
+    WorkItemState.SUBSCRIPTIONS: (WorkItemState.NEEDS_REPLY, WorkItemState.FYI, WorkItemState.DONE),
+    WorkItemState.DONE: (),
+}
+
+# Side effects of entering a state
+EFFECTS: Dict[WorkItemState, StateEffects] = {
+    WorkItemState.NEEDS_REPLY: StateEffects(resolution_lock=False, stamps_closed_at=False),
+    WorkItemState.WAITING: StateEffects(resolution_lock=True, stamps_closed_at=False),
+    WorkItemState.FYI: StateEffects(resolution_lock=False, stamps_closed_at=False),
+    WorkItemState.SUBSCRIPTIONS: StateEffects(resolution_lock=False, stamps_closed_at=False),
+    WorkItemState.DONE: StateEffects(resolution_lock=True, stamps_closed_at=True),
+}
+
+# --- Compiled at import: each state gets a bit; each from-state a mask of allowed targets ---
+
+def _compile() -> Tuple[Dict[WorkItemState, int], Dict[WorkItemState, int], Dict[WorkItemState, FrozenSet[WorkItemState]]]:
+    states = list(WorkItemState)
+    missing = [s for s in states if s not in TRANSITIONS or s not in EFFECTS]
+    if missing:
+        raise RuntimeError(f"Transition table incomplete for states: {missing}")
+
+    bits = {state: 1 << i for i, state in enumerate(states)}
+    masks = {state: 0 for state in states}
+    sources: Dict[WorkItemState, set] = {state: set() for state in states}
+    for state in states:
+        for target in TRANSITIONS[state]:
+            masks[state] |= bits[target]
+            sources[target].add(state)
+    return bits, masks, {state: frozenset(s) for state, s in sources.items()}
+
+_BITS, _ALLOWED_MASKS, _SOURCES = _compile()
+
+def is_transition_allowed(current: WorkItemState, new_state: WorkItemState) -> bool:
+    return bool(_ALLOWED_MASKS[current] & _BITS[new_state])
+
+def allowed_sources(new_state: WorkItemState) -> FrozenSet[WorkItemState]:
+    """States that may move into new_state (the guard for set-based UPDATEs)."""
+    return _SOURCES[new_state]
+
+def check_transition(current: WorkItemState, new_state: WorkItemState) -> None:
+    if not is_transition_allowed(current, new_state):
+        raise InvalidTransitionError(f"Transition {current.value} -> {new_state.value} is not allowed")
+
+def transition_effects(new_state: WorkItemState, now: datetime) -> Dict[str, Any]:
+    """Column values written by a transition into new_state (shared by single and bulk paths)."""
+    effects = EFFECTS[new_state]
+    values: Dict[str, Any] = {"state": new_state, "resolution_lock": effects.resolution_lock}
+    if effects.stamps_closed_at:
+        values["closed_at"] = now
+    return values
@@ -2,6 +2,8 @@ from typing import Optional, List
 from spine.repositories.user_repo import UserRepository
 from spine.contracts.user_dto import UserCreate, UserUpdate
 from spine.db.models import User
+from spine.db.repository import Page
+from spine.db.principal_cache import invalidate_user
 
 class UserService:
     def __init__(self, user_repo: UserRepository):
@@ -20,9 +22,14 @@ class UserService:
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         return await self.user_repo.get(user_id)
 
+    async def list_users(self, cursor: Optional[str] = None, limit: int = 50) -> Page[User]:
+        return await self.user_repo.page_after(cursor, limit)
+
     async def get_user_by_email(self, email: str) -> Optional[User]:
         return await self.user_repo.get_by_email(email)
 
     async def update_user(self, user_id: str, user_in: UserUpdate) -> Optional[User]:
         update_data = user_in.model_dump(exclude_unset=True)
-        return await self.user_repo.update(user_id, **update_data)
+        user = await self.user_repo.update(user_id, **update_data)
+        invalidate_user(user_id)
+        return user
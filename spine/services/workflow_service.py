@@ -1,7 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from spine.db.models import WorkItem, WorkItemState, ConfidenceBand
 from spine.repositories.work_item_repo import WorkItemRepository
+from spine.services.transitions import (
+    WorkItemConflictError, allowed_sources, check_transition, is_transition_allowed, transition_effects
+)
 
 class WorkflowService:
     def __init__(self, work_item_repo: WorkItemRepository):
@@ -29,24 +32,43 @@ class WorkflowService:
         )
         return item
 
-    async def transition_state(self, item_id: str, new_state: WorkItemState, actor_id: str) -> Optional[WorkItem]:
+    async def transition_state(
+        self, item_id: str, new_state: WorkItemState, actor_id: str, expected_version: Optional[int] = None
+    ) -> Optional[WorkItem]:
+        """
+        Compare-and-swap transition: the UPDATE only applies if the row still has the version we validated against.
+        Pass expected_version (e.g. from the client's last read) to also reject changes made since then.
+        Raises WorkItemConflictError on a lost race, InvalidTransitionError on a forbidden move.
+        """
         item = await self.repo.get_by_id(item_id)
         if not item:
             return None
-            
-        # State Machine Validation (Simplistic for Phase 2)
-        # e.g. Cannot go from DONE back to NEEDS_REPLY without verify
-        
-        item.state = new_state
-        if new_state == WorkItemState.DONE:
-            item.closed_at = datetime.utcnow()
-            
-        # Lock handling
-        if new_state in [WorkItemState.WAITING, WorkItemState.DONE]:
-             item.resolution_lock = True
-        else:
-             item.resolution_lock = False
-
-        self.repo.session.add(item)
+
+        version = item.version if expected_version is None else expected_version
+        if version != item.version:
+            raise WorkItemConflictError(item_id, version)
+
+        # Raises InvalidTransitionError (a ValueError) for moves the transition table forbids
+        check_transition(item.state, new_state)
+
+        updated = await self.repo.compare_and_set(item_id, version, **transition_effects(new_state, datetime.utcnow()))
+        if updated is None:
+            raise WorkItemConflictError(item_id, version)
         # Session commit managed by caller/controller usually
-        return item
+        return updated
+
+    async def transition_many(self, item_ids: List[str], new_state: WorkItemState, actor_id: str) -> List[str]:
+        """
+        Bulk transition: one SELECT of current states, in-memory validation, then one set-based UPDATE
+        with the same closed_at / resolution_lock rules as transition_state.
+        Returns the ids actually transitioned; missing items and moves the transition table forbids are skipped.
+        """
+        states = await self.repo.get_states(item_ids)
+        allowed_ids = [item_id for item_id, state in states.items() if is_transition_allowed(state, new_state)]
+        if not allowed_ids:
+            return []
+
+        # Guard on every legal source state, so a row moved concurrently is only updated if the move is still legal
+        return await self.repo.bulk_update(
+            allowed_ids, allowed_sources(new_state), **transition_effects(new_state, datetime.utcnow())
+        )
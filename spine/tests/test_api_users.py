@@ -62,3 +62,15 @@ async def test_update_user_api():
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == "New Name"
+
+@pytest.mark.asyncio
+async def test_list_users_api_cursor():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(f"{settings.API_V1_STR}/users/", params={"limit": 1})
+        assert response.status_code == 200
+        data = response.json()
+        assert "items" in data and "next_cursor" in data
+
+        bad = await ac.get(f"{settings.API_V1_STR}/users/", params={"cursor": "%%%"})
+        assert bad.status_code == 400
@@ -68,3 +68,234 @@ async def test_login_fail_wrong_password():
         response = await ac.post(f"{settings.API_V1_STR}/auth/login", json=login_data)
         
     assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_login_fast_503_when_hashing_saturated():
+    from spine.core import security
+    uid = str(uuid.uuid4())
+    email = f"auth_busy_{uid}@example.com"
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=f"u_{uid}", email=email, name="Busy User", hashed_password=get_password_hash("pw")))
+        await session.commit()
+
+    max_pending = security.hashing_pool.max_pending
+    security.hashing_pool.max_pending = 0
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(f"{settings.API_V1_STR}/auth/login", json={"email": email, "password": "pw"})
+    finally:
+        security.hashing_pool.max_pending = max_pending
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+@pytest.mark.asyncio
+async def test_hashing_slot_held_until_the_work_finishes():
+    import asyncio
+    import threading
+    from spine.core.security import BoundedExecutor
+    pool = BoundedExecutor(max_workers=1, max_pending=1, thread_name_prefix="test-hash")
+    started, release = threading.Event(), threading.Event()
+    def slow_hash():
+        started.set()
+        release.wait(5)
+
+    task = asyncio.create_task(pool.run(slow_hash))
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # The caller gave up, but the thread is still busy hashing
+    assert pool.pending == 1
+    release.set()
+    await asyncio.to_thread(pool._executor.shutdown)
+    assert pool.pending == 0
+
+@pytest.mark.asyncio
+async def test_current_user_cached_with_zero_db_reads():
+    from sqlalchemy import event
+    from spine.db.database import engine
+    from spine.db.models import Tenant, TenantMembership, Role
+    from spine.core.security import create_access_token
+    from spine.contracts.user_dto import UserUpdate
+    from spine.repositories.user_repo import UserRepository
+    from spine.services.user_service import UserService
+
+    uid = str(uuid.uuid4())
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=f"u_{uid}", email=f"me_{uid}@example.com", name="Me User"))
+        session.add(Tenant(id=f"t_{uid}", name=f"Tenant {uid}"))
+        await session.flush()
+        session.add(TenantMembership(id=f"m_{uid}", tenant_id=f"t_{uid}", user_id=f"u_{uid}", role=Role.OWNER))
+        await session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(f'u_{uid}')}"}
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get(f"{settings.API_V1_STR}/auth/me", headers=headers)
+        assert first.status_code == 200
+        assert first.json()["memberships"] == {f"t_{uid}": "OWNER"}
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            second = await ac.get(f"{settings.API_V1_STR}/auth/me", headers=headers)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        assert second.json() == first.json()
+        assert statements == []
+
+        # An update through the service evicts the cached principal
+        async with AsyncSessionLocal() as session:
+            await UserService(UserRepository(session)).update_user(f"u_{uid}", UserUpdate(name="Renamed"))
+        third = await ac.get(f"{settings.API_V1_STR}/auth/me", headers=headers)
+        assert third.json()["name"] == "Renamed"
+
+@pytest.mark.asyncio
+async def test_current_user_rejects_bad_tokens():
+    from jose import jwt
+    bad_signature = jwt.encode({"sub": "u_x", "exp": 4102444800}, "not-the-key", algorithm="HS256")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        missing = await ac.get(f"{settings.API_V1_STR}/auth/me")
+        forged = await ac.get(f"{settings.API_V1_STR}/auth/me", headers={"Authorization": f"Bearer {bad_signature}"})
+    assert missing.status_code == 401
+    assert forged.status_code == 401
+
+@pytest.mark.asyncio
+async def test_token_without_exp_is_not_cached():
+    import hashlib
+    from jose import jwt
+    from spine.services.current_user_service import CurrentUserService, InvalidTokenError, claims_cache
+    from spine.repositories.user_repo import UserRepository
+    from spine.repositories.tenant_repo import TenantRepository
+    from spine.db.models import Tenant
+    token = jwt.encode({"sub": "u_no_exp"}, settings.SECRET_KEY, algorithm="HS256")
+    async with AsyncSessionLocal() as session:
+        service = CurrentUserService(UserRepository(session), TenantRepository(Tenant, session))
+        assert service.decode(token)["sub"] == "u_no_exp"
+        assert claims_cache.get(hashlib.sha256(token.encode()).hexdigest()) is None
+        with pytest.raises(InvalidTokenError):
+            await service.resolve(token) # decodes fine, but there is no such user
+
+@pytest.mark.asyncio
+async def test_login_miss_costs_one_verify(monkeypatch):
+    from spine.core import security
+    from spine.services.auth_service import AuthService
+    from spine.repositories.user_repo import UserRepository
+
+    verified = []
+    async def counting_verify(plain_password, hashed_password):
+        verified.append(hashed_password)
+        return security.verify_and_update_password(plain_password, hashed_password)
+    monkeypatch.setattr(security, "verify_and_update_password_async", counting_verify)
+
+    async with AsyncSessionLocal() as session:
+        user = await AuthService(UserRepository(session)).authenticate_user(f"nobody_{uuid.uuid4()}@example.com", "guess")
+
+    assert user is None
+    assert verified == [security.dummy_password_hash()]
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills():
+    from spine.core.rate_limit import TokenBucketLimiter
+    now = [0.0]
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=0.5, clock=lambda: now[0])
+
+    assert await limiter.acquire("k") == 0.0
+    assert await limiter.acquire("k") == 0.0
+    assert await limiter.acquire("k") == pytest.approx(2.0)
+    assert await limiter.acquire("other") == 0.0
+    now[0] = 2.0
+    assert await limiter.acquire("k") == 0.0
+
+@pytest.mark.asyncio
+async def test_login_throttled_before_hashing(monkeypatch):
+    from spine.core import security
+    from spine.core.rate_limit import TokenBucketLimiter
+    from spine.api.v1.endpoints.auth import get_auth_service
+    from spine.services.auth_service import AuthService
+    from spine.repositories.user_repo import UserRepository
+    from spine.db.database import get_db
+
+    verified = []
+    async def counting_verify(plain_password, hashed_password):
+        verified.append(hashed_password)
+        return False, None
+    monkeypatch.setattr(security, "verify_and_update_password_async", counting_verify)
+
+    email_limiter = TokenBucketLimiter(capacity=2, refill_per_second=1 / 60)
+    async def tight_auth_service():
+        async for db in get_db():
+            yield AuthService(UserRepository(db), email_limiter=email_limiter, ip_limiter=TokenBucketLimiter(100, 1))
+    app.dependency_overrides[get_auth_service] = tight_auth_service
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            body = {"email": f"victim_{uuid.uuid4()}@example.com", "password": "guess"}
+            statuses = [(await ac.post(f"{settings.API_V1_STR}/auth/login", json=body)) for _ in range(3)]
+    finally:
+        app.dependency_overrides.pop(get_auth_service)
+
+    assert [r.status_code for r in statuses] == [400, 400, 429]
+    assert int(statuses[-1].headers["retry-after"]) >= 1
+    assert len(verified) == 2
+
+@pytest.mark.asyncio
+async def test_login_rehashes_stale_hash(monkeypatch):
+    from passlib.context import CryptContext
+    from spine.core import security
+    from spine.services.auth_service import AuthService
+    from spine.repositories.user_repo import UserRepository
+
+    # Stored at a cost below the current profile
+    stale = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("pw")
+    uid = str(uuid.uuid4())
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=f"u_{uid}", email=f"rehash_{uid}@example.com", name="Rehash User", hashed_password=stale))
+        await session.commit()
+
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5, bcrypt__min_rounds=5))
+    async with AsyncSessionLocal() as session:
+        user = await AuthService(UserRepository(session)).authenticate_user(f"rehash_{uid}@example.com", "pw")
+    assert user is not None
+
+    async with AsyncSessionLocal() as session:
+        stored = (await UserRepository(session).get(f"u_{uid}")).hashed_password
+    assert stored != stale
+    assert stored.startswith("$2b$05$")
+    assert not security.pwd_context.needs_update(stored)
+
+@pytest.mark.asyncio
+async def test_replace_password_hash_leaves_the_commit_to_the_caller():
+    from sqlalchemy.orm.attributes import set_committed_value
+    from spine.repositories.user_repo import UserRepository
+    uid = str(uuid.uuid4())
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=f"u_{uid}", email=f"cas_{uid}@example.com", hashed_password="old"))
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session)
+        user = await repo.get(f"u_{uid}")
+        assert await repo.replace_password_hash(user, "new") is True
+        await session.rollback()
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session)
+        user = await repo.get(f"u_{uid}")
+        assert user.hashed_password == "old"
+        set_committed_value(user, "hashed_password", "stale") # as if the password changed since this read
+        assert await repo.replace_password_hash(user, "new") is False
+
+def test_crypt_context_follows_settings():
+    from spine.core.config import Settings
+    from spine.core.security import build_crypt_context
+
+    context = build_crypt_context(Settings(PASSWORD_BCRYPT_ROUNDS=5))
+    assert context.hash("pw").startswith("$2b$05$")
+    assert context.needs_update(build_crypt_context(Settings(PASSWORD_BCRYPT_ROUNDS=4)).hash("pw"))
+    with pytest.raises(ValueError):
+        build_crypt_context(Settings(PASSWORD_HASH_SCHEME="md5"))
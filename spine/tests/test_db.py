@@ -48,3 +48,13 @@ async def test_duplicate_email(db_session):
     result = await db_session.execute(stmt)
     user = result.scalar_one_or_none()
     assert user is None
+
+# 5. Engine built from Settings
+def test_build_engine_from_settings():
+    from spine.core.config import Settings
+    from spine.db.database import build_engine, pool_status
+    config = Settings(DATABASE_URL="sqlite+aiosqlite:///./pool_probe.db", DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2)
+    probe_engine = build_engine(config)
+    status = pool_status(probe_engine)
+    assert status["size"] == 3
+    assert status["checked_out"] == 0
@@ -42,6 +42,7 @@ async def test_email_ingestion_idempotency():
         
         # First Ingestion
         email1 = await service.ingest_email(
+            tenant_id="t_ingest",
             provider_message_id=msg_id,
             thread_id="th_123",
             from_email="sender@example.com",
@@ -54,6 +55,7 @@ async def test_email_ingestion_idempotency():
         
         # Second Ingestion (Duplicate)
         email2 = await service.ingest_email(
+            tenant_id="t_ingest",
             provider_message_id=msg_id,
             thread_id="th_123",
             from_email="sender@example.com",
@@ -64,3 +66,169 @@ async def test_email_ingestion_idempotency():
         )
         
         assert email1.id == email2.id
+
+@pytest.mark.asyncio
+async def test_bulk_email_ingestion_idempotency():
+    from spine.db.models import Email
+    from spine.contracts.email_dto import EmailIngest
+
+    async with AsyncSessionLocal() as session:
+        service = EmailService(EmailRepository(Email, session))
+
+        def msg(provider_id: str) -> EmailIngest:
+            return EmailIngest(
+                provider_message_id=provider_id,
+                thread_id="th_bulk",
+                from_email="sender@example.com",
+                to_emails="me@example.com",
+                subject="Bulk",
+                received_at=datetime.utcnow(),
+                direction=Direction.INBOUND
+            )
+
+        # Pre-existing message ingested via the single-message path
+        seen_id = f"gmail_{uuid.uuid4()}"
+        existing = await service.ingest_email("t_bulk", **msg(seen_id).model_dump())
+        await session.commit()
+
+        fresh_id = f"gmail_{uuid.uuid4()}"
+        results = await service.ingest_emails("t_bulk", [msg(seen_id), msg(fresh_id), msg(fresh_id)])
+        await session.commit()
+
+        assert [r.created for r in results] == [False, True, False]
+        assert results[0].id == existing.id
+        assert results[1].id == results[2].id
+
+        stored = await service.email_repo.get_by_provider_message_id("t_bulk", fresh_id)
+        assert stored is not None
+        assert stored.id == results[1].id
+
+@pytest.mark.asyncio
+async def test_email_upsert_is_tenant_scoped():
+    from spine.db.models import Email
+    async with AsyncSessionLocal() as session:
+        repo = EmailRepository(Email, session)
+        msg_id = f"gmail_{uuid.uuid4()}"
+        values = dict(
+            provider_message_id=msg_id,
+            thread_id="th_upsert",
+            from_email="sender@example.com",
+            received_at=datetime.utcnow(),
+            direction=Direction.INBOUND
+        )
+
+        first, created_first = await repo.upsert(id=f"msg_{uuid.uuid4()}", tenant_id="t_up_a", **values)
+        again, created_again = await repo.upsert(id=f"msg_{uuid.uuid4()}", tenant_id="t_up_a", **values)
+        other, created_other = await repo.upsert(id=f"msg_{uuid.uuid4()}", tenant_id="t_up_b", **values)
+        await session.commit()
+
+        assert created_first is True
+        assert created_again is False
+        assert again.id == first.id
+        # Same provider id in another tenant is a different message
+        assert created_other is True
+        assert other.id != first.id
+
+@pytest.mark.asyncio
+async def test_find_by_participant():
+    from spine.db.models import Email
+    from spine.contracts.email_dto import EmailIngest
+    async with AsyncSessionLocal() as session:
+        service = EmailService(EmailRepository(Email, session))
+        tenant_id = f"t_{uuid.uuid4()}"
+
+        await service.ingest_email(
+            tenant_id=tenant_id,
+            provider_message_id=f"gmail_{uuid.uuid4()}",
+            thread_id="th_people",
+            from_email="Alice <Alice@Example.com>",
+            to_emails="bob@example.com, carol@example.com",
+            subject="Single path",
+            received_at=datetime(2024, 1, 1),
+            direction=Direction.INBOUND
+        )
+        await service.ingest_emails(tenant_id, [EmailIngest(
+            provider_message_id=f"gmail_{uuid.uuid4()}",
+            thread_id="th_people",
+            from_email="bob@example.com",
+            to_emails='["alice@example.com"]',
+            cc_emails="dave@example.com",
+            subject="Bulk path",
+            received_at=datetime(2024, 1, 2),
+            direction=Direction.OUTBOUND
+        )])
+        await session.commit()
+
+        alice = await service.email_repo.find_by_participant("alice@example.com", tenant_id)
+        assert [e.subject for e in alice] == ["Bulk path", "Single path"]
+
+        dave = await service.email_repo.find_by_participant("DAVE@example.com", tenant_id)
+        assert [e.subject for e in dave] == ["Bulk path"]
+
+        # Tenant isolation
+        assert await service.email_repo.find_by_participant("alice@example.com", "t_other") == []
+
+@pytest.mark.asyncio
+async def test_thread_rollups_maintained_at_ingest():
+    from spine.db.models import Email
+    from spine.contracts.email_dto import EmailIngest
+    async with AsyncSessionLocal() as session:
+        service = EmailService(EmailRepository(Email, session))
+        tenant_id = f"t_{uuid.uuid4()}"
+
+        def msg(provider_id: str, day: int, sender: str, direction: Direction) -> EmailIngest:
+            return EmailIngest(
+                provider_message_id=provider_id,
+                thread_id="th_rollup",
+                from_email=sender,
+                to_emails="me@example.com",
+                subject=f"Day {day}",
+                received_at=datetime(2024, 1, day),
+                direction=direction
+            )
+
+        await service.ingest_email(tenant_id, **msg("p2", 2, "bob@example.com", Direction.OUTBOUND).model_dump())
+        # Older message arrives later; a duplicate must not bump the count
+        await service.ingest_emails(tenant_id, [
+            msg("p1", 1, "alice@example.com", Direction.INBOUND),
+            msg("p2", 2, "bob@example.com", Direction.OUTBOUND),
+        ])
+        await session.commit()
+
+        thread = await service.thread_repo.get_by_thread_id(tenant_id, "th_rollup")
+        await session.refresh(thread)
+        assert thread.message_count == 2
+        assert thread.last_received_at == datetime(2024, 1, 2)
+        assert thread.latest_direction == Direction.OUTBOUND
+        assert thread.subject == "Day 2"
+        assert thread.participants == ["alice@example.com", "bob@example.com", "me@example.com"]
+
+        inbox = await service.thread_repo.get_inbox(tenant_id)
+        assert [t.thread_id for t in inbox] == ["th_rollup"]
+
+        rebuilt = await service.thread_repo.rebuild(tenant_id, "th_rollup")
+        assert rebuilt.message_count == 2
+        assert rebuilt.participants == thread.participants
+
+@pytest.mark.asyncio
+async def test_thread_rollup_participants_merged_by_the_upsert():
+    from spine.repositories.thread_repo import ThreadRepository
+    tenant_id = f"t_{uuid.uuid4()}"
+
+    def delta(day: int, participants: list) -> dict:
+        return {
+            "tenant_id": tenant_id, "thread_id": "th_merge", "message_count": 1, "last_received_at": datetime(2024, 1, day),
+            "latest_direction": Direction.INBOUND, "subject": f"Day {day}", "participants": participants,
+        }
+
+    # Two ingesters that each saw only their own message's addresses
+    async with AsyncSessionLocal() as session:
+        await ThreadRepository(session).apply_rollups([delta(1, ["bob@example.com", "me@example.com"])])
+        await session.commit()
+    async with AsyncSessionLocal() as session:
+        await ThreadRepository(session).apply_rollups([delta(2, ["alice@example.com", "me@example.com"])])
+        await session.commit()
+    async with AsyncSessionLocal() as session:
+        thread = await ThreadRepository(session).get_by_thread_id(tenant_id, "th_merge")
+    assert thread.message_count == 2
+    assert thread.participants == ["alice@example.com", "bob@example.com", "me@example.com"]
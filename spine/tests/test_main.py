@@ -58,3 +58,14 @@ def test_settings_loaded():
 def test_json_headers():
     response = client.get("/health")
     assert response.headers["content-type"] == "application/json"
+
+# 11. Database Health Probe
+def test_health_db_reports_pool():
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["pool"]["pool_class"]
+    if "size" in data["pool"]:
+        assert data["pool"]["checked_out"] >= 0
+        assert data["pool"]["checked_in"] >= 0
@@ -0,0 +1,86 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from spine.db.database import AsyncSessionLocal, engine
+from spine.db.models import WorkItem, WorkItemState, Email
+from spine.repositories.work_item_repo import WorkItemRepository
+from spine.repositories.email_repo import EmailRepository
+
+# EXPLAIN-based regression tests: hot-path queries must SEARCH an index, never SCAN the table.
+
+@pytest_asyncio.fixture
+async def captured_sql():
+    """Records (statement, parameters) for every query the engine executes."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+async def query_plan(statement, parameters) -> list[str]:
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        cursor = raw.driver_connection
+        async with cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters) as rows:
+            return [row[-1] for row in await rows.fetchall()]
+
+async def assert_uses_index(captured, table: str, allow_sort: bool = False):
+    statement, parameters = next((s, p) for s, p in captured if table in s)
+    plan = await query_plan(statement, parameters)
+    touching = [step for step in plan if table in step]
+    assert touching, plan
+    for step in touching:
+        assert step.startswith("SEARCH"), f"Sequential scan on {table}: {plan}"
+    if not allow_sort:
+        assert not any("TEMP B-TREE" in step for step in plan), f"Sort not served by index: {plan}"
+
+@pytest.mark.asyncio
+async def test_get_by_state_uses_index(captured_sql):
+    async with AsyncSessionLocal() as session:
+        await WorkItemRepository(WorkItem, session).get_by_state("t_plan", WorkItemState.NEEDS_REPLY)
+    await assert_uses_index(captured_sql, "work_items")
+
+@pytest.mark.asyncio
+async def test_get_by_owner_uses_index(captured_sql):
+    async with AsyncSessionLocal() as session:
+        await WorkItemRepository(WorkItem, session).get_by_owner("t_plan", "owner_1", WorkItemState.WAITING)
+    await assert_uses_index(captured_sql, "work_items")
+
+@pytest.mark.asyncio
+async def test_sweep_expired_leases_uses_index(captured_sql):
+    from datetime import datetime
+    async with AsyncSessionLocal() as session:
+        await WorkItemRepository(WorkItem, session).sweep_expired_leases(now=datetime(2020, 1, 1))
+        await session.rollback()
+    await assert_uses_index(captured_sql, "work_items")
+
+@pytest.mark.asyncio
+async def test_get_by_email_id_uses_index(captured_sql):
+    async with AsyncSessionLocal() as session:
+        await WorkItemRepository(WorkItem, session).get_by_email_id("e_plan")
+    await assert_uses_index(captured_sql, "work_items")
+
+@pytest.mark.asyncio
+async def test_find_by_participant_uses_index(captured_sql):
+    async with AsyncSessionLocal() as session:
+        await EmailRepository(Email, session).find_by_participant("someone@example.com", "t_plan")
+    # Sorting only the participant's own messages is fine; scanning the mailbox is not
+    await assert_uses_index(captured_sql, "email_recipients", allow_sort=True)
+    await assert_uses_index(captured_sql, "emails", allow_sort=True)
+
+@pytest.mark.asyncio
+async def test_get_inbox_uses_index(captured_sql):
+    from spine.repositories.thread_repo import ThreadRepository
+    async with AsyncSessionLocal() as session:
+        await ThreadRepository(session).get_inbox("t_plan")
+    await assert_uses_index(captured_sql, "threads")
+
+@pytest.mark.asyncio
+async def test_claim_uses_index(captured_sql):
+    async with AsyncSessionLocal() as session:
+        await WorkItemRepository(WorkItem, session).claim("t_plan", WorkItemState.NEEDS_REPLY, 10, 60, "worker_plan")
+        await session.rollback()
+    await assert_uses_index(captured_sql, "work_items")
@@ -1,8 +1,10 @@
+import asyncio
 import pytest
 import pytest_asyncio
 from spine.db.database import AsyncSessionLocal, engine
+from spine.db.repository import encode_cursor
 from spine.repositories.user_repo import UserRepository
-from spine.db.models import User
+from spine.db.models import TenantMembership, User
 
 @pytest_asyncio.fixture
 async def db_session():
@@ -45,3 +47,294 @@ async def test_repo_delete_user(db_session):
     # Verify gone
     user = await repo.get("repo_u1")
     assert user is None
+
+@pytest.mark.asyncio
+async def test_repo_page_after_walks_all_rows(db_session):
+    import uuid
+    from datetime import datetime
+    repo = UserRepository(db_session)
+    run = uuid.uuid4().hex
+    created_at = datetime(2020, 1, 1)
+    # Same created_at for every row: the id tiebreaker must keep pages disjoint
+    ids = [f"page_{run}_{i}" for i in range(5)]
+    for uid in ids:
+        await repo.create(id=uid, email=f"{uid}@example.com", created_at=created_at)
+    await db_session.commit()
+
+    seen = []
+    page = await repo.page_after(limit=2)
+    while True:
+        seen.extend(u.id for u in page.items if u.id.startswith(f"page_{run}_"))
+        if page.next_cursor is None:
+            break
+        page = await repo.page_after(page.next_cursor, limit=2)
+
+    assert seen == ids
+
+@pytest.mark.asyncio
+async def test_repo_page_after_rejects_bad_cursor(db_session):
+    repo = UserRepository(db_session)
+    with pytest.raises(ValueError):
+        await repo.page_after("not-a-cursor")
+    # Well-formed cursors whose values do not fit the (created_at, id) keys
+    for values in (["2020-01-01T00:00:00", 5], [17, "u1"], ["yesterday", "u1"], [[1], {"a": 1}], [True, "u1"]):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await repo.page_after(encode_cursor(values))
+
+@pytest.fixture
+def cache_clock():
+    return [0.0] # advance cache_clock[0] to expire entries and tombstones
+
+@pytest.fixture
+def repo_cache(cache_clock):
+    from spine.core.cache import InMemoryCacheBackend
+    from spine.db.repository_cache import RepositoryCache
+    return RepositoryCache(InMemoryCacheBackend(clock=lambda: cache_clock[0]), ttl=60, negative_ttl=60, tombstone_ttl=5)
+
+@pytest.fixture
+def statements():
+    from sqlalchemy import event
+    captured = []
+    capture = lambda conn, cursor, statement, *args: captured.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+@pytest.mark.asyncio
+async def test_cached_get_reads_db_once(repo_cache, cache_clock, statements):
+    import uuid
+    from datetime import datetime
+    uid = f"cache_{uuid.uuid4()}"
+    async with AsyncSessionLocal() as session:
+        await UserRepository(session, repo_cache).create(id=uid, email=f"{uid}@example.com", name="Cached")
+        await session.commit()
+    await asyncio.sleep(0) # let the after-commit tombstone land
+    cache_clock[0] += 10 # past the create's tombstones
+
+    statements.clear()
+    async with AsyncSessionLocal() as session:
+        first = await UserRepository(session, repo_cache).get(uid)
+    async with AsyncSessionLocal() as session:
+        second = await UserRepository(session, repo_cache).get_by_id(uid)
+    assert len(statements) == 1
+    assert (second.id, second.email, second.name) == (first.id, first.email, first.name)
+    assert isinstance(second.created_at, datetime)
+    assert repo_cache.metrics.snapshot()["users"] == {"miss": 1, "hit": 1}
+
+    # update/delete invalidate
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session, repo_cache)
+        await repo.update(uid, name="Renamed")
+    async with AsyncSessionLocal() as session:
+        assert (await UserRepository(session, repo_cache).get(uid)).name == "Renamed"
+        assert await UserRepository(session, repo_cache).delete(uid) is True
+    async with AsyncSessionLocal() as session:
+        assert await UserRepository(session, repo_cache).get(uid) is None
+
+@pytest.mark.asyncio
+async def test_cached_rows_never_hold_password_hashes(repo_cache):
+    import uuid
+    from spine.core.security import get_password_hash
+    from spine.services.auth_service import AuthService
+    uid = f"cred_{uuid.uuid4()}"
+    email = f"{uid}@example.com"
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=uid, email=email, hashed_password=get_password_hash("pw")))
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session, repo_cache)
+        assert (await repo.get_by_email(email)).id == uid
+        raw = await repo_cache.backend.get(repo_cache.key(User, "id", uid))
+        assert raw is not None and "hashed_password" not in raw
+        # Login reads the credential from the DB, even onto the row this session got from the cache
+        assert (await AuthService(repo).authenticate_user(email, "pw")).id == uid
+        assert await AuthService(repo).authenticate_user(email, "wrong") is None
+
+@pytest.mark.asyncio
+async def test_cached_negative_lookups(repo_cache, statements):
+    import uuid
+    uid = f"absent_{uuid.uuid4()}"
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session, repo_cache)
+        assert await repo.get(uid) is None
+        assert await repo.get_by_email(f"{uid}@example.com") is None
+        statements.clear()
+        assert await repo.get(uid) is None
+        assert await repo.get_by_email(f"{uid}@example.com") is None
+        assert statements == []
+
+        # Creating the row drops both cached misses
+        await repo.create(id=uid, email=f"{uid}@example.com")
+        await session.commit()
+        assert (await repo.get(uid)).id == uid
+        assert (await repo.get_by_email(f"{uid}@example.com")).id == uid
+
+@pytest.mark.asyncio
+async def test_cached_get_by_email_follows_email_change(repo_cache, cache_clock, statements):
+    import uuid
+    uid = f"mail_{uuid.uuid4()}"
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session, repo_cache)
+        await repo.create(id=uid, email=f"old_{uid}@example.com")
+        await session.commit()
+        await asyncio.sleep(0) # let the after-commit tombstone land
+        cache_clock[0] += 10 # past the create's tombstones
+        assert (await repo.get_by_email(f"old_{uid}@example.com")).id == uid
+
+    statements.clear()
+    async with AsyncSessionLocal() as session:
+        assert (await UserRepository(session, repo_cache).get_by_email(f"old_{uid}@example.com")).id == uid
+    assert statements == []
+
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session, repo_cache)
+        await repo.update(uid, email=f"new_{uid}@example.com")
+    async with AsyncSessionLocal() as session:
+        repo = UserRepository(session, repo_cache)
+        assert await repo.get_by_email(f"old_{uid}@example.com") is None
+        assert (await repo.get_by_email(f"new_{uid}@example.com")).id == uid
+
+@pytest.mark.asyncio
+async def test_fill_racing_a_write_cannot_restore_the_old_row(repo_cache, cache_clock):
+    import uuid
+    from spine.db.repository_cache import RepositoryCache
+    uid = f"race_{uuid.uuid4()}"
+    async with AsyncSessionLocal() as session:
+        await UserRepository(session, repo_cache).create(id=uid, email=f"{uid}@example.com", name="Old")
+        await session.commit()
+    await asyncio.sleep(0) # let the after-commit tombstone land
+    cache_clock[0] += 10 # past the create's tombstones
+
+    loaded, release = asyncio.Event(), asyncio.Event()
+    async with AsyncSessionLocal() as reader_session:
+        reader = UserRepository(reader_session, repo_cache)
+
+        async def slow_load():
+            row = await reader._get_from_db(uid) # reads "Old" before the update commits
+            loaded.set()
+            await release.wait()
+            return row
+
+        fill = asyncio.create_task(repo_cache.get_row(reader_session, User, uid, slow_load))
+        await loaded.wait()
+        # The writer is another process: same shared backend, its own single-flight
+        writer_cache = RepositoryCache(repo_cache.backend, ttl=60, negative_ttl=60, tombstone_ttl=5)
+        async with AsyncSessionLocal() as session:
+            await UserRepository(session, writer_cache).update(uid, name="New")
+        release.set()
+        assert (await fill).name == "Old" # that caller saw the row as it was
+
+    async with AsyncSessionLocal() as session:
+        assert (await UserRepository(session, repo_cache).get(uid)).name == "New"
+    cache_clock[0] += 10
+    async with AsyncSessionLocal() as session:
+        assert (await UserRepository(session, repo_cache).get(uid)).name == "New"
+
+@pytest.mark.asyncio
+async def test_create_invalidates_again_after_commit(repo_cache):
+    import uuid
+    uid = f"late_{uuid.uuid4()}"
+    key = repo_cache.key(User, "id", uid)
+    async with AsyncSessionLocal() as session:
+        await UserRepository(session, repo_cache).create(id=uid, email=f"{uid}@example.com")
+        await repo_cache.backend.set(key, "null", 60) # a miss cached while the transaction was open
+        await session.commit()
+        await asyncio.sleep(0)
+    assert await repo_cache.backend.get(key) == "!invalidated"
+
+@pytest.mark.asyncio
+async def test_add_membership_invalidates_after_commit(repo_cache):
+    import uuid
+    from spine.contracts.auth_dto import CurrentUser
+    from spine.db.models import Tenant, Role
+    from spine.repositories.tenant_repo import TenantRepository
+    from spine.db.principal_cache import principal_cache
+    tid, uid = f"t_{uuid.uuid4()}", f"u_{uuid.uuid4()}"
+    key = repo_cache.key(TenantMembership, "user_id", uid)
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=uid, email=f"{uid}@example.com"))
+        session.add(Tenant(id=tid, name="Joined"))
+        await session.commit()
+    principal_cache.set(uid, CurrentUser(id=uid, email=f"{uid}@example.com", name=None, memberships={}))
+
+    async with AsyncSessionLocal() as session:
+        await TenantRepository(Tenant, session, repo_cache).add_membership(f"m_{uid}", tid, uid, Role.OWNER)
+        await repo_cache.backend.set(key, "[]", 60) # a reader filled the old memberships before the commit
+        assert principal_cache.get(uid) is not None
+        await session.commit()
+        await asyncio.sleep(0)
+    assert await repo_cache.backend.get(key) == "!invalidated"
+    assert principal_cache.get(uid) is None
+
+@pytest.mark.asyncio
+async def test_cache_backend_errors_fall_through_to_db(statements):
+    from spine.db.repository_cache import RepositoryCache
+
+    class BrokenBackend:
+        async def get(self, key): raise ConnectionError("down")
+        async def set(self, key, value, ttl): raise ConnectionError("down")
+        async def add(self, key, value, ttl): raise ConnectionError("down")
+        async def delete(self, *keys): raise ConnectionError("down")
+
+    cache = RepositoryCache(BrokenBackend(), ttl=60, negative_ttl=60)
+    async with AsyncSessionLocal() as session:
+        assert await UserRepository(session, cache).get("nobody") is None
+    assert len(statements) == 1
+    assert cache.metrics.snapshot()["users"]["error"] == 3 # get, single-flight re-check, set
+
+@pytest.mark.asyncio
+async def test_tenant_cache_single_flight_under_stampede(statements):
+    import asyncio
+    import uuid
+    from spine.core.cache import InMemoryCacheBackend, TieredCacheBackend
+    from spine.db.models import Tenant, Role
+    from spine.db.repository_cache import RepositoryCache
+    from spine.repositories.tenant_repo import TenantRepository
+
+    cache = RepositoryCache(TieredCacheBackend(InMemoryCacheBackend(), local_maxsize=100, local_ttl=5), ttl=60, negative_ttl=60)
+    tid, uid = f"t_{uuid.uuid4()}", f"u_{uuid.uuid4()}"
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=uid, email=f"{uid}@example.com"))
+        session.add(Tenant(id=tid, name="Stampede"))
+        await session.flush()
+        await TenantRepository(Tenant, session, cache).add_membership(f"m_{uid}", tid, uid, Role.OWNER)
+        await session.commit()
+
+    async def lookup():
+        async with AsyncSessionLocal() as session:
+            repo = TenantRepository(Tenant, session, cache)
+            return await repo.get(tid), await repo.get_memberships(uid)
+
+    statements.clear()
+    results = await asyncio.gather(*(lookup() for _ in range(1000)))
+
+    assert len([s for s in statements if "FROM tenants" in s]) == 1
+    assert len([s for s in statements if "FROM tenant_memberships" in s]) == 1
+    assert all(tenant.id == tid and [m.role for m in memberships] == [Role.OWNER] for tenant, memberships in results)
+    assert cache.metrics.snapshot()["tenants"]["coalesced"] == 999
+
+def test_redis_cache_without_url_is_a_settings_error():
+    from spine.core.config import Settings
+    from spine.db.repository_cache import build_cache_backend
+    with pytest.raises(ValueError, match="CACHE_REDIS_URL"):
+        build_cache_backend(Settings(REPOSITORY_CACHE="redis", CACHE_REDIS_URL=None))
+
+@pytest.mark.asyncio
+async def test_tiered_cache_local_tier_in_front_of_shared():
+    from spine.core.cache import InMemoryCacheBackend, TieredCacheBackend
+    now = [0.0]
+    shared = InMemoryCacheBackend()
+    tiered = TieredCacheBackend(shared, local_maxsize=10, local_ttl=5, clock=lambda: now[0])
+
+    await shared.set("k", "v1", 60)
+    assert await tiered.get("k") == "v1"
+    # Another process rewrites the shared entry: the local tier serves its copy until local_ttl
+    await shared.set("k", "v2", 60)
+    assert await tiered.get("k") == "v1"
+    now[0] = 6.0
+    assert await tiered.get("k") == "v2"
+
+    await tiered.delete("k")
+    assert await shared.get("k") is None
+    assert await tiered.get("k") is None
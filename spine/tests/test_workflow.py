@@ -47,3 +47,144 @@ async def test_workflow_transitions():
         assert updated.state == WorkItemState.DONE
         assert updated.resolution_lock is True
         assert updated.closed_at is not None
+
+async def _seed_work_items(session, count: int):
+    t_id = f"t_{uuid.uuid4()}"
+    session.add(Tenant(id=t_id, name="Bulk Corp", plan=TenantPlan.PRO))
+    item_ids = []
+    for _ in range(count):
+        e_id = f"e_{uuid.uuid4()}"
+        session.add(Email(
+            id=e_id,
+            provider_message_id=str(uuid.uuid4()),
+            thread_id="th_bulk_wf",
+            from_email="a@b.com",
+            received_at=datetime.utcnow(),
+            direction=Direction.INBOUND
+        ))
+        w_id = f"w_{uuid.uuid4()}"
+        session.add(WorkItem(
+            id=w_id,
+            tenant_id=t_id,
+            email_id=e_id,
+            state=WorkItemState.NEEDS_REPLY,
+            owner_type="SYSTEM",
+            confidence_band=ConfidenceBand.HIGH
+        ))
+        item_ids.append(w_id)
+    await session.commit()
+    return t_id, item_ids
+
+@pytest.mark.asyncio
+async def test_workflow_transition_many():
+    async with AsyncSessionLocal() as session:
+        _, item_ids = await _seed_work_items(session, 3)
+        service = WorkflowService(WorkItemRepository(WorkItem, session))
+
+        moved = await service.transition_many(item_ids + ["w_missing"], WorkItemState.DONE, actor_id="user_1")
+        await session.commit()
+        assert sorted(moved) == sorted(item_ids)
+
+        for w_id in item_ids:
+            item = await service.repo.get_by_id(w_id)
+            await session.refresh(item)
+            assert item.state == WorkItemState.DONE
+            assert item.resolution_lock is True
+            assert item.closed_at is not None
+
+        # DONE is terminal: re-archiving or reopening moves nothing
+        assert await service.transition_many(item_ids, WorkItemState.DONE, actor_id="user_1") == []
+        assert await service.transition_many(item_ids, WorkItemState.FYI, actor_id="user_1") == []
+
+@pytest.mark.asyncio
+async def test_workflow_rejects_illegal_transition():
+    from spine.services.transitions import InvalidTransitionError
+    async with AsyncSessionLocal() as session:
+        _, item_ids = await _seed_work_items(session, 1)
+        service = WorkflowService(WorkItemRepository(WorkItem, session))
+
+        waiting = await service.transition_state(item_ids[0], WorkItemState.WAITING, actor_id="user_1")
+        assert waiting.resolution_lock is True
+        assert waiting.closed_at is None
+
+        await service.transition_state(item_ids[0], WorkItemState.DONE, actor_id="user_1")
+        with pytest.raises(InvalidTransitionError):
+            await service.transition_state(item_ids[0], WorkItemState.NEEDS_REPLY, actor_id="user_1")
+
+def test_transition_table_compiled():
+    from spine.services.transitions import TRANSITIONS, is_transition_allowed, allowed_sources
+    for current in WorkItemState:
+        for new_state in WorkItemState:
+            assert is_transition_allowed(current, new_state) == (new_state in TRANSITIONS[current])
+    assert WorkItemState.DONE not in allowed_sources(WorkItemState.NEEDS_REPLY)
+
+@pytest.mark.asyncio
+async def test_workflow_optimistic_concurrency():
+    from spine.services.transitions import WorkItemConflictError
+    async with AsyncSessionLocal() as session:
+        _, item_ids = await _seed_work_items(session, 1)
+        service = WorkflowService(WorkItemRepository(WorkItem, session))
+        item = await service.repo.get_by_id(item_ids[0])
+        assert item.version == 1
+
+        moved = await service.transition_state(item_ids[0], WorkItemState.WAITING, actor_id="agent_a", expected_version=1)
+        await session.commit()
+        assert moved.version == 2
+
+        # A second agent acting on the version it read earlier loses the race
+        with pytest.raises(WorkItemConflictError):
+            await service.transition_state(item_ids[0], WorkItemState.FYI, actor_id="agent_b", expected_version=1)
+
+    # Concurrent writer in another session bumps the row between our read and our write
+    async with AsyncSessionLocal() as session_a, AsyncSessionLocal() as session_b:
+        service_a = WorkflowService(WorkItemRepository(WorkItem, session_a))
+        service_b = WorkflowService(WorkItemRepository(WorkItem, session_b))
+        await service_a.repo.get_by_id(item_ids[0])
+        await service_b.transition_state(item_ids[0], WorkItemState.NEEDS_REPLY, actor_id="agent_b")
+        await session_b.commit()
+
+        stale = await service_a.repo.compare_and_set(item_ids[0], 2, state=WorkItemState.FYI)
+        assert stale is None
+
+@pytest.mark.asyncio
+async def test_work_queue_claim_and_leases():
+    from datetime import timedelta
+    async with AsyncSessionLocal() as session:
+        t_id, item_ids = await _seed_work_items(session, 5)
+
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session_a, AsyncSessionLocal() as session_b:
+        repo_a = WorkItemRepository(WorkItem, session_a)
+        repo_b = WorkItemRepository(WorkItem, session_b)
+
+        batch_a = await repo_a.claim(t_id, WorkItemState.NEEDS_REPLY, 3, lease_seconds=60, owner_id="worker_a", now=now)
+        await session_a.commit()
+        batch_b = await repo_b.claim(t_id, WorkItemState.NEEDS_REPLY, 3, lease_seconds=60, owner_id="worker_b", now=now)
+        await session_b.commit()
+
+        ids_a = {item.id for item in batch_a}
+        ids_b = {item.id for item in batch_b}
+        assert len(ids_a) == 3 and len(ids_b) == 2
+        assert ids_a.isdisjoint(ids_b)
+        assert ids_a | ids_b == set(item_ids)
+        assert all(item.lease_owner == "worker_a" for item in batch_a)
+
+        # Queue drained while leases are live
+        assert await repo_b.claim(t_id, WorkItemState.NEEDS_REPLY, 3, 60, "worker_b", now=now) == []
+        await session_b.commit()
+
+        # Only the holder can renew
+        assert await repo_b.renew_lease(list(ids_a), "worker_b", 60, now=now) == []
+        await session_b.commit()
+        renewed = await repo_a.renew_lease(list(ids_a), "worker_a", 60, now=now + timedelta(seconds=30))
+        await session_a.commit()
+        assert set(renewed) == ids_a
+
+        # worker_b's leases expire; a sweep clears them and they become claimable again
+        later = now + timedelta(seconds=61)
+        assert await repo_a.sweep_expired_leases(now=later, tenant_id=f"other_{t_id}") == 0
+        assert await repo_a.sweep_expired_leases(now=later, tenant_id=t_id) == 2
+        await session_a.commit()
+        reclaimed = await repo_a.claim(t_id, WorkItemState.NEEDS_REPLY, 5, 60, "worker_a", now=later)
+        await session_a.commit()
+        assert {item.id for item in reclaimed} == ids_b